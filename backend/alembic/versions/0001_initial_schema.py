@@ -0,0 +1,208 @@
+"""Initial schema, as created by init_db before migrations were added
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-17 20:32:29.471569
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('cable_routes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('source_type', sa.String(length=20), nullable=False),
+    sa.Column('source_id', sa.Integer(), nullable=False),
+    sa.Column('destination_type', sa.String(length=20), nullable=False),
+    sa.Column('destination_id', sa.Integer(), nullable=False),
+    sa.Column('cable_type', sa.String(length=50), nullable=True),
+    sa.Column('fiber_count', sa.Integer(), nullable=True),
+    sa.Column('cable_length', sa.Float(), nullable=True),
+    sa.Column('route_coordinates', sa.JSON(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('installation_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_cable_routes_id'), 'cable_routes', ['id'], unique=False)
+
+    op.create_table('olts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('ip_address', sa.String(length=45), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('snmp_community', sa.String(length=100), nullable=True),
+    sa.Column('snmp_version', sa.String(length=10), nullable=True),
+    sa.Column('snmp_port', sa.Integer(), nullable=True),
+    sa.Column('telnet_enabled', sa.Boolean(), nullable=True),
+    sa.Column('telnet_port', sa.Integer(), nullable=True),
+    sa.Column('telnet_username', sa.String(length=50), nullable=True),
+    sa.Column('telnet_password', sa.String(length=255), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('last_seen', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('vendor', sa.String(length=50), nullable=True),
+    sa.Column('model', sa.String(length=50), nullable=True),
+    sa.Column('firmware_version', sa.String(length=50), nullable=True),
+    sa.Column('serial_number', sa.String(length=100), nullable=True),
+    sa.Column('uptime', sa.Integer(), nullable=True),
+    sa.Column('location', sa.String(length=200), nullable=True),
+    sa.Column('latitude', sa.Float(), nullable=True),
+    sa.Column('longitude', sa.Float(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_olts_id'), 'olts', ['id'], unique=False)
+    op.create_index(op.f('ix_olts_name'), 'olts', ['name'], unique=True)
+
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('username', sa.String(length=50), nullable=False),
+    sa.Column('email', sa.String(length=100), nullable=False),
+    sa.Column('full_name', sa.String(length=100), nullable=True),
+    sa.Column('hashed_password', sa.String(length=255), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('is_superuser', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=True)
+
+    op.create_table('slots',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('olt_id', sa.Integer(), nullable=False),
+    sa.Column('slot_number', sa.Integer(), nullable=False),
+    sa.Column('card_type', sa.String(length=50), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.ForeignKeyConstraint(['olt_id'], ['olts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_slots_id'), 'slots', ['id'], unique=False)
+
+    op.create_table('ports',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('slot_id', sa.Integer(), nullable=False),
+    sa.Column('port_number', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('total_onus', sa.Integer(), nullable=True),
+    sa.Column('online_onus', sa.Integer(), nullable=True),
+    sa.Column('offline_onus', sa.Integer(), nullable=True),
+    sa.Column('rx_power', sa.Float(), nullable=True),
+    sa.Column('tx_power', sa.Float(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['slot_id'], ['slots.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_ports_id'), 'ports', ['id'], unique=False)
+
+    op.create_table('odps',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('port_id', sa.Integer(), nullable=True),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('code', sa.String(length=50), nullable=True),
+    sa.Column('address', sa.Text(), nullable=True),
+    sa.Column('latitude', sa.Float(), nullable=True),
+    sa.Column('longitude', sa.Float(), nullable=True),
+    sa.Column('total_ports', sa.Integer(), nullable=True),
+    sa.Column('used_ports', sa.Integer(), nullable=True),
+    sa.Column('available_ports', sa.Integer(), nullable=True),
+    sa.Column('splitter_ratio', sa.String(length=10), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('installation_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['port_id'], ['ports.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_odps_code'), 'odps', ['code'], unique=True)
+    op.create_index(op.f('ix_odps_id'), 'odps', ['id'], unique=False)
+    op.create_index(op.f('ix_odps_name'), 'odps', ['name'], unique=True)
+
+    op.create_table('onus',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('olt_id', sa.Integer(), nullable=False),
+    sa.Column('port_id', sa.Integer(), nullable=False),
+    sa.Column('odp_id', sa.Integer(), nullable=True),
+    sa.Column('sn', sa.String(length=50), nullable=False),
+    sa.Column('mac_address', sa.String(length=17), nullable=True),
+    sa.Column('onu_id', sa.Integer(), nullable=True),
+    sa.Column('customer_name', sa.String(length=100), nullable=True),
+    sa.Column('customer_phone', sa.String(length=20), nullable=True),
+    sa.Column('customer_address', sa.Text(), nullable=True),
+    sa.Column('service_plan', sa.String(length=100), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('auth_status', sa.String(length=20), nullable=True),
+    sa.Column('rx_power', sa.Float(), nullable=True),
+    sa.Column('tx_power', sa.Float(), nullable=True),
+    sa.Column('olt_rx_power', sa.Float(), nullable=True),
+    sa.Column('distance', sa.Integer(), nullable=True),
+    sa.Column('temperature', sa.Float(), nullable=True),
+    sa.Column('voltage', sa.Float(), nullable=True),
+    sa.Column('vendor', sa.String(length=50), nullable=True),
+    sa.Column('model', sa.String(length=50), nullable=True),
+    sa.Column('firmware_version', sa.String(length=50), nullable=True),
+    sa.Column('hardware_version', sa.String(length=50), nullable=True),
+    sa.Column('vlan', sa.Integer(), nullable=True),
+    sa.Column('bandwidth_profile', sa.String(length=50), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('uptime', sa.Integer(), nullable=True),
+    sa.Column('last_online', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_offline', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['odp_id'], ['odps.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['olt_id'], ['olts.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['port_id'], ['ports.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_onus_id'), 'onus', ['id'], unique=False)
+    op.create_index(op.f('ix_onus_sn'), 'onus', ['sn'], unique=True)
+
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_onus_sn'), table_name='onus')
+    op.drop_index(op.f('ix_onus_id'), table_name='onus')
+    op.drop_table('onus')
+    op.drop_index(op.f('ix_odps_name'), table_name='odps')
+    op.drop_index(op.f('ix_odps_id'), table_name='odps')
+    op.drop_index(op.f('ix_odps_code'), table_name='odps')
+    op.drop_table('odps')
+    op.drop_index(op.f('ix_ports_id'), table_name='ports')
+    op.drop_table('ports')
+    op.drop_index(op.f('ix_slots_id'), table_name='slots')
+    op.drop_table('slots')
+    op.drop_index(op.f('ix_users_username'), table_name='users')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
+    op.drop_index(op.f('ix_olts_name'), table_name='olts')
+    op.drop_index(op.f('ix_olts_id'), table_name='olts')
+    op.drop_table('olts')
+    op.drop_index(op.f('ix_cable_routes_id'), table_name='cable_routes')
+    op.drop_table('cable_routes')
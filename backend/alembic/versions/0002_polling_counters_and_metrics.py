@@ -0,0 +1,76 @@
+"""Polling intervals, ONU counters and ONU metrics tables
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 20:32:41.821058
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('olts', sa.Column('poll_reachability_interval', sa.Integer(), nullable=True))
+    op.add_column('olts', sa.Column('poll_onu_status_interval', sa.Integer(), nullable=True))
+    op.add_column('olts', sa.Column('poll_optics_interval', sa.Integer(), nullable=True))
+    op.add_column('olts', sa.Column('total_onus', sa.Integer(), server_default=sa.text('0'), nullable=True))
+    op.add_column('olts', sa.Column('online_onus', sa.Integer(), server_default=sa.text('0'), nullable=True))
+    op.add_column('olts', sa.Column('offline_onus', sa.Integer(), server_default=sa.text('0'), nullable=True))
+
+    # Backfill the ONU counters; the poll scheduler keeps them reconciled from here on
+    for table, key in (('ports', 'port_id'), ('olts', 'olt_id')):
+        op.execute(
+            f"UPDATE {table} SET "
+            f"total_onus = (SELECT count(*) FROM onus WHERE onus.{key} = {table}.id), "
+            f"online_onus = (SELECT count(*) FROM onus WHERE onus.{key} = {table}.id AND onus.status = 'online'), "
+            f"offline_onus = (SELECT count(*) FROM onus WHERE onus.{key} = {table}.id AND onus.status = 'offline')"
+        )
+
+    op.create_table('onu_metrics',
+    sa.Column('onu_id', sa.Integer(), nullable=False),
+    sa.Column('ts', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('rx_power', sa.REAL(), nullable=True),
+    sa.Column('tx_power', sa.REAL(), nullable=True),
+    sa.Column('olt_rx_power', sa.REAL(), nullable=True),
+    sa.Column('temperature', sa.REAL(), nullable=True),
+    sa.Column('voltage', sa.REAL(), nullable=True),
+    sa.Column('distance', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['onu_id'], ['onus.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('onu_id', 'ts'),
+    postgresql_partition_by='RANGE (ts)'
+    )
+    op.create_table('onu_metric_rollups',
+    sa.Column('onu_id', sa.Integer(), nullable=False),
+    sa.Column('metric', sa.SmallInteger(), nullable=False),
+    sa.Column('resolution', sa.Integer(), nullable=False),
+    sa.Column('bucket', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('samples', sa.Integer(), nullable=False),
+    sa.Column('min_value', sa.REAL(), nullable=True),
+    sa.Column('max_value', sa.REAL(), nullable=True),
+    sa.Column('sum_value', sa.Float(), nullable=True),
+    sa.ForeignKeyConstraint(['onu_id'], ['onus.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('onu_id', 'metric', 'resolution', 'bucket')
+    )
+
+
+def downgrade() -> None:
+    # Dropping onu_metrics drops its daily partitions too
+    op.drop_table('onu_metric_rollups')
+    op.drop_table('onu_metrics')
+
+    with op.batch_alter_table('olts') as batch_op:
+        batch_op.drop_column('offline_onus')
+        batch_op.drop_column('online_onus')
+        batch_op.drop_column('total_onus')
+        batch_op.drop_column('poll_optics_interval')
+        batch_op.drop_column('poll_onu_status_interval')
+        batch_op.drop_column('poll_reachability_interval')
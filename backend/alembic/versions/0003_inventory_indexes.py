@@ -0,0 +1,60 @@
+"""Inventory indexes
+
+Unique (olt_id, slot_number) and (slot_id, port_number) for slot/port
+lookups, ONU indexes for (olt_id, port_id, onu_id), port, status and
+recency, a partial index on low RX power and an index on OLT status.
+The unique constraints fail if duplicate slots or ports exist; remove
+them first. On PostgreSQL the onus indexes are built CONCURRENTLY.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 20:33:14.020588
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# Must match LOW_RX_POWER in app/models/onu.py
+LOW_RX_POWER_WHERE = 'rx_power < -27'
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('slots') as batch_op:
+        batch_op.create_unique_constraint('uq_slots_olt_id_slot_number', ['olt_id', 'slot_number'])
+    with op.batch_alter_table('ports') as batch_op:
+        batch_op.create_unique_constraint('uq_ports_slot_id_port_number', ['slot_id', 'port_number'])
+    op.create_index(op.f('ix_olts_status'), 'olts', ['status'], unique=False)
+
+    # Build without blocking discovery writes on large onus tables
+    with op.get_context().autocommit_block():
+        op.create_index('ix_onus_olt_id_port_id_onu_id', 'onus', ['olt_id', 'port_id', 'onu_id'], unique=False,
+                        postgresql_concurrently=True)
+        op.create_index('ix_onus_port_id', 'onus', ['port_id'], unique=False, postgresql_concurrently=True)
+        op.create_index(op.f('ix_onus_status'), 'onus', ['status'], unique=False, postgresql_concurrently=True)
+        op.create_index(op.f('ix_onus_created_at'), 'onus', ['created_at'], unique=False,
+                        postgresql_concurrently=True)
+        op.create_index('ix_onus_low_rx_power', 'onus', ['rx_power'], unique=False,
+                        postgresql_where=sa.text(LOW_RX_POWER_WHERE), sqlite_where=sa.text(LOW_RX_POWER_WHERE),
+                        postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_onus_low_rx_power', table_name='onus')
+    op.drop_index(op.f('ix_onus_created_at'), table_name='onus')
+    op.drop_index(op.f('ix_onus_status'), table_name='onus')
+    op.drop_index('ix_onus_port_id', table_name='onus')
+    op.drop_index('ix_onus_olt_id_port_id_onu_id', table_name='onus')
+    op.drop_index(op.f('ix_olts_status'), table_name='olts')
+    with op.batch_alter_table('ports') as batch_op:
+        batch_op.drop_constraint('uq_ports_slot_id_port_number', type_='unique')
+    with op.batch_alter_table('slots') as batch_op:
+        batch_op.drop_constraint('uq_slots_olt_id_slot_number', type_='unique')
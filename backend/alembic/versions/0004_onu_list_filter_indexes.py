@@ -0,0 +1,41 @@
+"""ONU list filter indexes
+
+Indexes behind the GET /onu/ filters: auth_status, odp_id, rx_power
+range and a case-insensitive customer name prefix (lower(customer_name)
+with text_pattern_ops on PostgreSQL, so LIKE 'prefix%' can use it).
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 20:37:09.819899
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_onus_auth_status'), 'onus', ['auth_status'], unique=False,
+                        postgresql_concurrently=True)
+        op.create_index(op.f('ix_onus_odp_id'), 'onus', ['odp_id'], unique=False, postgresql_concurrently=True)
+        op.create_index(op.f('ix_onus_rx_power'), 'onus', ['rx_power'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_onus_customer_name_lower', 'onus',
+                        [sa.text('lower(customer_name) text_pattern_ops')
+                         if op.get_context().dialect.name == 'postgresql' else sa.text('lower(customer_name)')],
+                        unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_onus_customer_name_lower', table_name='onus')
+    op.drop_index(op.f('ix_onus_rx_power'), table_name='onus')
+    op.drop_index(op.f('ix_onus_odp_id'), table_name='onus')
+    op.drop_index(op.f('ix_onus_auth_status'), table_name='onus')
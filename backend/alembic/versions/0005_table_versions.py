@@ -0,0 +1,37 @@
+"""Table versions
+
+One write counter per inventory table, bumped by every commit that
+changes the table. ETags for conditional GETs are built from them.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 21:12:40.316552
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+VERSIONED_TABLES = ('cable_routes', 'odps', 'olts', 'onus')
+
+
+def upgrade() -> None:
+    table_versions = op.create_table('table_versions',
+    sa.Column('table_name', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.PrimaryKeyConstraint('table_name')
+    )
+    op.bulk_insert(table_versions, [{'table_name': name, 'version': 0} for name in VERSIONED_TABLES])
+
+
+def downgrade() -> None:
+    op.drop_table('table_versions')
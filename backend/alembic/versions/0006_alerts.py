@@ -0,0 +1,67 @@
+"""Alerts
+
+Persisted alert state for the poll-time alert engine. A partial unique
+index keeps one not-yet-cleared alert per condition key.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 23:05:51.208375
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE_WHERE = "state <> 'cleared'"
+
+
+def upgrade() -> None:
+    op.create_table('alerts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('key', sa.String(length=100), nullable=False),
+    sa.Column('rule', sa.String(length=30), nullable=False),
+    sa.Column('severity', sa.String(length=10), nullable=False),
+    sa.Column('olt_id', sa.Integer(), nullable=False),
+    sa.Column('port_id', sa.Integer(), nullable=True),
+    sa.Column('onu_id', sa.Integer(), nullable=True),
+    sa.Column('state', sa.String(length=15), nullable=False),
+    sa.Column('message', sa.String(length=255), nullable=False),
+    sa.Column('value', sa.Float(), nullable=True),
+    sa.Column('flaps', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('raise_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('opened_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_seen_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('clear_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('acknowledged_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('cleared_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['olt_id'], ['olts.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['onu_id'], ['onus.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['port_id'], ['ports.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('uq_alerts_key_active', 'alerts', ['key'], unique=True,
+                    postgresql_where=sa.text(ACTIVE_WHERE), sqlite_where=sa.text(ACTIVE_WHERE))
+    op.create_index('ix_alerts_key_cleared_at', 'alerts', ['key', 'cleared_at'], unique=False)
+    op.create_index('ix_alerts_state_opened_at', 'alerts', ['state', 'opened_at'], unique=False)
+    op.create_index('ix_alerts_olt_id_state', 'alerts', ['olt_id', 'state'], unique=False)
+    op.create_index('ix_alerts_onu_id', 'alerts', ['onu_id'], unique=False)
+    op.create_index('ix_alerts_port_id', 'alerts', ['port_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_alerts_port_id', table_name='alerts')
+    op.drop_index('ix_alerts_onu_id', table_name='alerts')
+    op.drop_index('ix_alerts_olt_id_state', table_name='alerts')
+    op.drop_index('ix_alerts_state_opened_at', table_name='alerts')
+    op.drop_index('ix_alerts_key_cleared_at', table_name='alerts')
+    op.drop_index('uq_alerts_key_active', table_name='alerts')
+    op.drop_table('alerts')
@@ -0,0 +1,65 @@
+"""ONU list keyset indexes
+
+GET /onu/ pages are ordered by id. A (filter column, id) index returns
+the matches of an equality filter already in id order, so a page reads
+only its own rows instead of every match. These replace the single-column
+status, auth_status, odp_id, port_id and customer name indexes, which
+they cover as a prefix.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 09:12:40.361524
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (filter column, id) indexes, and the single-column indexes they make redundant
+KEYSET_INDEXES = {
+    'ix_onus_olt_id_id': ['olt_id', 'id'],
+    'ix_onus_port_id_id': ['port_id', 'id'],
+    'ix_onus_status_id': ['status', 'id'],
+    'ix_onus_auth_status_id': ['auth_status', 'id'],
+    'ix_onus_odp_id_id': ['odp_id', 'id'],
+}
+REPLACED = {
+    'ix_onus_port_id': ['port_id'],
+    'ix_onus_status': ['status'],
+    'ix_onus_auth_status': ['auth_status'],
+    'ix_onus_odp_id': ['odp_id'],
+}
+
+
+def _customer_name_lower():
+    if op.get_context().dialect.name == 'postgresql':
+        return sa.text('lower(customer_name) text_pattern_ops')
+    return sa.text('lower(customer_name)')
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, columns in KEYSET_INDEXES.items():
+            op.create_index(name, 'onus', columns, unique=False, postgresql_concurrently=True)
+        op.create_index('ix_onus_customer_name_lower_id', 'onus', [_customer_name_lower(), sa.text('id')],
+                        unique=False, postgresql_concurrently=True)
+        for name in REPLACED:
+            op.drop_index(name, table_name='onus', postgresql_concurrently=True)
+        op.drop_index('ix_onus_customer_name_lower', table_name='onus', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    for name, columns in REPLACED.items():
+        op.create_index(name, 'onus', columns, unique=False)
+    op.create_index('ix_onus_customer_name_lower', 'onus', [_customer_name_lower()], unique=False)
+    op.drop_index('ix_onus_customer_name_lower_id', table_name='onus')
+    for name in KEYSET_INDEXES:
+        op.drop_index(name, table_name='onus')
@@ -0,0 +1,54 @@
+"""
+Conditional GET for collection endpoints.
+
+The ETag of a response is the version token of the tables it is built
+from (app.services.versions), so checking it is one primary key lookup.
+A request whose If-None-Match (or, without one, If-Modified-Since) still
+matches gets 304 Not Modified before the endpoint runs its query.
+"""
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional, Tuple
+
+from fastapi import Request, Response
+
+from app.core.config import settings
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # Weak comparison: W/"x" matches "x"
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in tags
+
+
+def _not_modified_since(header: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    return since.tzinfo is not None and last_modified.replace(microsecond=0) <= since
+
+
+def not_modified(request: Request, response: Response, version: Tuple[str, Optional[datetime]]) -> Optional[Response]:
+    """
+    Set ETag and Last-Modified for version (from table_versions) on
+    response, and return a 304 response if the client's copy is still
+    current or None if the endpoint should build the full response.
+    """
+    token, last_modified = version
+    headers = {"ETag": f'W/"{settings.APP_VERSION}:{token}"', "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+    response.headers.update(headers)
+
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_none_match is not None:
+        unchanged = _etag_matches(if_none_match, headers["ETag"])
+    elif if_modified_since is not None and last_modified is not None:
+        unchanged = _not_modified_since(if_modified_since, last_modified)
+    else:
+        unchanged = False
+    return Response(status_code=304, headers=headers) if unchanged else None
@@ -0,0 +1,67 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.api.pagination import MAX_PAGE_SIZE, page, paginate
+from app.db.database import get_async_db, get_db
+from app.models.alert import Alert as AlertModel
+from app.schemas.alert import Alert
+from app.services.alerts import ACTIVE_STATES, ALERT_STATES, RULES, acknowledge_alert
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[Alert])
+async def get_alerts(
+    response: Response,
+    state: List[str] = Query(list(ACTIVE_STATES)),
+    olt_id: Optional[int] = None,
+    port_id: Optional[int] = None,
+    onu_id: Optional[int] = None,
+    rule: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get alerts (open and acknowledged unless state is given), paged by cursor"""
+    unknown = set(state) - set(ALERT_STATES)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown state: {', '.join(sorted(unknown))}")
+    if rule is not None and rule not in RULES:
+        raise HTTPException(status_code=400, detail=f"Unknown rule: {rule}")
+    
+    stmt = select(AlertModel).where(AlertModel.state.in_(state))
+    if olt_id is not None:
+        stmt = stmt.where(AlertModel.olt_id == olt_id)
+    if port_id is not None:
+        stmt = stmt.where(AlertModel.port_id == port_id)
+    if onu_id is not None:
+        stmt = stmt.where(AlertModel.onu_id == onu_id)
+    if rule is not None:
+        stmt = stmt.where(AlertModel.rule == rule)
+    result = await db.execute(paginate(stmt, AlertModel.id, cursor, limit))
+    return page(result.scalars().all(), limit, response)
+
+
+@router.get("/{alert_id}", response_model=Alert)
+def get_alert(alert_id: int, db: Session = Depends(get_db)):
+    """Get alert by ID"""
+    alert = db.query(AlertModel).filter(AlertModel.id == alert_id).first()
+    if not alert:
+        raise HTTPException(status_code=404, detail="Alert not found")
+    return alert
+
+
+@router.post("/{alert_id}/acknowledge", response_model=Alert)
+def acknowledge(alert_id: int, db: Session = Depends(get_db)):
+    """Acknowledge an open alert; it stays listed until its condition clears"""
+    alert = db.query(AlertModel).filter(AlertModel.id == alert_id).first()
+    if not alert:
+        raise HTTPException(status_code=404, detail="Alert not found")
+    try:
+        acknowledge_alert(db, alert)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    db.refresh(alert)
+    return alert
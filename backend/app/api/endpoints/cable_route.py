@@ -1,18 +1,41 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
-from app.db.database import get_db
+from typing import List, Optional
+from app.core.config import settings
+from app.api.conditional import not_modified
+from app.api.pagination import MAX_PAGE_SIZE, page, paginate
+from app.api.serialization import json_rows, schema_columns
+from app.db.database import get_async_db, get_db
+from app.services.versions import table_versions
 from app.schemas.cable_route import CableRoute, CableRouteCreate
 from app.models.cable_route import CableRoute as CableRouteModel
 
 router = APIRouter()
 
+ROUTE_COLUMNS = schema_columns(CableRouteModel, CableRoute)
+
 
 @router.get("/", response_model=List[CableRoute])
-def get_cable_routes(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Get all cable routes"""
-    routes = db.query(CableRouteModel).offset(skip).limit(limit).all()
-    return routes
+async def get_cable_routes(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    skip: int = 0,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get all cable routes, by id; pass the X-Next-Cursor response header as cursor for the next page"""
+    unchanged = not_modified(request, response, await table_versions(db, [CableRouteModel.__tablename__]))
+    if unchanged is not None:
+        return unchanged
+    stmt = paginate(select(CableRouteModel), CableRouteModel.id, cursor, limit, skip)
+    if settings.FAST_JSON:
+        rows = (await db.execute(stmt.with_only_columns(*ROUTE_COLUMNS))).all()
+        return json_rows(page(rows, limit, response), response)
+    routes = await db.scalars(stmt)
+    return page(routes.all(), limit, response)
 
 
 @router.get("/{route_id}", response_model=CableRoute)
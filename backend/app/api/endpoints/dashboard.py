@@ -1,60 +1,35 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.db.database import get_db
-from app.models.olt import OLT as OLTModel
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.conditional import not_modified
+from app.db.database import get_async_db
+from app.models.alert import Alert as AlertModel
 from app.models.onu import ONU as ONUModel
-from app.models.odp import ODP as ODPModel
+from app.services.alerts import ACTIVE_STATES, RULES
+from app.services.stats import STATS_TABLES, dashboard_stats
+from app.services.versions import table_versions
 
 router = APIRouter()
 
 
 @router.get("/stats")
-def get_dashboard_stats(db: Session = Depends(get_db)):
-    """Get dashboard statistics"""
-    
-    # Count OLTs
-    total_olts = db.query(OLTModel).count()
-    online_olts = db.query(OLTModel).filter(OLTModel.status == "online").count()
-    offline_olts = db.query(OLTModel).filter(OLTModel.status == "offline").count()
-    
-    # Count ONUs
-    total_onus = db.query(ONUModel).count()
-    online_onus = db.query(ONUModel).filter(ONUModel.status == "online").count()
-    offline_onus = db.query(ONUModel).filter(ONUModel.status == "offline").count()
-    
-    # Count ODPs
-    total_odps = db.query(ODPModel).count()
-    active_odps = db.query(ODPModel).filter(ODPModel.status == "active").count()
-    
-    # Calculate port utilization
-    total_ports = db.query(func.sum(ODPModel.total_ports)).scalar() or 0
-    used_ports = db.query(func.sum(ODPModel.used_ports)).scalar() or 0
-    port_utilization = (used_ports / total_ports * 100) if total_ports > 0 else 0
-    
-    return {
-        "olts": {
-            "total": total_olts,
-            "online": online_olts,
-            "offline": offline_olts
-        },
-        "onus": {
-            "total": total_onus,
-            "online": online_onus,
-            "offline": offline_onus
-        },
-        "odps": {
-            "total": total_odps,
-            "active": active_odps
-        },
-        "port_utilization": round(port_utilization, 2)
-    }
+async def get_dashboard_stats(request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
+    """Get dashboard statistics (cached for DASHBOARD_STATS_TTL seconds or until the next write)"""
+    version = await table_versions(db, STATS_TABLES)
+    unchanged = not_modified(request, response, version)
+    if unchanged is not None:
+        return unchanged
+    return await dashboard_stats.get(db, version[0])
 
 
 @router.get("/recent-onus")
-def get_recent_onus(limit: int = 10, db: Session = Depends(get_db)):
+async def get_recent_onus(limit: int = 10, db: AsyncSession = Depends(get_async_db)):
     """Get recently added ONUs"""
-    onus = db.query(ONUModel).order_by(ONUModel.created_at.desc()).limit(limit).all()
+    result = await db.execute(
+        select(ONUModel.id, ONUModel.sn, ONUModel.customer_name, ONUModel.status, ONUModel.created_at)
+        .order_by(ONUModel.created_at.desc())
+        .limit(limit)
+    )
     
     return [
         {
@@ -64,45 +39,33 @@ def get_recent_onus(limit: int = 10, db: Session = Depends(get_db)):
             "status": onu.status,
             "created_at": onu.created_at
         }
-        for onu in onus
+        for onu in result
     ]
 
 
 @router.get("/alerts")
-def get_alerts(db: Session = Depends(get_db)):
-    """Get system alerts"""
-    alerts = []
-    
-    # Check offline OLTs
-    offline_olts = db.query(OLTModel).filter(OLTModel.status == "offline").all()
-    for olt in offline_olts:
-        alerts.append({
-            "type": "error",
-            "title": "OLT Offline",
-            "message": f"OLT {olt.name} is offline",
-            "timestamp": olt.last_seen
-        })
+async def get_alerts(limit: int = Query(100, ge=1, le=1000), db: AsyncSession = Depends(get_async_db)):
+    """Get open and acknowledged alerts, newest first (raised and cleared by the alert engine at poll time)"""
+    result = await db.execute(
+        select(AlertModel)
+        .where(AlertModel.state.in_(ACTIVE_STATES))
+        .order_by(AlertModel.opened_at.desc())
+        .limit(limit)
+    )
     
-    # Check offline ONUs
-    offline_onus_count = db.query(ONUModel).filter(ONUModel.status == "offline").count()
-    if offline_onus_count > 0:
-        alerts.append({
-            "type": "warning",
-            "title": "Offline ONUs",
-            "message": f"{offline_onus_count} ONUs are offline",
-            "timestamp": None
-        })
-    
-    # Check low signal ONUs
-    low_signal_onus = db.query(ONUModel).filter(
-        ONUModel.rx_power < -27
-    ).count()
-    if low_signal_onus > 0:
-        alerts.append({
-            "type": "warning",
-            "title": "Low Signal ONUs",
-            "message": f"{low_signal_onus} ONUs have low signal strength",
-            "timestamp": None
-        })
-    
-    return alerts
+    return [
+        {
+            "id": alert.id,
+            "type": alert.severity,
+            "title": RULES[alert.rule][1],
+            "message": alert.message,
+            "timestamp": alert.opened_at,
+            "rule": alert.rule,
+            "state": alert.state,
+            "olt_id": alert.olt_id,
+            "port_id": alert.port_id,
+            "onu_id": alert.onu_id,
+            "flaps": alert.flaps,
+        }
+        for alert in result.scalars()
+    ]
@@ -0,0 +1,51 @@
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
+import json
+from app.core.config import settings
+from app.services.events import EVENT_TYPES, event_broker
+
+router = APIRouter()
+
+
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    olt_id: Optional[List[int]] = Query(None),
+    port_id: Optional[List[int]] = Query(None),
+    type: Optional[List[str]] = Query(None),
+):
+    """
+    Server-Sent Events stream of ONU status, OLT status and alert changes,
+    sent as "changes" events holding a JSON array of coalesced deltas.
+    Filter with one or more olt_id, port_id and type (onu, olt, alert).
+    """
+    unknown = set(type or ()) - set(EVENT_TYPES)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown event type, expected one of: {', '.join(EVENT_TYPES)}")
+
+    subscription = event_broker.subscribe(olt_id or (), port_id or (), type or ())
+
+    async def stream():
+        try:
+            yield f"retry: {settings.EVENTS_RETRY_INTERVAL * 1000}\n\n"
+            while True:
+                batch = await subscription.next_batch(
+                    settings.EVENTS_HEARTBEAT_INTERVAL, settings.EVENTS_COALESCE_INTERVAL
+                )
+                if subscription.dropped:
+                    # Too far behind; the client reconnects and reloads its state
+                    yield 'event: dropped\ndata: {"reason": "buffer full"}\n\n'
+                    return
+                if batch is None:
+                    yield ": keep-alive\n\n"
+                elif batch:
+                    yield f"event: changes\ndata: {json.dumps(batch, separators=(',', ':'))}\n\n"
+        finally:
+            event_broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from app.db.database import async_engine
+from app.services.export import EXPORTS, FORMATS, encode_csv, encode_ndjson, export_rows, gzip_chunks
+
+router = APIRouter()
+
+
+@router.get("/{entity}")
+async def export_inventory(
+    entity: str,
+    request: Request,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+):
+    """
+    Stream every row of onus, olts, odps or cable-routes as NDJSON or CSV,
+    ordered by id. Gzip-compressed when the client accepts it.
+    """
+    if entity not in EXPORTS:
+        raise HTTPException(status_code=404, detail=f"Unknown export, expected one of: {', '.join(EXPORTS)}")
+
+    columns = EXPORTS[entity][1]
+    encode = encode_csv if format == "csv" else encode_ndjson
+    body = encode(columns, export_rows(async_engine, entity))
+    headers = {"Content-Disposition": f'attachment; filename="{entity}.{format}"'}
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        body = gzip_chunks(body)
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+    return StreamingResponse(body, media_type=FORMATS[format], headers=headers)
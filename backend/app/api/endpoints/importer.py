@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from sqlalchemy.orm import Session
+import io
+from app.db.database import get_db
+from app.services.importer import IMPORTS, import_csv
+
+router = APIRouter()
+
+
+@router.post("/{entity}")
+def import_inventory(entity: str, file: UploadFile = File(...), db: Session = Depends(get_db)):
+    """
+    Import onus, odps or cable-routes from an uploaded CSV (header line
+    first, same columns as the create endpoints). Returns a per-line error
+    report; valid rows are inserted even when others fail.
+    """
+    if entity not in IMPORTS:
+        raise HTTPException(status_code=404, detail=f"Unknown import, expected one of: {', '.join(IMPORTS)}")
+
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        return import_csv(db, entity, stream)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        stream.detach()
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, HTTPException
+from typing import List, Optional
+
+from app.schemas.job import Job
+from app.services.jobs import job_manager
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[Job])
+def get_jobs(olt_id: Optional[int] = None):
+    """Get recent discovery/sync jobs"""
+    return [job.to_dict() for job in job_manager.list(olt_id)]
+
+
+@router.get("/{job_id}", response_model=Job)
+def get_job(job_id: str):
+    """Get job phase, progress and result"""
+    job = job_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
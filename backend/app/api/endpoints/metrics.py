@@ -0,0 +1,44 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from app.db.database import get_db
+from app.models.onu import ONU as ONUModel
+from app.services.metrics import METRICS, as_utc, query_series
+
+router = APIRouter()
+
+
+@router.get("/onu")
+def get_onu_metrics(
+    metric: str = "rx_power",
+    onu_id: Optional[List[int]] = Query(None),
+    olt_id: Optional[int] = None,
+    port_id: Optional[int] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    points: int = Query(300, ge=1, le=5000),
+    db: Session = Depends(get_db)
+):
+    """Get a downsampled [bucket, min, avg, max] series of one metric per ONU (default: last 24 hours)"""
+    if metric not in METRICS:
+        raise HTTPException(status_code=400, detail=f"Unknown metric, expected one of: {', '.join(METRICS)}")
+    if not onu_id and olt_id is None and port_id is None:
+        raise HTTPException(status_code=400, detail="Give onu_id, olt_id or port_id")
+
+    # Bounds without an offset are UTC
+    end = as_utc(end or datetime.now(timezone.utc))
+    start = as_utc(start or end - timedelta(hours=24))
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+
+    query = db.query(ONUModel.id)
+    if onu_id:
+        query = query.filter(ONUModel.id.in_(onu_id))
+    if olt_id is not None:
+        query = query.filter(ONUModel.olt_id == olt_id)
+    if port_id is not None:
+        query = query.filter(ONUModel.port_id == port_id)
+    onu_ids = [row.id for row in query.order_by(ONUModel.id).all()]
+
+    return query_series(db, onu_ids, metric, start, end, points)
@@ -1,18 +1,41 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
-from app.db.database import get_db
+from typing import List, Optional
+from app.core.config import settings
+from app.api.conditional import not_modified
+from app.api.pagination import MAX_PAGE_SIZE, page, paginate
+from app.api.serialization import json_rows, schema_columns
+from app.db.database import get_async_db, get_db
+from app.services.versions import table_versions
 from app.schemas.odp import ODP, ODPCreate, ODPUpdate
 from app.models.odp import ODP as ODPModel
 
 router = APIRouter()
 
+ODP_COLUMNS = schema_columns(ODPModel, ODP)
+
 
 @router.get("/", response_model=List[ODP])
-def get_odps(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Get all ODPs"""
-    odps = db.query(ODPModel).offset(skip).limit(limit).all()
-    return odps
+async def get_odps(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    skip: int = 0,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get all ODPs, by id; pass the X-Next-Cursor response header as cursor for the next page"""
+    unchanged = not_modified(request, response, await table_versions(db, [ODPModel.__tablename__]))
+    if unchanged is not None:
+        return unchanged
+    stmt = paginate(select(ODPModel), ODPModel.id, cursor, limit, skip)
+    if settings.FAST_JSON:
+        rows = (await db.execute(stmt.with_only_columns(*ODP_COLUMNS))).all()
+        return json_rows(page(rows, limit, response), response)
+    odps = await db.scalars(stmt)
+    return page(odps.all(), limit, response)
 
 
 @router.get("/{odp_id}", response_model=ODP)
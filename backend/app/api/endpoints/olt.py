@@ -1,20 +1,50 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from datetime import datetime
-from app.db.database import get_db
-from app.schemas.olt import OLT, OLTCreate, OLTUpdate, OLTStatus
+import json
+import time
+from app.core.config import settings
+from app.api.conditional import not_modified
+from app.api.pagination import MAX_PAGE_SIZE, page, paginate
+from app.api.serialization import json_rows, schema_columns
+from app.db.database import get_async_db, get_db
+from app.services.versions import table_versions
+from app.schemas.olt import OLT, OLTCreate, OLTUpdate, OLTStatus, OLTSyncFilter
 from app.models.olt import OLT as OLTModel, Port
-from app.services.snmp_client import SNMPClient
+from app.schemas.job import Job
+from app.services.alerts import evaluate_olt
+from app.services.discovery import olt_job, sync_olt, sync_olts
+from app.services.jobs import job_manager
+from app.services.snmp_client import create_snmp_client
 
 router = APIRouter()
 
+OLT_COLUMNS = schema_columns(OLTModel, OLT)
+
 
 @router.get("/", response_model=List[OLT])
-def get_olts(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Get all OLTs"""
-    olts = db.query(OLTModel).offset(skip).limit(limit).all()
-    return olts
+async def get_olts(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    skip: int = 0,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get all OLTs, by id; pass the X-Next-Cursor response header as cursor for the next page"""
+    unchanged = not_modified(request, response, await table_versions(db, [OLTModel.__tablename__]))
+    if unchanged is not None:
+        return unchanged
+    stmt = paginate(select(OLTModel), OLTModel.id, cursor, limit, skip)
+    if settings.FAST_JSON:
+        rows = (await db.execute(stmt.with_only_columns(*OLT_COLUMNS))).all()
+        return json_rows(page(rows, limit, response), response)
+    olts = await db.scalars(stmt)
+    return page(olts.all(), limit, response)
 
 
 @router.get("/{olt_id}", response_model=OLT)
@@ -88,12 +118,7 @@ def test_olt_connection(olt_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="OLT not found")
     
     # Create SNMP client
-    snmp = SNMPClient(
-        host=db_olt.ip_address,
-        community=db_olt.snmp_community,
-        port=db_olt.snmp_port,
-        version=db_olt.snmp_version
-    )
+    snmp = create_snmp_client(db_olt)
     
     # Test connection
     start_time = datetime.now()
@@ -114,24 +139,23 @@ def test_olt_connection(olt_id: int, db: Session = Depends(get_db)):
             except:
                 pass
         
+        evaluate_olt(db, db_olt)
         db.commit()
         
-        # Count ONUs
-        total_onus = db.query(OLTModel).filter(OLTModel.id == olt_id).count()
-        
         return OLTStatus(
             olt_id=olt_id,
             status="online",
             is_reachable=True,
             response_time=response_time,
             uptime=db_olt.uptime,
-            total_onus=total_onus,
-            online_onus=0,  # TODO: implement actual count
-            offline_onus=0
+            total_onus=db_olt.total_onus or 0,
+            online_onus=db_olt.online_onus or 0,
+            offline_onus=db_olt.offline_onus or 0
         )
     else:
         # Update status to offline
         db_olt.status = "offline"
+        evaluate_olt(db, db_olt)
         db.commit()
         
         return OLTStatus(
@@ -142,40 +166,53 @@ def test_olt_connection(olt_id: int, db: Session = Depends(get_db)):
         )
 
 
-@router.post("/{olt_id}/sync")
+@router.post("/{olt_id}/sync", response_model=Job, status_code=status.HTTP_202_ACCEPTED)
 def sync_olt_data(olt_id: int, db: Session = Depends(get_db)):
-    """Sync OLT data from device (discover ONUs)"""
+    """Queue a sync of OLT data from device; poll /jobs/{id} for progress"""
     db_olt = db.query(OLTModel).filter(OLTModel.id == olt_id).first()
     if not db_olt:
         raise HTTPException(status_code=404, detail="OLT not found")
     
-    # Create SNMP client
-    snmp = SNMPClient(
-        host=db_olt.ip_address,
-        community=db_olt.snmp_community,
-        port=db_olt.snmp_port,
-        version=db_olt.snmp_version
-    )
-    
-    # Test connection
-    if not snmp.test_connection():
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Cannot connect to OLT"
-        )
-    
-    # Get system info
-    sys_info = snmp.get_system_info()
-    db_olt.status = "online"
-    db_olt.last_seen = datetime.now()
-    
-    # Get ONU list
-    onus = snmp.get_onu_list()
-    
-    db.commit()
-    
-    return {
-        "message": "OLT data synced successfully",
-        "system_info": sys_info,
-        "onus_discovered": len(onus)
-    }
+    job = job_manager.submit("sync", olt_id, olt_job(sync_olt, olt_id))
+    return job.to_dict()
+
+
+@router.post("/sync-all")
+def sync_all_olts(filters: Optional[OLTSyncFilter] = None, db: Session = Depends(get_db)):
+    """
+    Sync many OLTs in parallel. Streams one NDJSON line per OLT as it
+    finishes, then a summary line with aggregate timing.
+    """
+    filters = filters or OLTSyncFilter()
+    query = db.query(OLTModel.id, OLTModel.name)
+    if filters.is_active is not None:
+        query = query.filter(OLTModel.is_active == filters.is_active)
+    if filters.location:
+        query = query.filter(OLTModel.location.ilike(f"%{filters.location}%"))
+    if filters.ids:
+        query = query.filter(OLTModel.id.in_(filters.ids))
+    names = dict(query.order_by(OLTModel.id).all())
+
+    def stream():
+        start = time.perf_counter()
+        succeeded = failed = 0
+        busy_time = 0.0
+        for outcome in sync_olts(list(names), settings.SYNC_ALL_MAX_WORKERS):
+            outcome["name"] = names[outcome["olt_id"]]
+            if outcome["status"] == "ok":
+                succeeded += 1
+            else:
+                failed += 1
+            busy_time += outcome["elapsed"]
+            yield json.dumps(outcome, default=str) + "\n"
+        yield json.dumps({
+            "summary": {
+                "total": len(names),
+                "succeeded": succeeded,
+                "failed": failed,
+                "elapsed": round(time.perf_counter() - start, 3),
+                "olt_time": round(busy_time, 3),  # sum of per-OLT times
+            }
+        }) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
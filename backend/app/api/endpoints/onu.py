@@ -1,101 +1,128 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import Select, func, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased
+from typing import Any, List, Optional
 
-from app.db.database import get_db
+from app.core.config import settings
+from app.api.pagination import MAX_PAGE_SIZE, page, paginate
+from app.api.serialization import json_rows, schema_columns
+from app.db.database import get_async_db, get_db
 from app.models.olt import OLT, Slot, Port
-from app.models.onu import ONU
-from app.services.snmp_client import SNMPClient
+from app.models.onu import ONU as ONUModel
+from app.schemas.job import Job
+from app.schemas.onu import ONU
+from app.services.discovery import discover_olt, olt_job
+from app.services.jobs import job_manager
 
-router = APIRouter(prefix="/onu", tags=["ONU"])
+router = APIRouter()
 
+ONU_COLUMNS = schema_columns(ONUModel, ONU)
 
-@router.get("/olt/{olt_id}/discover")
-def discover_onus(olt_id: int, db: Session = Depends(get_db)):
-    olt = db.query(OLT).filter(OLT.id == olt_id).first()
-    if not olt:
-        raise HTTPException(status_code=404, detail="OLT not found")
-
-    client = SNMPClient(
-        host=olt.ip_address,
-        community=olt.snmp_community,
-        port=olt.snmp_port,
-        version=olt.snmp_version,
-    )
-
-    # Walk ONUs via SNMP
-    discovered = client.get_onu_list()
-    if not discovered:
-        return {"found": 0, "created": 0, "updated": 0}
 
-    created = 0
-    updated = 0
+def filter_onus(
+    stmt: Select,
+    olt_id: Optional[int] = None,
+    slot: Optional[int] = None,
+    port: Optional[int] = None,
+    port_id: Optional[int] = None,
+    status: Optional[List[str]] = None,
+    auth_status: Optional[str] = None,
+    rx_min: Optional[float] = None,
+    rx_max: Optional[float] = None,
+    odp_id: Optional[int] = None,
+    customer: Optional[str] = None,
+) -> Select:
+    """Apply the GET /onu/ filters; each one is served by an onus index"""
+    if olt_id is not None:
+        stmt = stmt.where(ONUModel.olt_id == olt_id)
+    if slot is not None or port is not None:
+        ports = select(Port.id).join(Slot, Slot.id == Port.slot_id).where(Slot.olt_id == olt_id)
+        if slot is not None:
+            ports = ports.where(Slot.slot_number == slot)
+        if port is not None:
+            ports = ports.where(Port.port_number == port)
+        if slot is not None and port is not None:
+            # One port: an equality, so ix_onus_port_id_id keeps id order
+            stmt = stmt.where(ONUModel.port_id == ports.scalar_subquery())
+        else:
+            stmt = stmt.where(ONUModel.port_id.in_(ports))
+    if port_id is not None:
+        stmt = stmt.where(ONUModel.port_id == port_id)
+    if status:
+        stmt = stmt.where(ONUModel.status.in_(status))
+    if auth_status is not None:
+        stmt = stmt.where(ONUModel.auth_status == auth_status)
+    if rx_min is not None:
+        stmt = stmt.where(ONUModel.rx_power >= rx_min)
+    if rx_max is not None:
+        stmt = stmt.where(ONUModel.rx_power <= rx_max)
+    if odp_id is not None:
+        stmt = stmt.where(ONUModel.odp_id == odp_id)
+    if customer:
+        # A constant 'prefix%' pattern, so ix_onus_customer_name_lower_id can serve it
+        prefix = customer.lower().replace("/", "//").replace("%", "/%").replace("_", "/_")
+        stmt = stmt.where(func.lower(ONUModel.customer_name).like(prefix + "%", escape="/"))
+    return stmt
 
-    # Ensure Slot and Port exist; then upsert ONU using SN (fallback to composite key)
-    for item in discovered:
-        slot_no = item["slot"]
-        port_no = item["port"]
-        onu_id = item["onu_id"]
-        status = item.get("status")
-        suffix_raw = item.get("oid_suffix")
 
-        # Fetch details using raw suffix (ZTE encodes port index)
-        details = client.get_onu_details_suffix(suffix_raw)
-        sn = details.get("sn")
+def onu_page(cursor: Optional[str], limit: int, columns: Optional[List[Any]] = None,
+             status: Optional[List[str]] = None, **filters) -> Select:
+    """
+    One GET /onu/ page of ONU rows (or of `columns`): the filter_onus
+    filters in id order after cursor, plus a look-ahead row. With several
+    statuses each one is paged along its own ix_onus_status_id range and the
+    ranges are merged, instead of sorting every ONU in any of the statuses.
+    """
+    def branch(statuses: Optional[List[str]]) -> Select:
+        stmt = select(*columns) if columns else select(ONUModel)
+        return paginate(filter_onus(stmt, status=statuses, **filters), ONUModel.id, cursor, limit)
 
-        # Create or get Slot
-        slot = (
-            db.query(Slot)
-            .filter(Slot.olt_id == olt.id, Slot.slot_number == slot_no)
-            .first()
-        )
-        if not slot:
-            slot = Slot(olt_id=olt.id, slot_number=slot_no)
-            db.add(slot)
-            db.flush()
+    statuses = sorted(set(status or []))
+    if len(statuses) < 2:
+        return branch(statuses)
+    merged = union_all(*(select(branch([value]).subquery()) for value in statuses)).subquery()
+    selected = [merged.c[column.key] for column in columns] if columns else [aliased(ONUModel, merged)]
+    return select(*selected).order_by(merged.c.id).limit(limit + 1)
 
-        # Create or get Port (decoded port number)
-        port = (
-            db.query(Port)
-            .filter(Port.slot_id == slot.id, Port.port_number == port_no)
-            .first()
-        )
-        if not port:
-            port = Port(slot_id=slot.id, port_number=port_no)
-            db.add(port)
-            db.flush()
 
-        # Fallback: if SN is missing, synthesize a unique key
-        if not sn:
-            sn = f"UNKNOWN-{slot_no}-{port_no}-{onu_id}"
+@router.get("/", response_model=List[ONU])
+async def get_onus(
+    response: Response,
+    olt_id: Optional[int] = None,
+    slot: Optional[int] = None,
+    port: Optional[int] = None,
+    port_id: Optional[int] = None,
+    status: Optional[List[str]] = Query(None),
+    auth_status: Optional[str] = None,
+    rx_min: Optional[float] = None,
+    rx_max: Optional[float] = None,
+    odp_id: Optional[int] = None,
+    customer: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get ONUs by id; pass the X-Next-Cursor response header as cursor for the next page"""
+    if (slot is not None or port is not None) and olt_id is None:
+        raise HTTPException(status_code=400, detail="slot and port filters need olt_id")
+    filters = dict(
+        olt_id=olt_id, slot=slot, port=port, port_id=port_id, status=status,
+        auth_status=auth_status, rx_min=rx_min, rx_max=rx_max, odp_id=odp_id, customer=customer,
+    )
+    if settings.FAST_JSON:
+        rows = (await db.execute(onu_page(cursor, limit, ONU_COLUMNS, **filters))).all()
+        return json_rows(page(rows, limit, response), response)
+    onus = await db.scalars(onu_page(cursor, limit, **filters))
+    return page(onus.all(), limit, response)
 
-        # Upsert ONU by serial number (or synthesized key)
-        onu = db.query(ONU).filter(ONU.sn == sn).first()
-        if onu:
-            # Update existing ONU
-            onu.olt_id = olt.id
-            onu.port_id = port.id
-            onu.onu_id = onu_id
-            onu.status = status
-            onu.rx_power = details.get("rx_power")
-            onu.tx_power = details.get("tx_power")
-            onu.distance = details.get("distance")
-            updated += 1
-        else:
-            # Create new ONU
-            onu = ONU(
-                olt_id=olt.id,
-                port_id=port.id,
-                onu_id=onu_id,
-                sn=sn,
-                status=status,
-                rx_power=details.get("rx_power"),
-                tx_power=details.get("tx_power"),
-                distance=details.get("distance"),
-            )
-            db.add(onu)
-            created += 1
 
-    db.commit()
+@router.get("/olt/{olt_id}/discover", response_model=Job, status_code=status.HTTP_202_ACCEPTED)
+def discover_onus(olt_id: int, db: Session = Depends(get_db)):
+    """Queue ONU discovery for an OLT; poll /jobs/{id} for progress"""
+    olt = db.query(OLT).filter(OLT.id == olt_id).first()
+    if not olt:
+        raise HTTPException(status_code=404, detail="OLT not found")
 
-    return {"found": len(discovered), "created": created, "updated": updated}
+    job = job_manager.submit("discover", olt.id, olt_job(discover_olt, olt.id))
+    return job.to_dict()
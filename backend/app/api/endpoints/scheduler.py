@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+
+from app.services.poller import poll_scheduler
+
+router = APIRouter()
+
+
+@router.get("/status")
+def get_scheduler_status(tasks: bool = False):
+    """Get poll scheduler queue depth, lag and counters (per-task state with tasks=true)"""
+    return poll_scheduler.status(include_tasks=tasks)
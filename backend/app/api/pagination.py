@@ -0,0 +1,54 @@
+"""
+Keyset (cursor) pagination for list endpoints.
+
+Pages are ordered by primary key and continue after the last id seen, so
+every page costs one index range scan however deep the client scrolls.
+The cursor for the next page is returned in the X-Next-Cursor header and
+is absent on the last page.
+"""
+import base64
+import binascii
+import json
+from typing import Any, Dict, List, Optional
+
+from fastapi import HTTPException, Response
+from sqlalchemy import Select
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, dict) or not isinstance(values.get("id"), int):
+            raise ValueError(cursor)
+        return values
+    except (ValueError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def paginate(stmt: Select, key, cursor: Optional[str], limit: int, skip: int = 0) -> Select:
+    """
+    Order stmt by key (the primary key column) and start after cursor,
+    fetching one row more than limit to detect a following page. `skip`
+    is the deprecated offset paging, used only without a cursor.
+    """
+    if cursor:
+        stmt = stmt.where(key > decode_cursor(cursor)["id"])
+    elif skip:
+        stmt = stmt.offset(skip)
+    return stmt.order_by(key).limit(limit + 1)
+
+
+def page(rows: List[Any], limit: int, response: Response) -> List[Any]:
+    """Drop the look-ahead row and set X-Next-Cursor if there is a next page"""
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor({"id": rows[-1].id})
+    return rows
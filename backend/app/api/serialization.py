@@ -0,0 +1,35 @@
+"""
+Fast JSON for list endpoints (FAST_JSON setting).
+
+Instead of loading ORM objects and validating each one into its
+response_model, the endpoint selects exactly the schema's columns and
+orjson encodes the row tuples. That is only equivalent when every schema
+field is a plain column with no validator or computed value, which
+schema_columns() checks once at import time.
+"""
+from typing import Any, List, Sequence
+
+import orjson
+from fastapi import Response
+
+# Same datetime form as Pydantic ("...Z" for UTC)
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def schema_columns(model, schema) -> List[Any]:
+    """The model's columns for each field of the response schema, in schema order"""
+    if schema.model_config.get("json_encoders") or schema.__pydantic_decorators__.field_validators:
+        raise TypeError(f"{schema.__name__} transforms its fields; it needs the Pydantic path")
+    columns = []
+    for name in schema.model_fields:
+        column = model.__table__.columns.get(name)
+        if column is None:
+            raise TypeError(f"{schema.__name__}.{name} is not a {model.__tablename__} column")
+        columns.append(getattr(model, name))
+    return columns
+
+
+def json_rows(rows: Sequence[Any], response: Response) -> Response:
+    """A JSON array of rows (selected with schema_columns), with the headers already set on response"""
+    body = orjson.dumps([row._asdict() for row in rows], option=ORJSON_OPTIONS)
+    return Response(content=body, media_type="application/json", headers=dict(response.headers))
@@ -1,18 +1,57 @@
-from sqlalchemy import create_engine
+import os
+
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
+# Async drivers for the sync DATABASE_URL backends
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+
+def pool_options(url: str) -> dict:
+    """DB_POOL_* settings; SQLite's default pools take none of them"""
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+
+
+def async_database_url() -> str:
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    url = make_url(settings.DATABASE_URL)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername)).render_as_string(
+        hide_password=False
+    )
+
+
 # Create database engine
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
-    echo=settings.DEBUG
+    echo=settings.DEBUG,
+    **pool_options(settings.DATABASE_URL)
 )
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for the read-heavy endpoints (asyncpg, or aiosqlite on SQLite)
+async_engine = create_async_engine(
+    async_database_url(),
+    pool_pre_ping=True,
+    echo=settings.DEBUG,
+    **pool_options(settings.DATABASE_URL)
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # Create base class for models
 Base = declarative_base()
 
@@ -26,9 +65,30 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """Dependency to get an async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def alembic_config(url: str = None):
+    """Alembic configuration for backend/alembic, pointed at url (default DATABASE_URL)"""
+    from alembic.config import Config
+    backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    config = Config(os.path.join(backend_dir, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(backend_dir, "alembic"))
+    config.set_main_option("sqlalchemy.url", (url or settings.DATABASE_URL).replace("%", "%%"))
+    return config
+
+
 def init_db():
-    """Initialize database - create all tables"""
-    # Ensure all models are imported so their tables are registered
-    # Importing the package loads model modules and attaches tables to Base.metadata
-    import app.models  # noqa: F401
-    Base.metadata.create_all(bind=engine)
+    """Initialize database - create or upgrade all tables to the latest migration"""
+    from alembic import command
+    config = alembic_config()
+    # Keep the application's logging setup
+    config.attributes["configure_logger"] = False
+    tables = inspect(engine).get_table_names()
+    if "olts" in tables and "alembic_version" not in tables:
+        # Created with create_all before migrations existed
+        command.stamp(config, "0001")
+    command.upgrade(config, "head")
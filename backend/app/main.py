@@ -1,8 +1,17 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from app.core.config import settings
-from app.db.database import init_db
-from app.api.endpoints import auth, olt, onu, odp, dashboard, cable_route
+from app.db.database import async_engine, init_db
+from app.api.compression import CompressionMiddleware
+from app.api.pagination import NEXT_CURSOR_HEADER
+from app.services.snmp_client import session_registry
+from app.services.async_snmp_client import snmp_event_loop
+from app.services.events import event_broker
+from app.services.jobs import job_manager
+from app.services.metrics import metrics_writer
+from app.services.poller import poll_scheduler
+from app.api.endpoints import auth, olt, onu, odp, dashboard, cable_route, jobs, scheduler, metrics, export, importer, events, alerts
 
 # Create FastAPI app
 app = FastAPI(
@@ -10,7 +19,8 @@ app = FastAPI(
     version=settings.APP_VERSION,
     docs_url=f"{settings.API_PREFIX}/docs",
     redoc_url=f"{settings.API_PREFIX}/redoc",
-    openapi_url=f"{settings.API_PREFIX}/openapi.json"
+    openapi_url=f"{settings.API_PREFIX}/openapi.json",
+    default_response_class=ORJSONResponse if settings.FAST_JSON else JSONResponse
 )
 
 # Configure CORS
@@ -20,8 +30,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    )
+
 # Include routers
 app.include_router(auth.router, prefix=f"{settings.API_PREFIX}/auth", tags=["Authentication"])
 app.include_router(olt.router, prefix=f"{settings.API_PREFIX}/olt", tags=["OLT Management"])
@@ -29,12 +48,35 @@ app.include_router(onu.router, prefix=f"{settings.API_PREFIX}/onu", tags=["ONU M
 app.include_router(odp.router, prefix=f"{settings.API_PREFIX}/odp", tags=["ODP Management"])
 app.include_router(cable_route.router, prefix=f"{settings.API_PREFIX}/cable-route", tags=["Cable Routes"])
 app.include_router(dashboard.router, prefix=f"{settings.API_PREFIX}/dashboard", tags=["Dashboard"])
+app.include_router(jobs.router, prefix=f"{settings.API_PREFIX}/jobs", tags=["Jobs"])
+app.include_router(scheduler.router, prefix=f"{settings.API_PREFIX}/scheduler", tags=["Scheduler"])
+app.include_router(metrics.router, prefix=f"{settings.API_PREFIX}/metrics", tags=["Metrics"])
+app.include_router(export.router, prefix=f"{settings.API_PREFIX}/export", tags=["Export"])
+app.include_router(importer.router, prefix=f"{settings.API_PREFIX}/import", tags=["Import"])
+app.include_router(events.router, prefix=f"{settings.API_PREFIX}/events", tags=["Events"])
+app.include_router(alerts.router, prefix=f"{settings.API_PREFIX}/alerts", tags=["Alerts"])
 
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database on startup"""
+    """Initialize database and start the metrics writer, event broker and poller on startup"""
     init_db()
+    metrics_writer.start()
+    await event_broker.start()
+    if settings.POLL_SCHEDULER_ENABLED:
+        poll_scheduler.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the poller and background jobs, flush metrics, release pooled SNMP engines"""
+    poll_scheduler.stop()
+    job_manager.shutdown()
+    metrics_writer.stop()
+    await event_broker.stop()
+    await async_engine.dispose()
+    session_registry.close_all()
+    snmp_event_loop.stop()
 
 
 @app.get("/")
@@ -3,5 +3,8 @@ from .olt import OLT, Slot, Port
 from .onu import ONU
 from .odp import ODP
 from .cable_route import CableRoute
+from .metrics import ONUMetric, ONUMetricRollup
+from .version import TableVersion
+from .alert import Alert
 
-__all__ = ["User", "OLT", "Slot", "Port", "ONU", "ODP", "CableRoute"]
+__all__ = ["User", "OLT", "Slot", "Port", "ONU", "ODP", "CableRoute", "ONUMetric", "ONUMetricRollup", "TableVersion", "Alert"]
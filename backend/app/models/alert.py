@@ -0,0 +1,49 @@
+from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Index, text
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+
+class Alert(Base):
+    """
+    One occurrence of an alert rule (app.services.alerts.RULES) on an OLT,
+    port or ONU. `key` identifies the condition (rule + target); at most
+    one alert per key is not cleared.
+    """
+    __tablename__ = "alerts"
+    
+    id = Column(Integer, primary_key=True)
+    key = Column(String(100), nullable=False)  # e.g. onu_rx_low:onu:42
+    rule = Column(String(30), nullable=False)
+    severity = Column(String(10), nullable=False)  # error, warning
+    
+    # Target (the ONU's OLT and port are filled in as well)
+    olt_id = Column(Integer, ForeignKey("olts.id", ondelete="CASCADE"), nullable=False)
+    port_id = Column(Integer, ForeignKey("ports.id", ondelete="CASCADE"))
+    onu_id = Column(Integer, ForeignKey("onus.id", ondelete="CASCADE"))
+    
+    # pending (condition seen, waiting out the rule's delay), open, acknowledged, cleared
+    state = Column(String(15), nullable=False)
+    message = Column(String(255), nullable=False)
+    value = Column(Float)  # measurement that triggered the rule (dBm, ONU count)
+    flaps = Column(Integer, nullable=False, default=0)  # times reopened after clearing
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    raise_at = Column(DateTime(timezone=True))  # pending: opens at this time
+    opened_at = Column(DateTime(timezone=True))
+    last_seen_at = Column(DateTime(timezone=True))  # condition last confirmed
+    clear_at = Column(DateTime(timezone=True))  # condition gone: clears at this time unless it returns
+    acknowledged_at = Column(DateTime(timezone=True))
+    cleared_at = Column(DateTime(timezone=True))
+    
+    __table_args__ = (
+        Index(
+            "uq_alerts_key_active", "key", unique=True,
+            postgresql_where=text("state <> 'cleared'"),
+            sqlite_where=text("state <> 'cleared'"),
+        ),
+        Index("ix_alerts_key_cleared_at", "key", "cleared_at"),
+        Index("ix_alerts_state_opened_at", "state", "opened_at"),
+        Index("ix_alerts_olt_id_state", "olt_id", "state"),
+        Index("ix_alerts_onu_id", "onu_id"),
+        Index("ix_alerts_port_id", "port_id"),
+    )
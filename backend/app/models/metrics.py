@@ -0,0 +1,38 @@
+from sqlalchemy import Column, Integer, SmallInteger, DateTime, Float, ForeignKey, REAL
+from app.db.database import Base
+
+
+class ONUMetric(Base):
+    """
+    Append-only ONU optical/distance samples, one row per ONU per poll.
+    On PostgreSQL the table is range-partitioned by day on ts (partitions
+    are created by the metrics writer and dropped after the raw retention).
+    """
+    __tablename__ = "onu_metrics"
+    __table_args__ = {"postgresql_partition_by": "RANGE (ts)"}
+    
+    onu_id = Column(Integer, ForeignKey("onus.id", ondelete="CASCADE"), primary_key=True)
+    ts = Column(DateTime(timezone=True), primary_key=True)
+    
+    # float32 readings
+    rx_power = Column(REAL)  # dBm
+    tx_power = Column(REAL)  # dBm
+    olt_rx_power = Column(REAL)  # dBm
+    temperature = Column(REAL)
+    voltage = Column(REAL)
+    distance = Column(Integer)  # meters
+
+
+class ONUMetricRollup(Base):
+    """5-minute and 1-hour aggregates of one ONU metric (see app.services.metrics.METRICS)"""
+    __tablename__ = "onu_metric_rollups"
+    
+    onu_id = Column(Integer, ForeignKey("onus.id", ondelete="CASCADE"), primary_key=True)
+    metric = Column(SmallInteger, primary_key=True)
+    resolution = Column(Integer, primary_key=True)  # bucket size in seconds: 300, 3600
+    bucket = Column(DateTime(timezone=True), primary_key=True)  # bucket start
+    
+    samples = Column(Integer, nullable=False)
+    min_value = Column(REAL)
+    max_value = Column(REAL)
+    sum_value = Column(Float)  # avg = sum_value / samples
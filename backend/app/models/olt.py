@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Float, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Float, ForeignKey, Text, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
@@ -26,7 +26,17 @@ class OLT(Base):
     # Status
     is_active = Column(Boolean, default=True)
     last_seen = Column(DateTime(timezone=True))
-    status = Column(String(20), default="unknown")  # online, offline, unknown
+    status = Column(String(20), default="unknown", index=True)  # online, offline, unknown
+    
+    # Polling intervals in seconds (NULL = POLL_*_INTERVAL setting)
+    poll_reachability_interval = Column(Integer)
+    poll_onu_status_interval = Column(Integer)
+    poll_optics_interval = Column(Integer)
+    
+    # ONU Statistics (kept up to date by discovery/polling)
+    total_onus = Column(Integer, default=0)
+    online_onus = Column(Integer, default=0)
+    offline_onus = Column(Integer, default=0)
     
     # Device Info (from SNMP)
     vendor = Column(String(50), default="ZTE")
@@ -61,6 +71,10 @@ class Slot(Base):
     # Relationships
     olt = relationship("OLT", back_populates="slots")
     ports = relationship("Port", back_populates="slot", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        UniqueConstraint("olt_id", "slot_number", name="uq_slots_olt_id_slot_number"),
+    )
 
 
 class Port(Base):
@@ -88,3 +102,7 @@ class Port(Base):
     slot = relationship("Slot", back_populates="ports")
     onus = relationship("ONU", back_populates="port")
     odps = relationship("ODP", back_populates="port")
+    
+    __table_args__ = (
+        UniqueConstraint("slot_id", "port_number", name="uq_ports_slot_id_port_number"),
+    )
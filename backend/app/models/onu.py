@@ -1,8 +1,11 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Float, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Float, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
 
+# OLT RX power (dBm) below which an ONU has a low signal; ix_onus_low_rx_power covers it
+LOW_RX_POWER = -27
+
 
 class ONU(Base):
     __tablename__ = "onus"
@@ -24,11 +27,11 @@ class ONU(Base):
     service_plan = Column(String(100))
     
     # Status
-    status = Column(String(20), default="offline")  # online, offline, los, dying-gasp
+    status = Column(String(20), default="offline")  # online, offline, los, dying-gasp, missing
     auth_status = Column(String(20), default="unauthorized")  # authorized, unauthorized
     
     # Signal Quality
-    rx_power = Column(Float)  # OLT RX power (from ONU) in dBm
+    rx_power = Column(Float, index=True)  # OLT RX power (from ONU) in dBm
     tx_power = Column(Float)  # ONU TX power in dBm
     olt_rx_power = Column(Float)  # ONU RX power (from OLT) in dBm
     distance = Column(Integer)  # Distance in meters
@@ -53,10 +56,31 @@ class ONU(Base):
     
     # Metadata
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
     olt = relationship("OLT", back_populates="onus")
     port = relationship("Port", back_populates="onus")
     odp = relationship("ODP", back_populates="onus")
+    
+    __table_args__ = (
+        Index("ix_onus_olt_id_port_id_onu_id", "olt_id", "port_id", "onu_id"),
+        # GET /onu/ filters: (filter column, id) reads one page of matches in id order
+        Index("ix_onus_olt_id_id", "olt_id", "id"),
+        Index("ix_onus_port_id_id", "port_id", "id"),
+        Index("ix_onus_status_id", "status", "id"),
+        Index("ix_onus_auth_status_id", "auth_status", "id"),
+        Index("ix_onus_odp_id_id", "odp_id", "id"),
+        Index(
+            "ix_onus_low_rx_power", "rx_power",
+            postgresql_where=rx_power < LOW_RX_POWER,
+            sqlite_where=rx_power < LOW_RX_POWER,
+        ),
+        # Case-insensitive customer name prefix search
+        Index(
+            "ix_onus_customer_name_lower_id",
+            func.lower(customer_name).label("customer_name_lower"), "id",
+            postgresql_ops={"customer_name_lower": "text_pattern_ops"},
+        ),
+    )
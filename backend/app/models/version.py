@@ -0,0 +1,12 @@
+from sqlalchemy import Column, BigInteger, String, DateTime
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+
+class TableVersion(Base):
+    """Write counter per table, bumped by every commit that changes it (app.services.versions)"""
+    __tablename__ = "table_versions"
+    
+    table_name = Column(String(50), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -1,13 +1,15 @@
 from .user import User, UserCreate, UserLogin, Token
-from .olt import OLT, OLTCreate, OLTUpdate, OLTStatus
+from .olt import OLT, OLTCreate, OLTUpdate, OLTStatus, OLTSyncFilter
 from .onu import ONU, ONUCreate, ONUUpdate
 from .odp import ODP, ODPCreate, ODPUpdate
 from .cable_route import CableRoute, CableRouteCreate
+from .job import Job
 
 __all__ = [
     "User", "UserCreate", "UserLogin", "Token",
-    "OLT", "OLTCreate", "OLTUpdate", "OLTStatus",
+    "OLT", "OLTCreate", "OLTUpdate", "OLTStatus", "OLTSyncFilter",
     "ONU", "ONUCreate", "ONUUpdate",
     "ODP", "ODPCreate", "ODPUpdate",
-    "CableRoute", "CableRouteCreate"
+    "CableRoute", "CableRouteCreate",
+    "Job"
 ]
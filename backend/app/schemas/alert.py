@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+
+class Alert(BaseModel):
+    id: int
+    rule: str
+    severity: str  # error, warning
+    state: str  # pending, open, acknowledged, cleared
+    olt_id: int
+    port_id: Optional[int] = None
+    onu_id: Optional[int] = None
+    message: str
+    value: Optional[float] = None
+    flaps: int
+    created_at: datetime
+    opened_at: Optional[datetime] = None
+    last_seen_at: Optional[datetime] = None
+    acknowledged_at: Optional[datetime] = None
+    cleared_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from typing import Any, Dict, Optional
+from datetime import datetime
+
+
+class Job(BaseModel):
+    id: str
+    kind: str  # discover, sync
+    olt_id: int
+    phase: str  # queued, connecting, walking, writing, done, failed
+    rows_processed: int = 0
+    pdus_sent: int = 0
+    elapsed: float = 0.0  # seconds
+    created_at: datetime
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
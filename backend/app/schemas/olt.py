@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -17,6 +17,9 @@ class OLTBase(BaseModel):
     location: Optional[str] = None
     latitude: Optional[float] = None
     longitude: Optional[float] = None
+    poll_reachability_interval: Optional[int] = None
+    poll_onu_status_interval: Optional[int] = None
+    poll_optics_interval: Optional[int] = None
 
 
 class OLTCreate(OLTBase):
@@ -33,6 +36,9 @@ class OLTUpdate(BaseModel):
     location: Optional[str] = None
     latitude: Optional[float] = None
     longitude: Optional[float] = None
+    poll_reachability_interval: Optional[int] = None
+    poll_onu_status_interval: Optional[int] = None
+    poll_optics_interval: Optional[int] = None
 
 
 class OLT(OLTBase):
@@ -45,6 +51,9 @@ class OLT(OLTBase):
     firmware_version: Optional[str] = None
     serial_number: Optional[str] = None
     uptime: Optional[int] = None
+    total_onus: int = 0
+    online_onus: int = 0
+    offline_onus: int = 0
     created_at: datetime
     updated_at: Optional[datetime] = None
     
@@ -52,6 +61,13 @@ class OLT(OLTBase):
         from_attributes = True
 
 
+class OLTSyncFilter(BaseModel):
+    """Selects the OLTs synced by /olt/sync-all"""
+    is_active: Optional[bool] = True
+    location: Optional[str] = None  # case-insensitive substring
+    ids: Optional[List[int]] = None
+
+
 class OLTStatus(BaseModel):
     olt_id: int
     status: str
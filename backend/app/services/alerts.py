@@ -0,0 +1,359 @@
+from sqlalchemy import and_, delete, func, insert, or_, select, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+import logging
+
+from app.core.config import settings
+from app.models.alert import Alert
+from app.models.olt import OLT, Slot, Port
+from app.models.onu import ONU
+from app.services.events import queue_events
+
+logger = logging.getLogger(__name__)
+
+# Rule -> (severity, title)
+RULES: Dict[str, tuple] = {
+    "olt_unreachable": ("error", "OLT Unreachable"),
+    "port_los": ("error", "Port LOS"),
+    "port_dying_gasp": ("error", "Port Power Failure"),
+    "onu_offline": ("warning", "ONU Offline"),
+    "onu_rx_low": ("warning", "Low RX Power"),
+    "onu_rx_high": ("warning", "High RX Power"),
+    "onu_tx_low": ("warning", "Low TX Power"),
+    "onu_tx_high": ("warning", "High TX Power"),
+}
+
+# States of a raised alert (shown on the dashboard)
+ACTIVE_STATES = ("open", "acknowledged")
+ALERT_STATES = ("pending",) + ACTIVE_STATES + ("cleared",)
+
+# Alert keys per "key IN (...)" lookup
+KEY_LOOKUP_CHUNK = 1000
+
+
+def alert_key(rule: str, target: str, target_id: int) -> str:
+    return f"{rule}:{target}:{target_id}"
+
+
+def _aware(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)  # SQLite
+    return value
+
+
+def _chunks(items: List[Any], size: int) -> Iterable[List[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def alert_event(alert, state: str, previous: Optional[str]) -> Dict[str, Any]:
+    """Event for /events/stream; alert is an Alert or a row with its columns"""
+    return {
+        "type": "alert", "id": alert.id, "rule": alert.rule, "severity": alert.severity,
+        "olt_id": alert.olt_id, "port_id": alert.port_id, "onu_id": alert.onu_id,
+        "state": state, "previous": previous, "message": alert.message,
+    }
+
+
+class AlertBatch:
+    """
+    Rule outcomes observed during one evaluation, written with a few bulk
+    statements in the caller's transaction.
+
+    Each observation says whether a condition (alert key) holds. A
+    condition has to hold for its rule's delay before its alert opens
+    (until then the alert is "pending", and disappears if the condition
+    goes away), and has to stay gone for ALERT_CLEAR_AFTER before the alert
+    clears. A condition that returns within ALERT_REOPEN_WINDOW of clearing
+    reopens the same alert and counts a flap instead of raising a new one.
+    Threshold rules pass a looser `held` condition that keeps an existing
+    alert from clearing while the value hovers around the threshold.
+    """
+
+    def __init__(self, now: Optional[datetime] = None):
+        self.now = now or datetime.now(timezone.utc)
+        self._observed: Dict[str, Dict[str, Any]] = {}
+
+    def observe(self, rule: str, key: str, raised: bool, target: Dict[str, Any], message: str,
+                value: Optional[float] = None, delay: int = 0, held: Optional[bool] = None):
+        self._observed[key] = {
+            "rule": rule, "raised": raised, "held": raised if held is None else held,
+            "target": target, "message": message, "value": value, "delay": delay,
+        }
+
+    def _existing(self, db: Session) -> Dict[str, Any]:
+        """Key -> its not-cleared alert, or else its alert cleared within the reopen window"""
+        reopen_after = self.now - timedelta(seconds=settings.ALERT_REOPEN_WINDOW)
+        existing: Dict[str, Any] = {}
+        for chunk in _chunks(list(self._observed), KEY_LOOKUP_CHUNK):
+            rows = db.execute(
+                select(Alert.id, Alert.key, Alert.rule, Alert.severity, Alert.olt_id, Alert.port_id,
+                       Alert.onu_id, Alert.state, Alert.message, Alert.raise_at, Alert.clear_at,
+                       Alert.cleared_at, Alert.flaps)
+                .where(Alert.key.in_(chunk), or_(Alert.state != "cleared", Alert.cleared_at >= reopen_after))
+            ).all()
+            for row in rows:
+                current = existing.get(row.key)
+                if current is None or current.state == "cleared" and (
+                    row.state != "cleared" or _aware(row.cleared_at) > _aware(current.cleared_at)
+                ):
+                    existing[row.key] = row
+        return existing
+
+    def apply(self, db: Session) -> Dict[str, int]:
+        """Write the state changes; returns counts of opened/cleared/reopened alerts"""
+        counts = {"opened": 0, "cleared": 0, "reopened": 0}
+        if not self._observed:
+            return counts
+        now = self.now
+        existing = self._existing(db)
+        inserts: List[Dict[str, Any]] = []
+        updates: List[Dict[str, Any]] = []
+        dropped: List[int] = []
+        events: List[Dict[str, Any]] = []
+
+        for key, seen in self._observed.items():
+            alert = existing.get(key)
+            fields = {
+                **seen["target"], "message": seen["message"][:255], "value": seen["value"], "last_seen_at": now,
+            }
+            if alert is None or alert.state == "cleared":
+                if not seen["raised"]:
+                    continue
+                if alert is not None:
+                    # Back within the reopen window: same alert, one more flap
+                    updates.append({
+                        "id": alert.id, **fields, "state": "open", "opened_at": now, "clear_at": None,
+                        "cleared_at": None, "acknowledged_at": None, "flaps": alert.flaps + 1,
+                    })
+                    events.append(alert_event(alert, "open", "cleared"))
+                    counts["reopened"] += 1
+                    continue
+                severity, _ = RULES[seen["rule"]]
+                row = {"key": key, "rule": seen["rule"], "severity": severity, "flaps": 0, **fields}
+                if seen["delay"] > 0:
+                    row.update(state="pending", raise_at=now + timedelta(seconds=seen["delay"]))
+                else:
+                    row.update(state="open", opened_at=now)
+                    counts["opened"] += 1
+                inserts.append(row)
+            elif alert.state == "pending":
+                if not seen["held"]:
+                    dropped.append(alert.id)  # a blip shorter than the rule's delay
+                elif _aware(alert.raise_at) <= now:
+                    updates.append({"id": alert.id, **fields, "state": "open", "opened_at": now})
+                    events.append(alert_event(alert, "open", "pending"))
+                    counts["opened"] += 1
+                else:
+                    updates.append({"id": alert.id, **fields})
+            elif seen["held"]:
+                updates.append({"id": alert.id, **fields, "clear_at": None})
+            elif alert.clear_at is None and settings.ALERT_CLEAR_AFTER > 0:
+                updates.append({"id": alert.id, "clear_at": now + timedelta(seconds=settings.ALERT_CLEAR_AFTER)})
+            elif alert.clear_at is None or _aware(alert.clear_at) <= now:
+                updates.append({"id": alert.id, "state": "cleared", "cleared_at": now, "clear_at": None})
+                events.append(alert_event(alert, "cleared", alert.state))
+                counts["cleared"] += 1
+
+        if dropped:
+            db.execute(delete(Alert).where(Alert.id.in_(dropped)))
+        if updates:
+            # One executemany per distinct column set
+            by_columns: Dict[tuple, List[Dict[str, Any]]] = {}
+            for row in updates:
+                by_columns.setdefault(tuple(sorted(row)), []).append(row)
+            for rows in by_columns.values():
+                db.execute(update(Alert), rows)
+        if inserts:
+            _insert_alerts(db, inserts)
+            opened = [row["key"] for row in inserts if row["state"] == "open"]
+            for chunk in _chunks(opened, KEY_LOOKUP_CHUNK):
+                for alert in db.execute(
+                    select(Alert).where(Alert.key.in_(chunk), Alert.state == "open")
+                ).scalars():
+                    events.append(alert_event(alert, "open", None))
+        queue_events(db, events)
+        return counts
+
+
+def _insert_alerts(db: Session, rows: List[Dict[str, Any]]):
+    # Another poll of the same OLT may have raised the same key meanwhile;
+    # its alert stands and this observation is picked up next time
+    dialect = db.get_bind().dialect.name
+    columns = sorted({column for row in rows for column in row})
+    rows = [{column: row.get(column) for column in columns} for row in rows]
+    if dialect in ("postgresql", "sqlite"):
+        dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = dialect_insert(Alert).on_conflict_do_nothing(
+            index_elements=[Alert.key], index_where=text("state <> 'cleared'")
+        )
+        db.execute(stmt, rows)
+    else:
+        db.execute(insert(Alert), rows)
+
+
+def _power_rules(batch: AlertBatch, onu, target: Dict[str, Any]):
+    """RX/TX power thresholds, with ALERT_POWER_HYSTERESIS dB before clearing"""
+    hysteresis = settings.ALERT_POWER_HYSTERESIS
+    for name, label, value, low, high in (
+        ("rx", "RX", onu.rx_power, settings.ALERT_RX_POWER_MIN, settings.ALERT_RX_POWER_MAX),
+        ("tx", "TX", onu.tx_power, settings.ALERT_TX_POWER_MIN, settings.ALERT_TX_POWER_MAX),
+    ):
+        if value is None:
+            continue
+        batch.observe(
+            f"onu_{name}_low", alert_key(f"onu_{name}_low", "onu", onu.id),
+            value < low, target, f"ONU {onu.sn} {label} power {value:.2f} dBm is below {low:g} dBm",
+            value=value, held=value < low + hysteresis,
+        )
+        batch.observe(
+            f"onu_{name}_high", alert_key(f"onu_{name}_high", "onu", onu.id),
+            value > high, target, f"ONU {onu.sn} {label} power {value:.2f} dBm is above {high:g} dBm",
+            value=value, held=value > high - hysteresis,
+        )
+
+
+def evaluate_onus(db: Session, olt: OLT, sns: Iterable[str]) -> Dict[str, int]:
+    """
+    Evaluate the ONU rules (offline duration, RX/TX power) for the given
+    ONUs as stored now, and the LOS/dying-gasp rules of their ports. Call
+    it in the transaction that wrote them, before commit.
+    """
+    batch = AlertBatch()
+    ports = set()
+    sns = list(dict.fromkeys(sns))
+    for chunk in _chunks(sns, KEY_LOOKUP_CHUNK):
+        onus = db.execute(
+            select(ONU.id, ONU.sn, ONU.olt_id, ONU.port_id, ONU.status, ONU.rx_power, ONU.tx_power)
+            .where(ONU.sn.in_(chunk))
+        ).all()
+        for onu in onus:
+            ports.add(onu.port_id)
+            target = {"olt_id": onu.olt_id, "port_id": onu.port_id, "onu_id": onu.id}
+            online = onu.status == "online"
+            batch.observe(
+                "onu_offline", alert_key("onu_offline", "onu", onu.id), not online, target,
+                f"ONU {onu.sn} is {onu.status}", delay=settings.ALERT_ONU_OFFLINE_AFTER,
+            )
+            # Optics of an ONU that is not online are stale; leave power alerts as they are
+            if online:
+                _power_rules(batch, onu, target)
+    _port_rules(db, olt, ports, batch)
+    return batch.apply(db)
+
+
+def _port_rules(db: Session, olt: OLT, port_ids: Iterable[int], batch: AlertBatch):
+    """ONUs in LOS / dying gasp per port: many at once point at the fiber or the power"""
+    port_ids = sorted(port_id for port_id in port_ids if port_id is not None)
+    if not port_ids:
+        return
+    counts: Dict[tuple, int] = {}
+    labels: Dict[int, str] = {}
+    for chunk in _chunks(port_ids, KEY_LOOKUP_CHUNK):
+        counts.update(
+            ((port_id, status), count)
+            for port_id, status, count in db.execute(
+                select(ONU.port_id, ONU.status, func.count())
+                .where(ONU.port_id.in_(chunk), ONU.status.in_(("los", "dying-gasp")))
+                .group_by(ONU.port_id, ONU.status)
+            ).all()
+        )
+        labels.update(
+            (port_id, f"{slot_no}/{port_no}")
+            for port_id, slot_no, port_no in db.execute(
+                select(Port.id, Slot.slot_number, Port.port_number)
+                .join(Slot, Slot.id == Port.slot_id)
+                .where(Port.id.in_(chunk))
+            ).all()
+        )
+    for rule, status, label, minimum in (
+        ("port_los", "los", "in LOS", settings.ALERT_PORT_LOS_MIN),
+        ("port_dying_gasp", "dying-gasp", "reporting dying gasp", settings.ALERT_PORT_DYING_GASP_MIN),
+    ):
+        for port_id in port_ids:
+            count = counts.get((port_id, status), 0)
+            batch.observe(
+                rule, alert_key(rule, "port", port_id), count >= minimum,
+                {"olt_id": olt.id, "port_id": port_id, "onu_id": None},
+                f"{count} ONUs {label} on port {labels.get(port_id, port_id)} of OLT {olt.name}",
+                value=count,
+            )
+
+
+def evaluate_olt(db: Session, olt: OLT, now: Optional[datetime] = None) -> Dict[str, int]:
+    """
+    Evaluate the OLT unreachable rule from olt.status, then open or clear
+    this OLT's alerts whose delay has run out since they were last
+    evaluated. The reachability poll calls it, so an alert waiting on time
+    alone still moves once a poll interval. Call before commit.
+    """
+    batch = AlertBatch(now)
+    batch.observe(
+        "olt_unreachable", alert_key("olt_unreachable", "olt", olt.id), olt.status == "offline",
+        {"olt_id": olt.id, "port_id": None, "onu_id": None}, f"OLT {olt.name} is unreachable",
+        delay=settings.ALERT_OLT_UNREACHABLE_AFTER,
+    )
+    counts = batch.apply(db)
+    for name, count in _sweep(db, olt, batch.now).items():
+        counts[name] += count
+    return counts
+
+
+def _sweep(db: Session, olt: OLT, now: datetime) -> Dict[str, int]:
+    """Open pending alerts whose delay has passed and clear alerts gone for ALERT_CLEAR_AFTER"""
+    due_to_open = and_(Alert.state == "pending", Alert.raise_at <= now)
+    if olt.status == "offline":
+        # ONU and port state is unknown while the OLT is unreachable; its own alert covers them
+        due_to_open = and_(due_to_open, Alert.port_id.is_(None), Alert.onu_id.is_(None))
+    due = db.execute(
+        select(Alert.id, Alert.rule, Alert.severity, Alert.olt_id, Alert.port_id, Alert.onu_id,
+               Alert.state, Alert.message)
+        .where(Alert.olt_id == olt.id, or_(due_to_open, and_(Alert.state.in_(ACTIVE_STATES), Alert.clear_at <= now)))
+    ).all()
+    counts = {"opened": 0, "cleared": 0}
+    if not due:
+        return counts
+    opening = [alert for alert in due if alert.state == "pending"]
+    clearing = [alert for alert in due if alert.state != "pending"]
+    if opening:
+        db.execute(update(Alert), [{"id": alert.id, "state": "open", "opened_at": now} for alert in opening])
+    if clearing:
+        db.execute(update(Alert), [
+            {"id": alert.id, "state": "cleared", "cleared_at": now, "clear_at": None} for alert in clearing
+        ])
+    queue_events(db, [alert_event(alert, "open", "pending") for alert in opening] +
+                 [alert_event(alert, "cleared", alert.state) for alert in clearing])
+    counts["opened"], counts["cleared"] = len(opening), len(clearing)
+    return counts
+
+
+def acknowledge_alert(db: Session, alert: Alert):
+    """Mark an open alert as seen; it stays on the dashboard until it clears"""
+    if alert.state != "open":
+        raise ValueError(f"Only open alerts can be acknowledged (this one is {alert.state})")
+    alert.state = "acknowledged"
+    alert.acknowledged_at = datetime.now(timezone.utc)
+    queue_events(db, [alert_event(alert, "acknowledged", "open")])
+    db.commit()
+
+
+def reconcile_alerts(db: Session) -> Dict[str, int]:
+    """
+    Evaluate every rule for every active OLT and all of its ONUs, one
+    commit per OLT. Catches conditions that predate the alert engine or
+    changed outside a poll (imports, edits); run with the counter recount.
+    """
+    totals = {"opened": 0, "cleared": 0, "reopened": 0}
+    for olt in db.query(OLT).filter(OLT.is_active == True).all():  # noqa: E712
+        counts = evaluate_olt(db, olt)
+        sns = [sn for sn, in db.query(ONU.sn).filter(ONU.olt_id == olt.id)]
+        for name, count in evaluate_onus(db, olt, sns).items():
+            counts[name] = counts.get(name, 0) + count
+        db.commit()
+        for name in totals:
+            totals[name] += counts.get(name, 0)
+    if any(totals.values()):
+        logger.info(f"Alert reconciliation: {totals}")
+    return totals
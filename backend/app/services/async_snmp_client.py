@@ -0,0 +1,403 @@
+import asyncio
+import logging
+import random
+import socket
+import threading
+import weakref
+from typing import Optional, Dict, List, Tuple
+
+from pyasn1.codec.ber import decoder, encoder
+from pysnmp.proto import api
+
+from app.core.config import settings
+from app.services.snmp_client import SNMPClient, SNMPResult, ONUIndex, ONUTableRow, EXCEPTION_VALUES
+
+logger = logging.getLogger(__name__)
+
+REQUEST_TIMED_OUT = "No SNMP response received before timeout"
+
+
+class _SNMPProtocol(asyncio.DatagramProtocol):
+    """UDP endpoint shared by every OLT polled from one event loop"""
+
+    def __init__(self):
+        self.transport = None
+        self.pending: Dict[int, asyncio.Future] = {}
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        try:
+            pMod = api.protoModules[int(api.decodeMessageVersion(data))]
+            message, _ = decoder.decode(data, asn1Spec=pMod.Message())
+            pdu = pMod.apiMessage.getPDU(message)
+            request_id = int(pMod.apiPDU.getRequestID(pdu))
+        except Exception as e:
+            logger.debug(f"Dropping undecodable SNMP datagram from {addr}: {e}")
+            return
+        future = self.pending.get(request_id)
+        if future is not None and not future.done():
+            future.set_result(pdu)
+
+    def error_received(self, exc):
+        logger.debug(f"SNMP socket error: {exc}")
+
+
+class _LoopState:
+    """Sockets and concurrency limits bound to one event loop"""
+
+    def __init__(self):
+        self.endpoints: Dict[int, _SNMPProtocol] = {}
+        self.endpoint_lock = asyncio.Lock()
+        self.global_limit = asyncio.Semaphore(settings.SNMP_ASYNC_MAX_CONCURRENCY)
+        self.olt_limits: Dict[Tuple[str, int], asyncio.Semaphore] = {}
+
+    async def endpoint(self, family: int) -> _SNMPProtocol:
+        async with self.endpoint_lock:
+            protocol = self.endpoints.get(family)
+            if protocol is None or protocol.transport is None or protocol.transport.is_closing():
+                loop = asyncio.get_running_loop()
+                _, protocol = await loop.create_datagram_endpoint(_SNMPProtocol, family=family)
+                self.endpoints[family] = protocol
+            return protocol
+
+    def olt_limit(self, key: Tuple[str, int]) -> asyncio.Semaphore:
+        limit = self.olt_limits.get(key)
+        if limit is None:
+            limit = asyncio.Semaphore(settings.SNMP_ASYNC_PER_OLT_CONCURRENCY)
+            self.olt_limits[key] = limit
+        return limit
+
+
+_loop_states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = weakref.WeakKeyDictionary()
+
+# GETBULK max-repetitions learned per OLT, shared across clients
+_bulk_repetitions: Dict[Tuple[str, int, str, str], int] = {}
+
+
+def _loop_state() -> _LoopState:
+    loop = asyncio.get_running_loop()
+    state = _loop_states.get(loop)
+    if state is None:
+        state = _LoopState()
+        _loop_states[loop] = state
+    return state
+
+
+_request_ids = random.randrange(1, 1 << 30)
+
+
+def _next_request_id() -> int:
+    global _request_ids
+    _request_ids = _request_ids % 0x7FFFFFFF + 1
+    return _request_ids
+
+
+class AsyncSNMPClient:
+    """
+    asyncio SNMP Client for ZTE C320 OLT
+
+    Mirrors SNMPClient (get, get_many, walk, bulk_walk, get_onu_list, ...)
+    with coroutines, so one event loop can poll many OLTs concurrently.
+    Every PDU exchange holds a per-OLT slot (SNMP_ASYNC_PER_OLT_CONCURRENCY)
+    and a global slot (SNMP_ASYNC_MAX_CONCURRENCY).
+
+    pysnmp 4.4's asyncio hlapi relies on asyncio.coroutine, which no longer
+    exists on the Python versions we deploy, so requests are encoded with
+    pysnmp's v1/v2c protocol API and sent over a plain asyncio UDP endpoint.
+    Community-based auth only, like SNMPClient.
+    """
+
+    OID_SYSTEM_DESCR = SNMPClient.OID_SYSTEM_DESCR
+    OID_SYSTEM_UPTIME = SNMPClient.OID_SYSTEM_UPTIME
+    OID_SYSTEM_NAME = SNMPClient.OID_SYSTEM_NAME
+    OID_ONU_STATUS = SNMPClient.OID_ONU_STATUS
+    ONU_DETAIL_COLUMNS = SNMPClient.ONU_DETAIL_COLUMNS
+
+    def __init__(self, host: str, community: str = "public", port: int = 161, version: str = "2c",
+                 timeout: float = 1.0, retries: int = 5):
+        self.host = host
+        self.community = community
+        self.port = port
+        self.version = version
+        self.timeout = timeout
+        self.retries = retries
+        self._pMod = api.protoModules[api.protoVersion1 if version == "1" else api.protoVersion2c]
+        self._address: Optional[Tuple[int, tuple]] = None
+        # Request PDUs sent by this client, not counting retransmissions
+        self.pdus_sent = 0
+        # Same as SNMPClient.walk_complete
+        self.walk_complete = True
+
+    async def _resolve(self) -> Tuple[int, tuple]:
+        if self._address is None:
+            loop = asyncio.get_running_loop()
+            infos = await loop.getaddrinfo(self.host, self.port, type=socket.SOCK_DGRAM)
+            family, _, _, _, sockaddr = infos[0]
+            self._address = (family, sockaddr)
+        return self._address
+
+    async def _request(self, pdu):
+        """Send a request PDU, retrying on timeout. Returns the response PDU or None"""
+        pMod = self._pMod
+        family, address = await self._resolve()
+        state = _loop_state()
+        protocol = await state.endpoint(family)
+
+        request_id = _next_request_id()
+        pMod.apiPDU.setRequestID(pdu, request_id)
+        message = pMod.Message()
+        pMod.apiMessage.setDefaults(message)
+        pMod.apiMessage.setCommunity(message, self.community)
+        pMod.apiMessage.setPDU(message, pdu)
+        data = encoder.encode(message)
+
+        loop = asyncio.get_running_loop()
+        async with state.olt_limit((self.host, self.port)), state.global_limit:
+            try:
+                for _ in range(self.retries + 1):
+                    future = loop.create_future()
+                    protocol.pending[request_id] = future
+                    protocol.transport.sendto(data, address)
+                    try:
+                        return await asyncio.wait_for(future, self.timeout)
+                    except asyncio.TimeoutError:
+                        continue
+            finally:
+                protocol.pending.pop(request_id, None)
+        return None
+
+    async def _command(self, pdu):
+        """Returns (errorIndication, errorStatus, errorIndex, response PDU)"""
+        self.pdus_sent += 1
+        try:
+            response = await self._request(pdu)
+        except Exception as e:
+            return str(e), 0, 0, None
+        if response is None:
+            return REQUEST_TIMED_OUT, 0, 0, None
+        pMod = self._pMod
+        return None, int(pMod.apiPDU.getErrorStatus(response)), int(pMod.apiPDU.getErrorIndex(response)), response
+
+    def _request_pdu(self, pdu_class, oids):
+        pMod = self._pMod
+        pdu = pdu_class()
+        pMod.apiPDU.setDefaults(pdu)
+        pMod.apiPDU.setVarBinds(pdu, [(oid, pMod.Null("")) for oid in oids])
+        return pdu
+
+    async def get(self, oid: str) -> Optional[str]:
+        pMod = self._pMod
+        errorIndication, errorStatus, errorIndex, response = await self._command(
+            self._request_pdu(pMod.GetRequestPDU, [oid])
+        )
+        if errorIndication or errorStatus:
+            return None
+        for name, val in pMod.apiPDU.getVarBinds(response):
+            return str(val)
+        return None
+
+    async def get_many(self, oids: List[str], max_varbinds: Optional[int] = None) -> Dict[str, SNMPResult]:
+        """Same contract as SNMPClient.get_many; PDUs are sent concurrently"""
+        results: Dict[str, SNMPResult] = {}
+        if not oids:
+            return results
+        max_varbinds = max_varbinds or settings.SNMP_MAX_VARBINDS_PER_PDU
+        await asyncio.gather(*[
+            self._get_chunk(chunk, results) for chunk in SNMPClient._pack_varbinds(oids, max_varbinds)
+        ])
+        return results
+
+    async def _get_chunk(self, chunk: List[str], results: Dict[str, SNMPResult]):
+        pMod = self._pMod
+        pending = list(chunk)
+        while pending:
+            errorIndication, errorStatus, errorIndex, response = await self._command(
+                self._request_pdu(pMod.GetRequestPDU, pending)
+            )
+            if errorIndication:
+                for oid in pending:
+                    results[oid] = SNMPResult(None, errorIndication)
+                return
+            if errorStatus:
+                status = pMod.apiPDU.getErrorStatus(response).prettyPrint()
+                if errorStatus == 1 and len(pending) > 1:
+                    half = len(pending) // 2
+                    await self._get_chunk(pending[:half], results)
+                    await self._get_chunk(pending[half:], results)
+                    return
+                index = errorIndex - 1
+                if len(pending) > 1 and 0 <= index < len(pending):
+                    results[pending.pop(index)] = SNMPResult(None, status)
+                    continue
+                for oid in pending:
+                    results[oid] = SNMPResult(None, status)
+                return
+            for oid, (name, val) in zip(pending, pMod.apiPDU.getVarBinds(response)):
+                exception = EXCEPTION_VALUES.get(val.__class__)
+                if exception:
+                    results[oid] = SNMPResult(None, exception)
+                else:
+                    results[oid] = SNMPResult(str(val), None)
+            return
+
+    async def walk(self, oid: str) -> List[Tuple[str, str]]:
+        walked, self.walk_complete = await self._walk_raw(oid)
+        return [(str(name), str(val)) for name, val in walked]
+
+    async def _walk_raw(self, oid: str) -> Tuple[List[Tuple], bool]:
+        pMod = self._pMod
+        results: List[Tuple] = []
+        prefix = tuple(int(x) for x in oid.strip(".").split("."))
+        start = oid
+        while True:
+            errorIndication, errorStatus, errorIndex, response = await self._command(
+                self._request_pdu(pMod.GetNextRequestPDU, [start])
+            )
+            if errorIndication or errorStatus:
+                # noSuchName is how SNMPv1 agents report the end of their MIB
+                return results, not errorIndication and self.version == "1" and errorStatus == 2
+            name, val = pMod.apiPDU.getVarBinds(response)[0]
+            if val.__class__ in EXCEPTION_VALUES or tuple(name[:len(prefix)]) != prefix:
+                return results, True
+            results.append((name, val))
+            start = name
+
+    async def bulk_walk(self, oid: str, max_repetitions: Optional[int] = None,
+                        auto_tune: Optional[bool] = None) -> List[Tuple[str, str]]:
+        """Same contract as SNMPClient.bulk_walk"""
+        if self.version == "1":
+            return await self.walk(oid)
+        walked, self.walk_complete = await self._bulk_walk_columns([oid], max_repetitions, auto_tune)
+        return [(str(name), str(val)) for name, val in walked[oid]]
+
+    async def _bulk_walk_columns(self, columns: List[str], max_repetitions: Optional[int] = None,
+                                 auto_tune: Optional[bool] = None) -> Tuple[Dict[str, List[Tuple]], bool]:
+        if auto_tune is None:
+            auto_tune = settings.SNMP_BULK_AUTO_TUNE
+        pMod = self._pMod
+        key = (self.host, self.port, self.community, self.version)
+
+        results: Dict[str, List[Tuple]] = {column: [] for column in columns}
+        prefixes = {column: tuple(int(x) for x in column.strip(".").split(".")) for column in columns}
+        cursors = {column: column for column in columns}
+        received = False
+        repetitions = max_repetitions or _bulk_repetitions.get(key) or settings.SNMP_BULK_MAX_REPETITIONS
+        tuned = not auto_tune
+        while cursors:
+            active = list(cursors)
+            pdu = self._request_pdu(pMod.GetBulkRequestPDU, [cursors[column] for column in active])
+            pMod.apiBulkPDU.setNonRepeaters(pdu, 0)
+            pMod.apiBulkPDU.setMaxRepetitions(pdu, repetitions)
+            errorIndication, errorStatus, errorIndex, response = await self._command(pdu)
+            if errorIndication or errorStatus:
+                too_big = not errorIndication and errorStatus == 1
+                timed_out = received and errorIndication == REQUEST_TIMED_OUT
+                if (too_big or timed_out) and repetitions > 1:
+                    repetitions //= 2
+                    if auto_tune:
+                        _bulk_repetitions[key] = repetitions
+                    continue
+                break
+            varBindTable = pMod.apiBulkPDU.getVarBindTable(pdu, response)
+            if not varBindTable:
+                break
+            received = True
+            if not tuned:
+                repetitions = SNMPClient._tune_repetitions(varBindTable)
+                _bulk_repetitions[key] = repetitions
+                tuned = True
+
+            for varBinds in varBindTable:
+                for column, (name, val) in zip(active, varBinds):
+                    if column not in cursors:
+                        continue
+                    prefix = prefixes[column]
+                    if val.__class__ in EXCEPTION_VALUES or tuple(name[:len(prefix)]) != prefix:
+                        del cursors[column]
+                        continue
+                    results[column].append((name, val))
+                    cursors[column] = name
+        return results, not cursors
+
+    async def test_connection(self) -> bool:
+        return await self.get(self.OID_SYSTEM_DESCR) is not None
+
+    async def get_system_info(self) -> Dict:
+        values = await self.get_many([self.OID_SYSTEM_DESCR, self.OID_SYSTEM_UPTIME, self.OID_SYSTEM_NAME])
+        return {
+            "description": values[self.OID_SYSTEM_DESCR].value,
+            "uptime": values[self.OID_SYSTEM_UPTIME].value,
+            "name": values[self.OID_SYSTEM_NAME].value
+        }
+
+    async def get_onu_list(self, slot: int = None, port: int = None) -> List[ONUIndex]:
+        """Same contract as SNMPClient.get_onu_list"""
+        column = self.OID_ONU_STATUS if slot is None else f"{self.OID_ONU_STATUS}.{slot}"
+        if self.version in ("2c", "3"):
+            walked, self.walk_complete = await self._bulk_walk_columns([column])
+            walked = walked[column]
+        else:
+            walked, self.walk_complete = await self._walk_raw(column)
+        return SNMPClient.build_onu_list(walked, slot, port)
+
+    async def get_onu_table(self, slot: int = None, port: int = None) -> List[ONUTableRow]:
+        """Same contract as SNMPClient.get_onu_table"""
+        columns = list(self.ONU_DETAIL_COLUMNS.values())
+        if self.version in ("2c", "3"):
+            walked, self.walk_complete = await self._bulk_walk_columns(columns)
+        else:
+            walks = await asyncio.gather(*[self._walk_raw(column) for column in columns])
+            walked = {column: rows for column, (rows, _) in zip(columns, walks)}
+            self.walk_complete = all(complete for _, complete in walks)
+        return SNMPClient.join_onu_table(walked, slot, port)
+
+
+class SNMPEventLoop:
+    """
+    Background event loop that runs AsyncSNMPClient coroutines for
+    synchronous callers (request threads, scripts), so every caller shares
+    the same sockets and concurrency limits.
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="snmp-event-loop", daemon=True)
+                thread.start()
+                self._loop = loop
+            return self._loop
+
+    def run(self, coro, timeout: Optional[float] = None):
+        """Run a coroutine on the SNMP loop and wait for its result"""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop()).result(timeout)
+
+    def stop(self):
+        with self._lock:
+            if self._loop is not None and not self._loop.is_closed():
+                self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop = None
+
+
+snmp_event_loop = SNMPEventLoop()
+
+
+class BlockingSNMPClient:
+    """SNMPClient-compatible facade that runs an AsyncSNMPClient on snmp_event_loop"""
+
+    def __init__(self, client: AsyncSNMPClient):
+        self._client = client
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if asyncio.iscoroutinefunction(attr):
+            def call(*args, **kwargs):
+                return snmp_event_loop.run(attr(*args, **kwargs))
+            return call
+        return attr
@@ -0,0 +1,105 @@
+from sqlalchemy import bindparam, case, func, update
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional, Tuple
+import logging
+
+from app.models.olt import OLT, Slot, Port
+from app.models.onu import ONU
+
+logger = logging.getLogger(__name__)
+
+COUNTERS = ("total_onus", "online_onus", "offline_onus")
+
+
+def _counts(status: Optional[str]) -> Tuple[int, int, int]:
+    """(total, online, offline) contribution of one ONU with this status"""
+    return 1, int(status == "online"), int(status == "offline")
+
+
+class CounterDeltas:
+    """
+    Net changes to the Port and OLT ONU counters (total/online/offline)
+    collected while ONU rows are written, applied in the same transaction
+    with one UPDATE executemany per table.
+    """
+
+    def __init__(self):
+        self.ports: Dict[int, List[int]] = {}
+        self.olts: Dict[int, List[int]] = {}
+
+    def add(self, olt_id: int, port_id: Optional[int], status: Optional[str], sign: int = 1):
+        for target, key in ((self.olts, olt_id), (self.ports, port_id)):
+            if key is None:
+                continue
+            delta = target.setdefault(key, [0, 0, 0])
+            for i, count in enumerate(_counts(status)):
+                delta[i] += sign * count
+
+    def remove(self, olt_id: int, port_id: Optional[int], status: Optional[str]):
+        self.add(olt_id, port_id, status, sign=-1)
+
+    def move(self, old, new):
+        """ONU changed from old to new (olt_id, port_id, status)"""
+        if tuple(old) != tuple(new):
+            self.remove(*old)
+            self.add(*new)
+
+    def apply(self, db: Session):
+        for model, deltas in ((Port, self.ports), (OLT, self.olts)):
+            params = [
+                {"counter_id": key, **{f"d_{name}": value for name, value in zip(COUNTERS, delta)}}
+                for key, delta in deltas.items() if any(delta)
+            ]
+            if not params:
+                continue
+            table = model.__table__
+            db.execute(
+                update(table)
+                .where(table.c.id == bindparam("counter_id"))
+                .values({
+                    name: func.coalesce(table.c[name], 0) + bindparam(f"d_{name}")
+                    for name in COUNTERS
+                }),
+                params,
+            )
+        self.ports.clear()
+        self.olts.clear()
+
+
+def reconcile_counters(db: Session, olt_ids: Optional[List[int]] = None) -> Dict[str, int]:
+    """
+    Recount ONUs per port and per OLT and correct counters that drifted
+    (concurrent syncs, rows changed outside discovery). Returns how many
+    ports and OLTs were corrected.
+    """
+    online = func.sum(case((ONU.status == "online", 1), else_=0))
+    offline = func.sum(case((ONU.status == "offline", 1), else_=0))
+
+    port_query = db.query(Port.id, *(getattr(Port, name) for name in COUNTERS)).join(Slot, Slot.id == Port.slot_id)
+    olt_query = db.query(OLT.id, *(getattr(OLT, name) for name in COUNTERS))
+    port_counts = db.query(ONU.port_id, func.count(ONU.id), online, offline).group_by(ONU.port_id)
+    olt_counts = db.query(ONU.olt_id, func.count(ONU.id), online, offline).group_by(ONU.olt_id)
+    if olt_ids is not None:
+        port_query = port_query.filter(Slot.olt_id.in_(olt_ids))
+        olt_query = olt_query.filter(OLT.id.in_(olt_ids))
+        port_counts = port_counts.filter(ONU.olt_id.in_(olt_ids))
+        olt_counts = olt_counts.filter(ONU.olt_id.in_(olt_ids))
+
+    fixed = {}
+    for name, model, current, actual in (
+        ("ports", Port, port_query, port_counts),
+        ("olts", OLT, olt_query, olt_counts),
+    ):
+        actual = {key: tuple(int(value or 0) for value in values) for key, *values in actual.all()}
+        updates = []
+        for key, *values in current.all():
+            counts = actual.get(key, (0, 0, 0))
+            if tuple(values) != counts:
+                updates.append({"id": key, **dict(zip(COUNTERS, counts))})
+        if updates:
+            db.execute(update(model), updates)
+        fixed[name] = len(updates)
+    db.commit()
+    if fixed["ports"] or fixed["olts"]:
+        logger.info(f"Reconciled ONU counters of {fixed['ports']} ports and {fixed['olts']} OLTs")
+    return fixed
@@ -0,0 +1,382 @@
+from sqlalchemy import func, insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional
+import logging
+import time
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.olt import OLT, Slot, Port
+from app.models.onu import ONU
+from app.services.alerts import evaluate_olt, evaluate_onus
+from app.services.counters import CounterDeltas
+from app.services.events import onu_event, queue_events
+from app.services.jobs import Job, olt_locks
+from app.services.metrics import metrics_writer
+from app.services.snmp_client import ONUIndex, ONUTableRow, create_snmp_client
+from app.services import versions  # noqa: F401  (table versions; also in poller.py processes)
+
+logger = logging.getLogger(__name__)
+
+# Serial numbers per "sn IN (...)" lookup
+SN_LOOKUP_CHUNK = 1000
+
+# ONU columns written by discovery; everything else (customer data, ODP) is left alone
+DISCOVERED_COLUMNS = ("olt_id", "port_id", "onu_id", "status", "rx_power", "tx_power", "distance")
+
+# Status given to stored ONUs that no longer appear in the OLT's walk
+ONU_STATUS_MISSING = "missing"
+
+
+class OLTUnreachableError(Exception):
+    """The OLT did not answer SNMP"""
+
+
+def olt_job(func: Callable[[Session, OLT, Job], Dict[str, Any]], olt_id: int) -> Callable[[Job], Dict[str, Any]]:
+    """Job body that runs func(db, olt, job) with its own database session"""
+    def run(job: Job) -> Dict[str, Any]:
+        db = SessionLocal()
+        try:
+            olt = db.query(OLT).filter(OLT.id == olt_id).first()
+            if not olt:
+                raise ValueError("OLT not found")
+            return func(db, olt, job)
+        finally:
+            db.close()
+    return run
+
+
+def discover_olt(db: Session, olt: OLT, job: Optional[Job] = None) -> Dict[str, int]:
+    """Walk the OLT's ONU table (status, SN, optics, distance) and store it"""
+    job = job or Job("discover", olt.id)
+    client = create_snmp_client(olt)
+    job.track(client)
+
+    job.phase = "walking"
+    discovered = client.get_onu_table()
+    job.phase = "writing"
+    result = sync_onus(db, olt, discovered, complete=client.walk_complete)
+    job.rows_processed = len(discovered)
+    return result
+
+
+def sync_olt(db: Session, olt: OLT, job: Optional[Job] = None) -> Dict[str, Any]:
+    """Check reachability, refresh system info and count the OLT's ONUs"""
+    job = job or Job("sync", olt.id)
+    client = create_snmp_client(olt)
+    job.track(client)
+
+    job.phase = "connecting"
+    if not client.test_connection():
+        raise OLTUnreachableError("Cannot connect to OLT")
+    sys_info = client.get_system_info()
+    olt.status = "online"
+    olt.last_seen = datetime.now()
+
+    job.phase = "walking"
+    onus = client.get_onu_list()
+    job.rows_processed = len(onus)
+    evaluate_olt(db, olt)
+    db.commit()
+
+    return {
+        "message": "OLT data synced successfully",
+        "system_info": sys_info,
+        "onus_discovered": len(onus)
+    }
+
+
+def sync_olts(olt_ids: List[int], max_workers: int) -> Iterator[Dict[str, Any]]:
+    """
+    Run sync_olt for many OLTs on a bounded thread pool, yielding each OLT's
+    outcome as soon as it finishes so an unreachable OLT (which waits out
+    its SNMP timeouts) does not hold back the others.
+    """
+    if not olt_ids:
+        return
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(olt_ids)), thread_name_prefix="olt-sync")
+    try:
+        futures = [executor.submit(_sync_one, olt_id) for olt_id in olt_ids]
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        # Stop queued OLTs if the caller stops reading (client disconnected)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _sync_one(olt_id: int) -> Dict[str, Any]:
+    job = Job("sync", olt_id)
+    start = time.perf_counter()
+    outcome: Dict[str, Any] = {"olt_id": olt_id}
+    try:
+        with olt_locks.hold(olt_id):
+            outcome["result"] = olt_job(sync_olt, olt_id)(job)
+        outcome["status"] = "ok"
+    except Exception as e:
+        logger.warning(f"Sync of OLT {olt_id} failed: {e}")
+        outcome["status"] = "failed"
+        outcome["error"] = str(e)
+    outcome["elapsed"] = round(time.perf_counter() - start, 3)
+    outcome["pdus_sent"] = job.pdus_sent
+    return outcome
+
+
+def sync_onus(db: Session, olt: OLT, discovered: List[ONUTableRow], complete: bool = True) -> Dict[str, int]:
+    """
+    Write the changes in one OLT's discovered ONU table to the database.
+
+    Slots, ports and the stored state of known ONUs are loaded once per OLT.
+    Each polled ONU is compared with its stored row: a fingerprint of the
+    exact fields (OLT, port, ONU id, status, distance) plus a deadband of
+    DISCOVERY_POWER_DEADBAND dB on rx/tx power. Only new and changed ONUs
+    are written, with a single INSERT ... ON CONFLICT (sn) DO UPDATE
+    executemany, so unchanged rows keep their updated_at. ONUs of this OLT
+    missing from the walk are marked with status "missing", unless the walk
+    stopped early (complete=False) and the rest of the table is unknown.
+    The Port and OLT ONU counters are adjusted and the alert rules of the
+    written ONUs evaluated by the same transaction, and status transitions
+    are published as events once it commits.
+
+    ONUs are keyed by serial number (UNKNOWN-slot-port-onu_id when the OLT
+    reports none); an existing ONU seen on this OLT is moved to its new port.
+    """
+    counts = {"found": len(discovered), "new": 0, "changed": 0, "unchanged": 0, "vanished": 0}
+    # An empty walk means the OLT did not answer, not that every ONU left
+    if not discovered:
+        return counts
+
+    port_ids = _ensure_ports(db, olt, {(item.slot, item.port) for item in discovered})
+
+    rows: Dict[str, Dict] = {}
+    for item in discovered:
+        sn = item.sn or f"UNKNOWN-{item.slot}-{item.port}-{item.onu_id}"
+        # An SN reported twice keeps its last row, as one statement cannot update a row twice
+        rows[sn] = {
+            "sn": sn,
+            "olt_id": olt.id,
+            "port_id": port_ids[(item.slot, item.port)],
+            "onu_id": item.onu_id,
+            "status": item.status,
+            "rx_power": item.rx_power,
+            "tx_power": item.tx_power,
+            "distance": _to_int(item.distance),
+        }
+
+    stored = _stored_onus(db, olt, rows)
+    deltas = CounterDeltas()
+    writes = []
+    events = []
+    for sn, row in rows.items():
+        current = stored.get(sn)
+        if current is None:
+            counts["new"] += 1
+            writes.append(row)
+            deltas.add(row["olt_id"], row["port_id"], row["status"])
+            events.append(onu_event(sn, row["olt_id"], row["port_id"], row["status"], None))
+        elif _changed(current, row):
+            counts["changed"] += 1
+            writes.append(row)
+            deltas.move(
+                (current.olt_id, current.port_id, current.status),
+                (row["olt_id"], row["port_id"], row["status"]),
+            )
+            if current.status != row["status"]:
+                events.append(onu_event(sn, row["olt_id"], row["port_id"], row["status"], current.status, current.id))
+        else:
+            counts["unchanged"] += 1
+    if writes:
+        _upsert_onus(db, writes, {sn: current.id for sn, current in stored.items()})
+
+    vanished = [
+        current for sn, current in stored.items()
+        if sn not in rows and current.olt_id == olt.id and current.status != ONU_STATUS_MISSING
+    ]
+    if not complete:
+        # The ONUs after the point the walk stopped were never asked about
+        logger.warning(f"Incomplete ONU walk of OLT {olt.id}: not marking ONUs missing")
+        vanished = []
+    if vanished:
+        now = datetime.now()
+        db.execute(update(ONU), [
+            {"id": current.id, "status": ONU_STATUS_MISSING, "last_offline": now, "updated_at": now}
+            for current in vanished
+        ])
+        for current in vanished:
+            deltas.move(
+                (current.olt_id, current.port_id, current.status),
+                (current.olt_id, current.port_id, ONU_STATUS_MISSING),
+            )
+            events.append(onu_event(
+                current.sn, current.olt_id, current.port_id, ONU_STATUS_MISSING, current.status, current.id
+            ))
+    counts["vanished"] = len(vanished)
+
+    deltas.apply(db)
+    queue_events(db, events)
+    evaluate_onus(db, olt, [row["sn"] for row in writes] + [current.sn for current in vanished])
+    db.commit()
+    if settings.METRICS_ENABLED:
+        _record_metrics(db, rows, stored)
+    return counts
+
+
+def _record_metrics(db: Session, rows: Dict[str, Dict], stored: Dict[str, Any]):
+    """Queue every polled ONU's optics/distance as a metrics sample"""
+    ids = {sn: current.id for sn, current in stored.items()}
+    new = [sn for sn in rows if sn not in ids]
+    for start in range(0, len(new), SN_LOOKUP_CHUNK):
+        chunk = new[start:start + SN_LOOKUP_CHUNK]
+        ids.update(db.query(ONU.sn, ONU.id).filter(ONU.sn.in_(chunk)).all())
+    ts = datetime.now(timezone.utc)
+    metrics_writer.record([
+        {
+            "onu_id": ids[sn],
+            "ts": ts,
+            "rx_power": row["rx_power"],
+            "tx_power": row["tx_power"],
+            "distance": row["distance"],
+        }
+        for sn, row in rows.items() if sn in ids
+    ])
+
+
+def sync_onu_status(db: Session, olt: OLT, onus: List[ONUIndex]) -> Dict[str, int]:
+    """
+    Update the status of already known ONUs from a get_onu_list walk.
+
+    ONUs are matched on (port, ONU id) since the status walk carries no
+    serial number; unknown ONUs are left for the next full discovery.
+    """
+    counts = {"found": len(onus), "changed": 0, "unchanged": 0, "unknown": 0}
+    port_ids = _load_port_ids(db, olt)
+    stored = {
+        (row.port_id, row.onu_id): row
+        for row in db.query(ONU.id, ONU.sn, ONU.port_id, ONU.onu_id, ONU.status).filter(ONU.olt_id == olt.id).all()
+    }
+    now = datetime.now()
+    updates = []
+    events = []
+    changed = []
+    deltas = CounterDeltas()
+    for onu in onus:
+        current = stored.get((port_ids.get((onu.slot, onu.port)), onu.onu_id))
+        if current is None:
+            counts["unknown"] += 1
+        elif current.status != onu.status:
+            counts["changed"] += 1
+            updates.append({"id": current.id, "status": onu.status, "updated_at": now})
+            deltas.move((olt.id, current.port_id, current.status), (olt.id, current.port_id, onu.status))
+            events.append(onu_event(current.sn, olt.id, current.port_id, onu.status, current.status, current.id))
+            changed.append(current.sn)
+        else:
+            counts["unchanged"] += 1
+    if updates:
+        db.execute(update(ONU), updates)
+        deltas.apply(db)
+        queue_events(db, events)
+        evaluate_onus(db, olt, changed)
+    db.commit()
+    return counts
+
+
+def _fingerprint(row) -> tuple:
+    """Discovered fields that must match exactly for a row to be unchanged"""
+    return (row["olt_id"], row["port_id"], row["onu_id"], row["status"], row["distance"])
+
+
+def _changed(current, row: Dict) -> bool:
+    if _fingerprint(current._mapping) != _fingerprint(row):
+        return True
+    deadband = settings.DISCOVERY_POWER_DEADBAND
+    for field in ("rx_power", "tx_power"):
+        old, new = current._mapping[field], row[field]
+        if (old is None) != (new is None):
+            return True
+        if old is not None and abs(new - old) >= deadband:
+            return True
+    return False
+
+
+def _to_int(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _ensure_ports(db: Session, olt: OLT, wanted) -> Dict[tuple, int]:
+    """Map (slot_number, port_number) -> Port.id, creating missing slots and ports"""
+    slot_ids = dict(
+        db.query(Slot.slot_number, Slot.id).filter(Slot.olt_id == olt.id).all()
+    )
+    missing_slots = sorted({slot_no for slot_no, _ in wanted} - slot_ids.keys())
+    if missing_slots:
+        db.execute(insert(Slot), [{"olt_id": olt.id, "slot_number": slot_no} for slot_no in missing_slots])
+        slot_ids = dict(
+            db.query(Slot.slot_number, Slot.id).filter(Slot.olt_id == olt.id).all()
+        )
+
+    port_ids = _load_port_ids(db, olt)
+    missing_ports = sorted(wanted - port_ids.keys())
+    if missing_ports:
+        db.execute(
+            insert(Port),
+            [{"slot_id": slot_ids[slot_no], "port_number": port_no} for slot_no, port_no in missing_ports]
+        )
+        port_ids = _load_port_ids(db, olt)
+    return port_ids
+
+
+def _load_port_ids(db: Session, olt: OLT) -> Dict[tuple, int]:
+    """Map (slot_number, port_number) -> Port.id for the OLT's stored ports"""
+    return {
+        (slot_no, port_no): port_id
+        for slot_no, port_no, port_id in (
+            db.query(Slot.slot_number, Port.port_number, Port.id)
+            .join(Port, Port.slot_id == Slot.id)
+            .filter(Slot.olt_id == olt.id)
+            .all()
+        )
+    }
+
+
+def _stored_onus(db: Session, olt: OLT, rows: Dict[str, Dict]) -> Dict[str, Any]:
+    """
+    Map serial number -> stored discovery columns for every ONU of this OLT
+    and for discovered ONUs currently stored under another OLT
+    """
+    columns = (ONU.sn, ONU.id) + tuple(getattr(ONU, column) for column in DISCOVERED_COLUMNS)
+    stored = {row.sn: row for row in db.query(*columns).filter(ONU.olt_id == olt.id).all()}
+    # ONUs moved here from another OLT
+    unknown = [sn for sn in rows if sn not in stored]
+    for start in range(0, len(unknown), SN_LOOKUP_CHUNK):
+        chunk = unknown[start:start + SN_LOOKUP_CHUNK]
+        stored.update((row.sn, row) for row in db.query(*columns).filter(ONU.sn.in_(chunk)).all())
+    return stored
+
+
+def _upsert_onus(db: Session, rows: List[Dict], existing: Dict[str, int]):
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = dialect_insert(ONU)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ONU.sn],
+            set_={
+                **{column: stmt.excluded[column] for column in DISCOVERED_COLUMNS},
+                "updated_at": func.now(),
+            },
+        )
+        db.execute(stmt, rows)
+        return
+
+    # No upsert support: bulk UPDATE by primary key, then bulk INSERT
+    updates = [{"id": existing[row["sn"]], **row} for row in rows if row["sn"] in existing]
+    inserts = [row for row in rows if row["sn"] not in existing]
+    if updates:
+        db.execute(update(ONU), updates)
+    if inserts:
+        db.execute(insert(ONU), inserts)
@@ -0,0 +1,265 @@
+from sqlalchemy import event, inspect, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set
+import asyncio
+import asyncpg
+import json
+import logging
+import threading
+
+from app.core.config import settings
+from app.db.database import async_database_url
+from app.models.olt import OLT
+
+logger = logging.getLogger(__name__)
+
+# PostgreSQL NOTIFY channel carrying committed events to every API process
+CHANNEL = "olt_events"
+# NOTIFY payloads must stay under 8000 bytes
+NOTIFY_PAYLOAD_LIMIT = 7500
+
+EVENT_TYPES = ("onu", "olt", "alert")
+
+
+def onu_event(sn: str, olt_id: int, port_id: Optional[int], status: Optional[str],
+              previous: Optional[str], onu_id: Optional[int] = None) -> Dict[str, Any]:
+    event = {"type": "onu", "sn": sn, "olt_id": olt_id, "port_id": port_id, "status": status, "previous": previous}
+    if onu_id is not None:
+        event["id"] = onu_id
+    return event
+
+
+def queue_events(db: Session, events: Iterable[Dict[str, Any]]):
+    """Publish events once the session's transaction commits (dropped on rollback)"""
+    ts = datetime.now(timezone.utc).isoformat()
+    db.info.setdefault("events", []).extend({**item, "ts": ts} for item in events)
+
+
+def _is_postgres(session) -> bool:
+    return session.get_bind().dialect.name == "postgresql"
+
+
+def _chunks(events: List[Dict[str, Any]]) -> Iterable[str]:
+    """JSON arrays of events, each small enough for one NOTIFY"""
+    chunk: List[str] = []
+    size = 2
+    for item in events:
+        encoded = json.dumps(item, separators=(",", ":"), default=str)
+        if chunk and size + len(encoded) + 1 > NOTIFY_PAYLOAD_LIMIT:
+            yield "[" + ",".join(chunk) + "]"
+            chunk, size = [], 2
+        chunk.append(encoded)
+        size += len(encoded) + 1
+    if chunk:
+        yield "[" + ",".join(chunk) + "]"
+
+
+@event.listens_for(Session, "after_flush")
+def _queue_olt_status_changes(session, flush_context):
+    changed = []
+    for instance in session.dirty:
+        if isinstance(instance, OLT):
+            history = inspect(instance).attrs.status.history
+            if history.added and history.deleted and history.added[0] != history.deleted[0]:
+                changed.append({
+                    "type": "olt", "olt_id": instance.id,
+                    "status": history.added[0], "previous": history.deleted[0],
+                })
+    if changed:
+        queue_events(session, changed)
+
+
+@event.listens_for(Session, "before_commit")
+def _notify_events(session):
+    # On PostgreSQL events go out with NOTIFY, which is delivered on commit
+    # to every API process (including this one); the poller can run apart
+    session.flush()
+    events = session.info.get("events")
+    if events and _is_postgres(session):
+        for payload in _chunks(events):
+            session.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": CHANNEL, "payload": payload})
+        session.info["events_notified"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_events(session):
+    events = session.info.pop("events", None)
+    if events and not session.info.pop("events_notified", False):
+        event_broker.publish(events)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_events(session):
+    session.info.pop("events", None)
+    session.info.pop("events_notified", None)
+
+
+def _coalescing_key(item: Dict[str, Any]) -> tuple:
+    if item["type"] == "onu":
+        return "onu", item["sn"]
+    if item["type"] == "olt":
+        return "olt", item["olt_id"]
+    return item["type"], item.get("id")
+
+
+class Subscription:
+    """
+    One client's filtered view of the event stream. Pending events are
+    coalesced per ONU/OLT (the latest status wins, keeping the first
+    `previous`; a change that returns to where it started disappears),
+    and at most `buffer_size` of them are held: a client that falls that
+    far behind is dropped.
+    """
+
+    def __init__(self, olt_ids: Set[int], port_ids: Set[int], types: Set[str], buffer_size: int):
+        self.olt_ids = olt_ids
+        self.port_ids = port_ids
+        self.types = types
+        self.buffer_size = buffer_size
+        self.dropped = False
+        self._pending: Dict[tuple, Dict[str, Any]] = {}
+        self._ready = asyncio.Event()
+
+    def matches(self, item: Dict[str, Any]) -> bool:
+        if self.types and item.get("type") not in self.types:
+            return False
+        if self.olt_ids and item.get("olt_id") not in self.olt_ids:
+            return False
+        # OLT-wide events (no port) pass the port filter
+        if self.port_ids and item.get("port_id") is not None and item["port_id"] not in self.port_ids:
+            return False
+        return True
+
+    def put(self, item: Dict[str, Any]):
+        if self.dropped:
+            return
+        key = _coalescing_key(item)
+        pending = self._pending.get(key)
+        if pending is not None:
+            item = {**item, "previous": pending.get("previous")}
+            if "status" in item and item["status"] == item["previous"]:
+                del self._pending[key]
+                return
+        elif len(self._pending) >= self.buffer_size:
+            self.dropped = True
+            self._pending.clear()
+            self._ready.set()
+            return
+        self._pending[key] = item
+        self._ready.set()
+
+    async def next_batch(self, timeout: float, coalesce: float) -> Optional[List[Dict[str, Any]]]:
+        """
+        Wait up to `timeout` for events, then gather more for `coalesce`
+        seconds. Returns them in arrival order, or None on timeout.
+        """
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if not self.dropped:
+            await asyncio.sleep(coalesce)
+        batch = list(self._pending.values())
+        self._pending.clear()
+        self._ready.clear()
+        return batch
+
+
+class EventBroker:
+    """
+    Fans committed ONU/OLT events out to the /events subscribers of this
+    process. publish() may be called from any thread; delivery happens on
+    the event loop that start() ran on. Without a running loop (poller.py)
+    events are discarded, except on PostgreSQL where they travel by NOTIFY.
+    """
+
+    def __init__(self, buffer_size: int):
+        self.buffer_size = buffer_size
+        self.published = 0
+        self.dropped_clients = 0
+        self._subscriptions: Set[Subscription] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._listener: Optional[asyncio.Task] = None
+        self._lock = threading.Lock()
+
+    def subscribe(self, olt_ids: Iterable[int] = (), port_ids: Iterable[int] = (),
+                  types: Iterable[str] = ()) -> Subscription:
+        subscription = Subscription(set(olt_ids), set(port_ids), set(types), self.buffer_size)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self._subscriptions.discard(subscription)
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscriptions)
+
+    def publish(self, events: List[Dict[str, Any]]):
+        with self._lock:
+            loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(self._dispatch, events)
+        except RuntimeError:
+            pass  # loop shutting down
+
+    def _dispatch(self, events: List[Dict[str, Any]]):
+        self.published += len(events)
+        for subscription in list(self._subscriptions):
+            for item in events:
+                if subscription.matches(item):
+                    subscription.put(item)
+            if subscription.dropped:
+                self.dropped_clients += 1
+                self._subscriptions.discard(subscription)
+
+    async def start(self):
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+        url = make_url(async_database_url())
+        if url.get_backend_name() == "postgresql" and self._listener is None:
+            dsn = url.set(drivername="postgresql").render_as_string(hide_password=False)
+            self._listener = asyncio.create_task(self._listen(dsn))
+
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        with self._lock:
+            self._loop = None
+
+    def _on_notify(self, connection, pid, channel, payload):
+        try:
+            self._dispatch(json.loads(payload))
+        except ValueError:
+            logger.warning("Ignoring malformed event notification")
+
+    async def _listen(self, dsn: str):
+        """LISTEN on CHANNEL, reconnecting after connection loss"""
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(dsn)
+                lost = asyncio.Event()
+                connection.add_termination_listener(lambda _: lost.set())
+                await connection.add_listener(CHANNEL, self._on_notify)
+                await lost.wait()
+                logger.warning("Event listener connection lost, reconnecting")
+            except asyncio.CancelledError:
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+                raise
+            except Exception as e:
+                logger.warning(f"Event listener failed: {e}")
+            await asyncio.sleep(5)
+
+
+event_broker = EventBroker(settings.EVENTS_BUFFER_SIZE)
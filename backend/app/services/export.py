@@ -0,0 +1,105 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Dict, List, Sequence, Tuple
+import csv
+import io
+import json
+import zlib
+
+from app.core.config import settings
+from app.models.cable_route import CableRoute
+from app.models.odp import ODP
+from app.models.olt import OLT
+from app.models.onu import ONU
+from app.schemas.cable_route import CableRoute as CableRouteSchema
+from app.schemas.odp import ODP as ODPSchema
+from app.schemas.olt import OLT as OLTSchema
+from app.schemas.onu import ONU as ONUSchema
+
+# Never leave the database in an export
+SECRET_COLUMNS = {"snmp_community", "telnet_password"}
+
+
+def _columns(schema) -> List[str]:
+    """The columns of the entity's API schema, id first"""
+    names = [name for name in schema.model_fields if name not in SECRET_COLUMNS]
+    names.remove("id")
+    return ["id"] + names
+
+
+# Export name -> (model, exported columns)
+EXPORTS: Dict[str, Tuple[Any, List[str]]] = {
+    "onus": (ONU, _columns(ONUSchema)),
+    "olts": (OLT, _columns(OLTSchema)),
+    "odps": (ODP, _columns(ODPSchema)),
+    "cable-routes": (CableRoute, _columns(CableRouteSchema)),
+}
+
+FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+async def export_rows(engine: AsyncEngine, entity: str) -> AsyncIterator[Sequence[tuple]]:
+    """
+    Yield the entity's rows in batches of EXPORT_BATCH_SIZE, ordered by id,
+    as plain column tuples from a server-side cursor (no ORM objects), so
+    memory stays flat however large the table is.
+    """
+    model, columns = EXPORTS[entity]
+    stmt = (
+        select(*(getattr(model, name) for name in columns))
+        .order_by(model.id)
+        .execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+    )
+    async with engine.connect() as conn:
+        result = await conn.stream(stmt)
+        async for rows in result.partitions():
+            yield rows
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return value
+
+
+async def encode_ndjson(columns: List[str], batches: AsyncIterator[Sequence[tuple]]) -> AsyncIterator[bytes]:
+    """One JSON object per row and line"""
+    async for rows in batches:
+        yield "".join(
+            json.dumps(dict(zip(columns, row)), default=_json_default) + "\n" for row in rows
+        ).encode()
+
+
+async def encode_csv(columns: List[str], batches: AsyncIterator[Sequence[tuple]]) -> AsyncIterator[bytes]:
+    """A header line, then one CSV record per row"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    async for rows in batches:
+        writer.writerows([_csv_value(value) for value in row] for row in rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+async def gzip_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Compress a byte stream into one gzip member as it goes"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
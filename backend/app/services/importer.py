@@ -0,0 +1,239 @@
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from typing import Any, Dict, Iterable, List, Optional, Set, TextIO, Tuple
+import csv
+import json
+import logging
+
+from app.core.config import settings
+from app.models.cable_route import CableRoute
+from app.models.odp import ODP
+from app.models.olt import OLT, Slot, Port
+from app.models.onu import ONU
+from app.schemas.cable_route import CableRouteCreate
+from app.schemas.odp import ODPCreate
+from app.schemas.onu import ONUCreate
+from app.services.counters import CounterDeltas
+
+logger = logging.getLogger(__name__)
+
+
+class CSVImport:
+    """
+    Validation and insert rules for one entity. Existing unique keys and
+    referenced ids are loaded once up front, so checking a row costs no
+    queries.
+    """
+    model: Any = None
+    schema: Any = None
+    keys: Tuple[Tuple[str, ...], ...] = ()  # unique column sets
+    json_columns: Tuple[str, ...] = ()  # cells holding JSON (as exported)
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.seen: Dict[Tuple[str, ...], Set[tuple]] = {
+            columns: {tuple(row) for row in db.execute(select(*(getattr(self.model, c) for c in columns)))}
+            for columns in self.keys
+        }
+
+    @classmethod
+    def required_columns(cls) -> Set[str]:
+        return {name for name, field in cls.schema.model_fields.items() if field.is_required()}
+
+    def check(self, record) -> List[str]:
+        """Errors that need the database: duplicates and unknown references"""
+        errors = []
+        for columns, seen in self.seen.items():
+            key = tuple(getattr(record, c) for c in columns)
+            if None not in key and key in seen:
+                errors.append(f"duplicate {', '.join(columns)}: {', '.join(map(str, key))}")
+        return errors
+
+    def claim(self, record):
+        for columns, seen in self.seen.items():
+            seen.add(tuple(getattr(record, c) for c in columns))
+
+    def row(self, record) -> Dict[str, Any]:
+        return record.model_dump()
+
+    def inserted(self, rows: List[Dict[str, Any]]):
+        """Hook run in the insert transaction"""
+
+
+def _ids(db: Session, model) -> Set[int]:
+    return set(db.execute(select(model.id)).scalars())
+
+
+class ONUImport(CSVImport):
+    model = ONU
+    schema = ONUCreate
+    keys = (("sn",),)
+
+    def __init__(self, db: Session):
+        super().__init__(db)
+        self.olts = _ids(db, OLT)
+        self.port_olts = dict(db.execute(select(Port.id, Slot.olt_id).join(Slot, Slot.id == Port.slot_id)).all())
+        self.odps = _ids(db, ODP)
+
+    def check(self, record) -> List[str]:
+        errors = super().check(record)
+        if record.olt_id not in self.olts:
+            errors.append(f"olt_id {record.olt_id} not found")
+        elif self.port_olts.get(record.port_id) != record.olt_id:
+            errors.append(f"port_id {record.port_id} not found on OLT {record.olt_id}")
+        if record.odp_id is not None and record.odp_id not in self.odps:
+            errors.append(f"odp_id {record.odp_id} not found")
+        return errors
+
+    def inserted(self, rows: List[Dict[str, Any]]):
+        deltas = CounterDeltas()
+        for row in rows:
+            deltas.add(row["olt_id"], row["port_id"], "offline")  # status column default
+        deltas.apply(self.db)
+
+
+class ODPImport(CSVImport):
+    model = ODP
+    schema = ODPCreate
+    keys = (("name",), ("code",))
+
+    def __init__(self, db: Session):
+        super().__init__(db)
+        self.ports = _ids(db, Port)
+
+    def check(self, record) -> List[str]:
+        errors = super().check(record)
+        if record.port_id is not None and record.port_id not in self.ports:
+            errors.append(f"port_id {record.port_id} not found")
+        return errors
+
+    def row(self, record) -> Dict[str, Any]:
+        row = super().row(record)
+        row["available_ports"] = row["total_ports"]  # Initially all ports available
+        return row
+
+
+class CableRouteImport(CSVImport):
+    model = CableRoute
+    schema = CableRouteCreate
+    keys = (("source_type", "source_id", "destination_type", "destination_id"),)
+    json_columns = ("route_coordinates",)
+    endpoints = {"olt": OLT, "odp": ODP, "onu": ONU}
+
+    def __init__(self, db: Session):
+        super().__init__(db)
+        self.ids = {name: _ids(db, model) for name, model in self.endpoints.items()}
+
+    def check(self, record) -> List[str]:
+        errors = super().check(record)
+        for end in ("source", "destination"):
+            kind, target = getattr(record, f"{end}_type"), getattr(record, f"{end}_id")
+            if kind not in self.ids:
+                errors.append(f"{end}_type must be one of: {', '.join(self.ids)}")
+            elif target not in self.ids[kind]:
+                errors.append(f"{end}_id {target} not found ({kind})")
+        return errors
+
+
+# Import name (as in /export) -> rules
+IMPORTS = {
+    "onus": ONUImport,
+    "odps": ODPImport,
+    "cable-routes": CableRouteImport,
+}
+
+
+def _clean(raw: Dict[Optional[str], Any], json_columns: Iterable[str]) -> Tuple[Dict[str, Any], List[str]]:
+    """CSV cells -> schema input; empty cells are left out so defaults apply"""
+    errors = []
+    if None in raw:
+        errors.append("more cells than header columns")
+    cells = {}
+    for name, value in raw.items():
+        if name is None or value is None:
+            continue
+        value = value.strip()
+        if value == "":
+            continue
+        if name in json_columns:
+            try:
+                value = json.loads(value)
+            except ValueError:
+                errors.append(f"{name}: invalid JSON")
+                continue
+        cells[name] = value
+    return cells, errors
+
+
+def import_csv(db: Session, entity: str, stream: TextIO, batch_size: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Validate and insert the rows of a CSV file (header line first) in
+    batches of IMPORT_BATCH_SIZE, one executemany INSERT and commit per
+    batch. Bad rows are reported by line and skipped; the rest of the
+    file is still imported.
+    """
+    batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+    rules = IMPORTS[entity]
+    reader = csv.DictReader(stream)
+    report: Dict[str, Any] = {"entity": entity, "rows": 0, "inserted": 0, "failed": 0, "errors": []}
+
+    def fail(line: int, errors: List[str]):
+        report["failed"] += 1
+        report["errors"].append({"line": line, "errors": errors})
+
+    def flush(batch: List[Tuple[int, Dict[str, Any]]]):
+        rows = [row for _, row in batch]
+        try:
+            db.execute(insert(rules.model), rows)
+            importer.inserted(rows)
+            db.commit()
+            report["inserted"] += len(rows)
+        except SQLAlchemyError as e:
+            db.rollback()
+            message = str(getattr(e, "orig", None) or e).splitlines()[0]
+            logger.warning(f"Import of {len(rows)} {entity} failed: {message}")
+            for line, _ in batch:
+                fail(line, [f"insert failed: {message}"])
+        batch.clear()
+
+    try:
+        header = reader.fieldnames or []
+    except (csv.Error, UnicodeDecodeError) as e:
+        raise ValueError(f"Unreadable CSV: {e}")
+    missing = rules.required_columns() - set(header)
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(sorted(missing))}")
+
+    importer = rules(db)
+    batch: List[Tuple[int, Dict[str, Any]]] = []
+    try:
+        while True:
+            # A quoted cell can span lines; report the row's first one
+            line = reader.line_num + 1
+            raw = next(reader, None)
+            if raw is None:
+                break
+            report["rows"] += 1
+            cells, errors = _clean(raw, rules.json_columns)
+            try:
+                record = rules.schema.model_validate(cells)
+            except ValidationError as e:
+                errors += [f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()]
+                record = None
+            if record is not None:
+                errors += importer.check(record)
+            if errors:
+                fail(line, errors)
+                continue
+            importer.claim(record)
+            batch.append((line, importer.row(record)))
+            if len(batch) >= batch_size:
+                flush(batch)
+    except (csv.Error, UnicodeDecodeError) as e:
+        # Keep what was read so far; the report says where it stopped
+        report["aborted"] = f"line {reader.line_num}: {e}"
+    if batch:
+        flush(batch)
+    return report
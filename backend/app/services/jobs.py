@@ -0,0 +1,187 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import logging
+import threading
+import time
+import uuid
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class OLTLocks:
+    """
+    One lock per OLT, held while a poll tier or a job talks SNMP to it.
+
+    The poll scheduler skips an OLT that is busy and tries again shortly;
+    jobs wait for it. Either way one OLT never has two walks in flight from
+    this process, which is why the scheduler belongs in the API process
+    when jobs are used.
+    """
+
+    def __init__(self):
+        self._locks: Dict[int, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, olt_id: int) -> threading.Lock:
+        with self._lock:
+            return self._locks.setdefault(olt_id, threading.Lock())
+
+    def try_acquire(self, olt_id: int) -> bool:
+        """Take the OLT's lock if it is free; release() it afterwards"""
+        return self._get(olt_id).acquire(blocking=False)
+
+    def release(self, olt_id: int):
+        self._get(olt_id).release()
+
+    @contextmanager
+    def hold(self, olt_id: int) -> Iterator[None]:
+        """Wait for the OLT's lock and hold it for the block"""
+        lock = self._get(olt_id)
+        with lock:
+            yield
+
+    def busy(self, olt_id: int) -> bool:
+        return self._get(olt_id).locked()
+
+
+olt_locks = OLTLocks()
+
+
+class Job:
+    """
+    One background discovery/sync run for an OLT.
+
+    Workers update phase, rows_processed and result/error as they go; PDU
+    counts are read live from the SNMP client attached with track().
+    """
+
+    def __init__(self, kind: str, olt_id: int):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.olt_id = olt_id
+        self.phase = "queued"  # queued, connecting, walking, writing, done, failed
+        self.rows_processed = 0
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.now()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._client = None
+        self._pdus_sent = 0
+
+    def track(self, client):
+        """Report PDUs sent by this SNMP client as the job's PDU count"""
+        self._client = client
+
+    @property
+    def pdus_sent(self) -> int:
+        if self._client is not None:
+            return getattr(self._client, "pdus_sent", 0)
+        return self._pdus_sent
+
+    @property
+    def finished(self) -> bool:
+        return self.phase in ("done", "failed")
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds spent running (so far)"""
+        if self.started_at is None:
+            return 0.0
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        return end - self.started_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "olt_id": self.olt_id,
+            "phase": self.phase,
+            "rows_processed": self.rows_processed,
+            "pdus_sent": self.pdus_sent,
+            "elapsed": round(self.elapsed, 3),
+            "created_at": self.created_at,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class JobManager:
+    """
+    Runs discovery/sync jobs on a bounded thread pool.
+
+    At most one unfinished job exists per (kind, OLT): submitting another
+    returns the job already queued or running. A job stays queued while its
+    OLT is busy with a poll or another job (olt_locks). Finished jobs are
+    kept for JOB_RETENTION seconds. Jobs live in this process only, so with
+    several API workers a job must be polled on the worker that accepted it.
+    """
+
+    def __init__(self, max_workers: int, retention: float):
+        self.retention = retention
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="olt-job")
+        self._jobs: Dict[str, Job] = {}
+        self._active: Dict[Tuple[str, int], Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, olt_id: int, func: Callable[[Job], Dict[str, Any]]) -> Job:
+        """Queue func(job) for an OLT, or return the job already pending for it"""
+        key = (kind, olt_id)
+        with self._lock:
+            self._prune()
+            job = self._active.get(key)
+            if job is not None:
+                return job
+            job = Job(kind, olt_id)
+            self._jobs[job.id] = job
+            self._active[key] = job
+        self._executor.submit(self._run, key, job, func)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self, olt_id: Optional[int] = None) -> List[Job]:
+        with self._lock:
+            self._prune()
+            jobs = [job for job in self._jobs.values() if olt_id is None or job.olt_id == olt_id]
+        return sorted(jobs, key=lambda job: job.created_at, reverse=True)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, key: Tuple[str, int], job: Job, func: Callable[[Job], Dict[str, Any]]):
+        phase = "done"
+        try:
+            with olt_locks.hold(job.olt_id):
+                job.started_at = time.monotonic()
+                job.result = func(job)
+        except Exception as e:
+            logger.warning(f"{job.kind} job {job.id} for OLT {job.olt_id} failed: {e}")
+            job.error = str(e)
+            phase = "failed"
+        job.finished_at = time.monotonic()
+        # Keep the final PDU count without holding on to the client
+        job._pdus_sent = job.pdus_sent
+        job._client = None
+        job.phase = phase
+        with self._lock:
+            if self._active.get(key) is job:
+                del self._active[key]
+
+    def _prune(self):
+        now = time.monotonic()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished and now - job.finished_at > self.retention
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+job_manager = JobManager(settings.JOB_MAX_WORKERS, settings.JOB_RETENTION)
@@ -0,0 +1,340 @@
+from sqlalchemy import delete, func, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set
+import logging
+import math
+import threading
+import time
+
+from app.core.config import settings
+from app.db.database import SessionLocal, engine
+from app.models.metrics import ONUMetric, ONUMetricRollup
+
+logger = logging.getLogger(__name__)
+
+# Metric name (ONUMetric column) -> code stored in onu_metric_rollups.metric
+METRICS = {
+    "rx_power": 1,
+    "tx_power": 2,
+    "olt_rx_power": 3,
+    "temperature": 4,
+    "voltage": 5,
+    "distance": 6,
+}
+
+# Rollup bucket sizes in seconds
+ROLLUP_RESOLUTIONS = (300, 3600)
+SOURCE_NAMES = {None: "raw", 300: "5m", 3600: "1h"}
+
+# ONU ids per "onu_id IN (...)" query
+ONU_CHUNK = 1000
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Database dialect -> insert() with ON CONFLICT support
+DIALECT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+# Daily onu_metrics partitions known to exist (PostgreSQL)
+_partitions: Set[date] = set()
+
+
+def as_utc(value: datetime) -> datetime:
+    """Naive datetimes (SQLite) are UTC"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _bucket(ts: datetime, seconds: int) -> datetime:
+    """Start of the epoch-aligned bucket containing ts"""
+    elapsed = int((ts - EPOCH).total_seconds())
+    return EPOCH + timedelta(seconds=elapsed - elapsed % seconds)
+
+
+def _is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def write_metrics(db: Session, samples: List[Dict[str, Any]]) -> int:
+    """
+    Append raw samples ({"onu_id", "ts", <metric>: value, ...}) and fold
+    them into the 5-minute and 1-hour rollups, all as executemany batches.
+    Returns the number of samples written.
+    """
+    if not samples:
+        return 0
+    dialect_insert = DIALECT_INSERTS[db.get_bind().dialect.name]
+    rows = []
+    for sample in samples:
+        row = {"onu_id": sample["onu_id"], "ts": as_utc(sample["ts"])}
+        for metric in METRICS:
+            row[metric] = sample.get(metric)
+        rows.append(row)
+
+    if _is_postgres(db):
+        _ensure_partitions(db, {row["ts"].date() for row in rows})
+    db.execute(dialect_insert(ONUMetric).on_conflict_do_nothing(index_elements=["onu_id", "ts"]), rows)
+
+    # (onu_id, metric, resolution, bucket) -> [samples, min, max, sum]
+    aggregates: Dict[tuple, list] = {}
+    for row in rows:
+        for metric, code in METRICS.items():
+            value = row[metric]
+            if value is None:
+                continue
+            for resolution in ROLLUP_RESOLUTIONS:
+                key = (row["onu_id"], code, resolution, _bucket(row["ts"], resolution))
+                aggregate = aggregates.get(key)
+                if aggregate is None:
+                    aggregates[key] = [1, value, value, value]
+                else:
+                    aggregate[0] += 1
+                    aggregate[1] = min(aggregate[1], value)
+                    aggregate[2] = max(aggregate[2], value)
+                    aggregate[3] += value
+
+    if aggregates:
+        # Scalar min()/max() take two arguments on SQLite
+        least, greatest = (func.least, func.greatest) if _is_postgres(db) else (func.min, func.max)
+        stmt = dialect_insert(ONUMetricRollup)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["onu_id", "metric", "resolution", "bucket"],
+            set_={
+                "samples": ONUMetricRollup.samples + stmt.excluded.samples,
+                "min_value": least(ONUMetricRollup.min_value, stmt.excluded.min_value),
+                "max_value": greatest(ONUMetricRollup.max_value, stmt.excluded.max_value),
+                "sum_value": ONUMetricRollup.sum_value + stmt.excluded.sum_value,
+            },
+        )
+        db.execute(stmt, [
+            {
+                "onu_id": onu_id, "metric": code, "resolution": resolution, "bucket": bucket,
+                "samples": samples_count, "min_value": low, "max_value": high, "sum_value": total,
+            }
+            for (onu_id, code, resolution, bucket), (samples_count, low, high, total) in aggregates.items()
+        ])
+    db.commit()
+    return len(rows)
+
+
+def _ensure_partitions(db: Session, days: Set[date]):
+    missing = sorted(days - _partitions)
+    if not missing:
+        return
+    # Committed on their own connection before the samples go in, so a
+    # failed write cannot roll back a partition the cache says exists
+    with db.get_bind().begin() as connection:
+        for day in missing:
+            connection.execute(text(
+                f"CREATE TABLE IF NOT EXISTS onu_metrics_p{day:%Y%m%d} PARTITION OF onu_metrics "
+                f"FOR VALUES FROM ('{day} 00:00:00+00') TO ('{day + timedelta(days=1)} 00:00:00+00')"
+            ))
+    _partitions.update(missing)
+
+
+def prune_metrics(db: Session, now: Optional[datetime] = None):
+    """Drop raw samples and rollups older than their METRICS_*_RETENTION_DAYS"""
+    now = as_utc(now or datetime.now(timezone.utc))
+    raw_cutoff = now - timedelta(days=settings.METRICS_RAW_RETENTION_DAYS)
+    if _is_postgres(db):
+        partitions = db.execute(text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = 'onu_metrics'"
+        )).scalars().all()
+        for name in partitions:
+            day = datetime.strptime(name[-8:], "%Y%m%d").date()
+            if day + timedelta(days=1) <= raw_cutoff.date():
+                db.execute(text(f"DROP TABLE IF EXISTS {name}"))
+                _partitions.discard(day)
+    else:
+        db.execute(
+            delete(ONUMetric).where(ONUMetric.ts < raw_cutoff).execution_options(synchronize_session=False)
+        )
+    for resolution, days in ((300, settings.METRICS_5M_RETENTION_DAYS), (3600, settings.METRICS_1H_RETENTION_DAYS)):
+        db.execute(
+            delete(ONUMetricRollup)
+            .where(ONUMetricRollup.resolution == resolution, ONUMetricRollup.bucket < now - timedelta(days=days))
+            .execution_options(synchronize_session=False)
+        )
+    db.commit()
+
+
+def query_series(db: Session, onu_ids: List[int], metric: str, start: datetime, end: datetime,
+                 points: int) -> Dict[str, Any]:
+    """
+    Downsampled [bucket, min, avg, max] series of one metric per ONU.
+
+    The source is the coarsest table that still gives about `points`
+    buckets: raw samples, then the 5-minute, then the 1-hour rollups
+    (skipping any whose retention does not cover `start`). Buckets are
+    epoch-aligned multiples of the source resolution.
+    """
+    start, end = as_utc(start), as_utc(end)
+    now = datetime.now(timezone.utc)
+    wanted = max((end - start).total_seconds() / max(points, 1), 1)
+    retention = {
+        None: timedelta(days=settings.METRICS_RAW_RETENTION_DAYS),
+        300: timedelta(days=settings.METRICS_5M_RETENTION_DAYS),
+    }
+    if wanted < 300 and start >= now - retention[None]:
+        resolution = None
+    elif wanted < 3600 and start >= now - retention[300]:
+        resolution = 300
+    else:
+        resolution = 3600
+    base = resolution or 1
+    step = max(base, math.ceil(wanted / base) * base)
+
+    series: Dict[int, List[list]] = {onu_id: [] for onu_id in onu_ids}
+    for offset in range(0, len(onu_ids), ONU_CHUNK):
+        chunk = onu_ids[offset:offset + ONU_CHUNK]
+        if resolution is None:
+            column = getattr(ONUMetric, metric)
+            samples = (
+                db.query(ONUMetric.onu_id, ONUMetric.ts, column)
+                .filter(ONUMetric.onu_id.in_(chunk), ONUMetric.ts >= start, ONUMetric.ts < end, column.isnot(None))
+                .order_by(ONUMetric.onu_id, ONUMetric.ts)
+            )
+            rows = ((onu_id, ts, value, value, value, 1) for onu_id, ts, value in samples)
+        else:
+            rows = (
+                db.query(
+                    ONUMetricRollup.onu_id, ONUMetricRollup.bucket, ONUMetricRollup.min_value,
+                    ONUMetricRollup.max_value, ONUMetricRollup.sum_value, ONUMetricRollup.samples,
+                )
+                .filter(
+                    ONUMetricRollup.onu_id.in_(chunk),
+                    ONUMetricRollup.metric == METRICS[metric],
+                    ONUMetricRollup.resolution == resolution,
+                    ONUMetricRollup.bucket >= _bucket(start, resolution),
+                    ONUMetricRollup.bucket < end,
+                )
+                .order_by(ONUMetricRollup.onu_id, ONUMetricRollup.bucket)
+            )
+        _merge_buckets(rows, step, series)
+
+    return {
+        "metric": metric,
+        "source": SOURCE_NAMES[resolution],
+        "step": step,
+        "start": start,
+        "end": end,
+        "series": series,
+    }
+
+
+def _merge_buckets(rows, step: int, series: Dict[int, List[list]]):
+    """Fold (onu_id, ts, min, max, sum, samples) rows, ordered by onu_id/ts, into step buckets"""
+    current = None  # [onu_id, bucket, min, max, sum, samples]
+
+    def emit():
+        series[current[0]].append([
+            current[1], round(current[2], 3), round(current[4] / current[5], 3), round(current[3], 3)
+        ])
+
+    for onu_id, ts, low, high, total, samples in rows:
+        bucket = _bucket(as_utc(ts), step)
+        if current is not None and current[0] == onu_id and current[1] == bucket:
+            current[2] = min(current[2], low)
+            current[3] = max(current[3], high)
+            current[4] += total
+            current[5] += samples
+            continue
+        if current is not None:
+            emit()
+        current = [onu_id, bucket, low, high, total, samples]
+    if current is not None:
+        emit()
+
+
+class MetricsWriter:
+    """
+    Buffers ONU samples recorded by polling and writes them in batches of
+    METRICS_BATCH_SIZE, or every METRICS_FLUSH_INTERVAL seconds once start()
+    runs the background flusher (which also prunes expired data hourly).
+    On a database without an entry in DIALECT_INSERTS, start() disables
+    the writer and samples are discarded as they are recorded.
+    """
+
+    def __init__(self, batch_size: int, flush_interval: float):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.dropped = 0
+        self._buffer: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_prune = 0.0
+        self.enabled = True
+
+    def record(self, samples: List[Dict[str, Any]]):
+        if not settings.METRICS_ENABLED or not self.enabled or not samples:
+            return
+        with self._lock:
+            self._buffer.extend(samples)
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self.flush()
+
+    def flush(self):
+        """Write everything buffered so far"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._buffer = self._buffer, []
+            if not batch:
+                return
+            db = SessionLocal()
+            try:
+                for offset in range(0, len(batch), self.batch_size):
+                    self.written += write_metrics(db, batch[offset:offset + self.batch_size])
+            except Exception as e:
+                db.rollback()
+                self.dropped += len(batch)
+                logger.warning(f"Dropped {len(batch)} ONU metric samples: {e}")
+            finally:
+                db.close()
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        dialect = engine.dialect.name
+        if dialect not in DIALECT_INSERTS:
+            self.enabled = False
+            logger.warning(f"ONU metrics disabled: they need PostgreSQL or SQLite, not {dialect}")
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="onu-metrics-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+            if time.monotonic() - self._last_prune >= 3600:
+                self._last_prune = time.monotonic()
+                db = SessionLocal()
+                try:
+                    prune_metrics(db)
+                except Exception as e:
+                    db.rollback()
+                    logger.warning(f"Pruning ONU metrics failed: {e}")
+                finally:
+                    db.close()
+
+
+metrics_writer = MetricsWriter(settings.METRICS_BATCH_SIZE, settings.METRICS_FLUSH_INTERVAL)
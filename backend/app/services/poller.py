@@ -0,0 +1,330 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from sqlalchemy.orm import Session
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import heapq
+import logging
+import random
+import threading
+import time
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.olt import OLT
+from app.services.alerts import evaluate_olt, reconcile_alerts
+from app.services.counters import reconcile_counters
+from app.services.discovery import OLTUnreachableError, discover_olt, sync_onu_status
+from app.services.jobs import olt_locks
+from app.services.snmp_client import create_snmp_client
+
+logger = logging.getLogger(__name__)
+
+# Seconds before a poll skipped because its OLT was busy is tried again
+BUSY_RETRY = 1.0
+
+
+def poll_reachability(db: Session, olt: OLT) -> Dict[str, Any]:
+    """Check that the OLT answers SNMP and refresh status, last_seen and uptime"""
+    client = create_snmp_client(olt)
+    if not client.test_connection():
+        olt.status = "offline"
+        evaluate_olt(db, olt)
+        db.commit()
+        raise OLTUnreachableError("Cannot connect to OLT")
+    sys_info = client.get_system_info()
+    olt.status = "online"
+    olt.last_seen = datetime.now()
+    if sys_info.get("uptime"):
+        try:
+            olt.uptime = int(sys_info["uptime"])
+        except ValueError:
+            pass
+    evaluate_olt(db, olt)
+    db.commit()
+    return {"uptime": olt.uptime}
+
+
+def poll_onu_status(db: Session, olt: OLT) -> Dict[str, Any]:
+    """Walk ONU status and update known ONUs"""
+    onus = create_snmp_client(olt).get_onu_list()
+    return sync_onu_status(db, olt, onus)
+
+
+def poll_optics(db: Session, olt: OLT) -> Dict[str, Any]:
+    """Full ONU table walk (status, SN, optics, distance)"""
+    return discover_olt(db, olt)
+
+
+# Tier -> (poll function, OLT column overriding the interval, default interval setting)
+TIERS: Dict[str, Tuple[Callable[[Session, OLT], Dict[str, Any]], str, str]] = {
+    "reachability": (poll_reachability, "poll_reachability_interval", "POLL_REACHABILITY_INTERVAL"),
+    "onu_status": (poll_onu_status, "poll_onu_status_interval", "POLL_ONU_STATUS_INTERVAL"),
+    "optics": (poll_optics, "poll_optics_interval", "POLL_OPTICS_INTERVAL"),
+}
+
+
+class PollTask:
+    """Schedule state of one (OLT, tier) pair"""
+
+    __slots__ = ("olt_id", "tier", "base_interval", "interval", "due", "running",
+                 "failures", "last_duration", "last_polled", "last_error", "last_result")
+
+    def __init__(self, olt_id: int, tier: str, base_interval: float):
+        self.olt_id = olt_id
+        self.tier = tier
+        self.base_interval = base_interval
+        self.interval = base_interval
+        self.due = 0.0
+        self.running = False
+        self.failures = 0
+        self.last_duration: Optional[float] = None
+        self.last_polled: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+        self.last_result: Optional[Dict[str, Any]] = None
+
+    def to_dict(self, now: float) -> Dict[str, Any]:
+        return {
+            "olt_id": self.olt_id,
+            "tier": self.tier,
+            "interval": round(self.interval, 1),
+            "base_interval": self.base_interval,
+            "next_in": round(self.due - now, 1),
+            "running": self.running,
+            "failures": self.failures,
+            "last_duration": self.last_duration,
+            "last_polled": self.last_polled,
+            "last_error": self.last_error,
+        }
+
+
+class PollScheduler:
+    """
+    Periodic SNMP poller with three tiers per OLT: reachability/uptime,
+    ONU status and optics (full ONU table).
+
+    Each (OLT, tier) has its own interval (OLT.poll_*_interval or the
+    POLL_*_INTERVAL default), randomised by POLL_JITTER. At most
+    POLL_MAX_CONCURRENCY polls run at once; due polls beyond that wait in
+    the queue and show up as queue depth and lag. A failing poll doubles
+    the tier's interval, and a poll that takes longer than a quarter of its
+    interval stretches it to four times the poll duration, both bounded by
+    POLL_MAX_INTERVAL. ONU tiers are skipped while OLT.status is offline,
+    and a tier whose OLT is busy with another tier or a job (olt_locks)
+    waits BUSY_RETRY seconds and is tried again.
+    Alert rules are evaluated by each poll as it writes its changes; every
+    POLL_RECONCILE_INTERVAL the Port/OLT ONU counters are recounted and all
+    alert rules re-evaluated.
+
+    Run it in exactly one process: either inside the API (POLL_SCHEDULER_ENABLED,
+    single worker) or standalone via poller.py.
+    """
+
+    def __init__(self):
+        self.max_concurrency = settings.POLL_MAX_CONCURRENCY
+        self._tasks: Dict[Tuple[int, str], PollTask] = {}
+        self._queue: List[Tuple[float, int, str]] = []
+        self._olt_status: Dict[int, str] = {}
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._last_refresh = 0.0
+        self._last_reconcile = float("-inf")
+        self._reconciling = False
+        self._dispatch_lag = 0.0
+        self.polls = 0
+        self.failures = 0
+        self.started_at: Optional[datetime] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="olt-poll")
+        self._thread = threading.Thread(target=self.run_forever, name="olt-poll-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def run_forever(self):
+        """Scheduler loop; start() runs it on a background thread"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="olt-poll")
+        self.started_at = datetime.now()
+        logger.info(f"Poll scheduler started (max {self.max_concurrency} concurrent polls)")
+        while not self._stop.is_set():
+            now = time.monotonic()
+            if now - self._last_refresh >= settings.POLL_REFRESH_INTERVAL:
+                try:
+                    self._refresh_olts(now)
+                except Exception as e:
+                    logger.warning(f"Poll scheduler could not load OLTs: {e}")
+                self._last_refresh = now
+            if now - self._last_reconcile >= settings.POLL_RECONCILE_INTERVAL and not self._reconciling:
+                self._last_reconcile = now
+                self._reconciling = True
+                self._executor.submit(self._reconcile)
+            self._dispatch(now)
+            with self._lock:
+                next_due = self._queue[0][0] if self._queue else now + 1.0
+            self._wakeup.wait(timeout=min(max(next_due - time.monotonic(), 0.05), 1.0))
+            self._wakeup.clear()
+        logger.info("Poll scheduler stopped")
+
+    def _refresh_olts(self, now: float):
+        db = SessionLocal()
+        try:
+            olts = db.query(OLT).filter(OLT.is_active == True).all()  # noqa: E712
+            with self._lock:
+                self._olt_status = {olt.id: olt.status for olt in olts}
+                for olt in olts:
+                    for tier, (_, column, default) in TIERS.items():
+                        base = getattr(olt, column) or getattr(settings, default)
+                        task = self._tasks.get((olt.id, tier))
+                        if task is None:
+                            task = PollTask(olt.id, tier, base)
+                            self._tasks[(olt.id, tier)] = task
+                            # Spread the first polls over one interval
+                            task.due = now + random.uniform(0, base) if tier != "reachability" else now
+                            heapq.heappush(self._queue, (task.due, olt.id, tier))
+                        elif task.base_interval != base:
+                            task.base_interval = base
+                            task.interval = max(task.interval, base) if task.failures else base
+                # Inactive or deleted OLTs drop out; their heap entries are skipped
+                for key in [key for key in self._tasks if key[0] not in self._olt_status]:
+                    del self._tasks[key]
+        finally:
+            db.close()
+
+    def _dispatch(self, now: float):
+        with self._lock:
+            while self._queue and self._in_flight < self.max_concurrency:
+                due, olt_id, tier = self._queue[0]
+                if due > now:
+                    break
+                heapq.heappop(self._queue)
+                task = self._tasks.get((olt_id, tier))
+                if task is None or task.running or task.due != due:
+                    continue  # stale entry
+                if tier != "reachability" and self._olt_status.get(olt_id) == "offline":
+                    # Leave ONU polls to resume once the reachability tier sees the OLT again
+                    self._schedule(task, now, task.base_interval)
+                    continue
+                if not olt_locks.try_acquire(olt_id):
+                    task.due = now + BUSY_RETRY
+                    heapq.heappush(self._queue, (task.due, olt_id, tier))
+                    continue
+                task.running = True
+                self._in_flight += 1
+                self._dispatch_lag = now - due
+                self._executor.submit(self._run_task, task)
+
+    def _run_task(self, task: PollTask):
+        poll, _, _ = TIERS[task.tier]
+        start = time.monotonic()
+        error = None
+        result = None
+        db = SessionLocal()
+        try:
+            olt = db.query(OLT).filter(OLT.id == task.olt_id).first()
+            if olt is None:
+                raise ValueError("OLT not found")
+            result = poll(db, olt)
+            status = olt.status
+        except Exception as e:
+            db.rollback()
+            error = str(e)
+            status = "offline" if isinstance(e, OLTUnreachableError) else None
+        finally:
+            db.close()
+            olt_locks.release(task.olt_id)
+        duration = time.monotonic() - start
+
+        with self._lock:
+            self._in_flight -= 1
+            self.polls += 1
+            task.running = False
+            task.last_duration = round(duration, 3)
+            task.last_polled = datetime.now()
+            task.last_error = error
+            task.last_result = result
+            if status and task.olt_id in self._olt_status:
+                self._olt_status[task.olt_id] = status
+            if error:
+                self.failures += 1
+                task.failures += 1
+                interval = task.base_interval * 2 ** min(task.failures, 10)
+                logger.debug(f"{task.tier} poll of OLT {task.olt_id} failed: {error}")
+            else:
+                task.failures = 0
+                interval = task.base_interval
+            # Slow device: keep polls from occupying a worker most of the time
+            interval = max(interval, duration * 4)
+            if (task.olt_id, task.tier) in self._tasks:
+                self._schedule(task, time.monotonic(), min(interval, max(settings.POLL_MAX_INTERVAL, task.base_interval)))
+        self._wakeup.set()
+
+    def _reconcile(self):
+        db = SessionLocal()
+        try:
+            reconcile_counters(db)
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"ONU counter reconciliation failed: {e}")
+        try:
+            reconcile_alerts(db)
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Alert reconciliation failed: {e}")
+        finally:
+            db.close()
+            self._reconciling = False
+
+    def _schedule(self, task: PollTask, now: float, interval: float):
+        """Queue the task's next poll; caller holds the lock"""
+        task.interval = interval
+        jitter = settings.POLL_JITTER
+        task.due = now + interval * random.uniform(1 - jitter, 1 + jitter)
+        heapq.heappush(self._queue, (task.due, task.olt_id, task.tier))
+
+    def status(self, include_tasks: bool = False) -> Dict[str, Any]:
+        """Scheduler health: queue depth (polls due but waiting for a worker) and lag"""
+        now = time.monotonic()
+        with self._lock:
+            waiting = [task for task in self._tasks.values() if not task.running and task.due <= now]
+            report = {
+                "running": self.running,
+                "started_at": self.started_at,
+                "olts": len(self._olt_status),
+                "max_concurrency": self.max_concurrency,
+                "in_flight": self._in_flight,
+                "queue_depth": len(waiting),
+                "lag": round(max((now - task.due for task in waiting), default=0.0), 3),
+                "last_dispatch_lag": round(self._dispatch_lag, 3),
+                "polls": self.polls,
+                "failures": self.failures,
+                "backed_off": sum(1 for task in self._tasks.values() if task.interval > task.base_interval),
+            }
+            if include_tasks:
+                report["tasks"] = [
+                    task.to_dict(now)
+                    for task in sorted(self._tasks.values(), key=lambda task: (task.olt_id, task.tier))
+                ]
+        return report
+
+
+poll_scheduler = PollScheduler()
@@ -1,10 +1,149 @@
 from pysnmp.hlapi import *
-from typing import Optional, Dict, List, Tuple
+from pysnmp.proto import errind
+from pyasn1.codec.ber import encoder as ber_encoder
+from typing import Optional, Dict, List, NamedTuple, Tuple
 import logging
+import threading
+import time
+
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 
+class SNMPSession:
+    """
+    Long-lived pysnmp engine, credentials and UDP transport for one OLT.
+
+    Building a SnmpEngine is expensive (MIB builder bootstrap, transport
+    dispatcher, socket), so a session is created once per OLT and reused
+    by every request. pysnmp engines are not thread safe: callers must hold
+    ``lock`` while driving a command generator.
+    """
+
+    def __init__(self, host: str, port: int, community: str, version: str):
+        self.key = (host, port, community, version)
+        self.engine = SnmpEngine()
+        self.auth = CommunityData(community, mpModel=0 if version == "1" else 1)
+        self.target = UdpTransportTarget((host, port))
+        self.context = ContextData()
+        self.lock = threading.RLock()
+        self.last_used = time.monotonic()
+        # GETBULK max-repetitions learned from this OLT's responses
+        self.bulk_repetitions: Optional[int] = None
+
+    def close(self):
+        """Release the engine's transport sockets"""
+        dispatcher = self.engine.transportDispatcher
+        if dispatcher is not None:
+            try:
+                dispatcher.closeDispatcher()
+            except Exception as e:
+                logger.debug(f"Error closing SNMP session {self.key[0]}: {e}")
+
+
+class SNMPSessionRegistry:
+    """Process-wide registry of SNMP sessions keyed by (host, port, community, version)"""
+
+    def __init__(self, idle_timeout: float):
+        self.idle_timeout = idle_timeout
+        self._sessions: Dict[Tuple[str, int, str, str], SNMPSession] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, host: str, port: int, community: str, version: str) -> SNMPSession:
+        """Return the session for an OLT, creating it on first use"""
+        key = (host, port, community, version)
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now)
+            session = self._sessions.get(key)
+            if session is None:
+                logger.debug(f"Creating SNMP engine for {host}:{port}")
+                session = SNMPSession(host, port, community, version)
+                self._sessions[key] = session
+            session.last_used = now
+        return session
+
+    def _evict_idle(self, now: float):
+        for key, session in list(self._sessions.items()):
+            if now - session.last_used < self.idle_timeout:
+                continue
+            # Never tear down an engine another thread is still using
+            if not session.lock.acquire(blocking=False):
+                continue
+            try:
+                del self._sessions[key]
+                session.close()
+            finally:
+                session.lock.release()
+
+    def evict_idle(self):
+        """Close sessions that have not been used within idle_timeout"""
+        with self._lock:
+            self._evict_idle(time.monotonic())
+
+    def close_all(self):
+        """Close every session (application shutdown)"""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            with session.lock:
+                session.close()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+session_registry = SNMPSessionRegistry(settings.SNMP_SESSION_IDLE_TIMEOUT)
+
+
+class SNMPResult(NamedTuple):
+    """Value of one OID from a multi-varbind GET; error is None on success"""
+    value: Optional[str]
+    error: Optional[str]
+
+
+class ONUIndex(NamedTuple):
+    """One ONU from a walk of OID_ONU_STATUS"""
+    slot: int
+    port: int  # decoded PON port number
+    onu_id: int
+    status: str
+    port_index: int  # raw ZTE port index used in OIDs
+
+    @property
+    def oid_suffix(self) -> str:
+        """slot.port_index.onu_id suffix for detail queries"""
+        return f"{self.slot}.{self.port_index}.{self.onu_id}"
+
+
+class ONUTableRow(NamedTuple):
+    """ONUIndex fields joined with the detail columns of one ONU"""
+    slot: int
+    port: int
+    onu_id: int
+    status: str
+    port_index: int
+    rx_power: Optional[float]
+    tx_power: Optional[float]
+    distance: Optional[str]
+    sn: Optional[str]
+
+    oid_suffix = ONUIndex.oid_suffix
+
+
+# SNMPv2 exception values reported in place of a varbind value
+EXCEPTION_VALUES = {
+    NoSuchObject: "noSuchObject",
+    NoSuchInstance: "noSuchInstance",
+    EndOfMibView: "endOfMibView",
+}
+
+# Bytes reserved per varbind for the value when packing GET PDUs
+VALUE_SIZE_ALLOWANCE = 24
+
+
 class SNMPClient:
     """SNMP Client for ZTE C320 OLT"""
     
@@ -20,22 +159,54 @@ class SNMPClient:
     OID_ONU_DISTANCE = "1.3.6.1.4.1.3902.1012.3.28.1.1.8"  # ONU distance
     OID_ONU_SN = "1.3.6.1.4.1.3902.1012.3.28.1.1.5"  # ONU Serial Number
 
+    # Detail field -> table column, fetched together for one ONU index
+    ONU_DETAIL_COLUMNS = {
+        "status": OID_ONU_STATUS,
+        "rx_power": OID_ONU_RX_POWER,
+        "tx_power": OID_ONU_TX_POWER,
+        "distance": OID_ONU_DISTANCE,
+        "sn": OID_ONU_SN,
+    }
+
+    # ONU phase state -> ONU.status; unknown values are kept as reported
+    ONU_STATUS_NAMES = {
+        "1": "logging",
+        "2": "los",
+        "3": "syncmib",
+        "4": "online",
+        "5": "dying-gasp",
+        "6": "auth-failed",
+        "7": "offline",
+    }
+
     def __init__(self, host: str, community: str = "public", port: int = 161, version: str = "2c"):
         self.host = host
         self.community = community
         self.port = port
         self.version = version
+        # Request PDUs sent by this client (job progress reporting)
+        self.pdus_sent = 0
+        # False after a walk that stopped before the end of its subtree
+        # (timeout, error): its rows are only part of the table
+        self.walk_complete = True
+
+    def _session(self) -> SNMPSession:
+        return session_registry.acquire(self.host, self.port, self.community, self.version)
 
     def get(self, oid: str) -> Optional[str]:
         try:
-            iterator = getCmd(
-                SnmpEngine(),
-                CommunityData(self.community, mpModel=1),
-                UdpTransportTarget((self.host, self.port)),
-                ContextData(),
-                ObjectType(ObjectIdentity(oid))
-            )
-            errorIndication, errorStatus, errorIndex, varBinds = next(iterator)
+            session = self._session()
+            with session.lock:
+                self.pdus_sent += 1
+                iterator = getCmd(
+                    session.engine,
+                    session.auth,
+                    session.target,
+                    session.context,
+                    ObjectType(ObjectIdentity(oid)),
+                    lookupMib=False
+                )
+                errorIndication, errorStatus, errorIndex, varBinds = next(iterator)
             if errorIndication or errorStatus:
                 return None
             for name, val in varBinds:
@@ -45,32 +216,252 @@ class SNMPClient:
         return None
 
     def walk(self, oid: str) -> List[Tuple[str, str]]:
-        results: List[Tuple[str, str]] = []
+        walked, self.walk_complete = self._walk_raw(oid)
+        return [(str(name), str(val)) for name, val in walked]
+
+    def _walk_raw(self, oid: str) -> Tuple[List[Tuple], bool]:
+        """
+        GETNEXT walk returning the raw (ObjectName, value) pairs and whether
+        it reached the end of the subtree
+        """
+        results: List[Tuple] = []
+        complete = False
         try:
-            for (errorIndication, errorStatus, errorIndex, varBinds) in nextCmd(
-                SnmpEngine(),
-                CommunityData(self.community, mpModel=1),
-                UdpTransportTarget((self.host, self.port)),
-                ContextData(),
-                ObjectType(ObjectIdentity(oid)),
-                lexicographicMode=False
-            ):
-                if errorIndication or errorStatus:
-                    break
-                for name, val in varBinds:
-                    results.append((str(name), str(val)))
-        except Exception:
-            pass
+            session = self._session()
+            with session.lock:
+                for (errorIndication, errorStatus, errorIndex, varBinds) in nextCmd(
+                    session.engine,
+                    session.auth,
+                    session.target,
+                    session.context,
+                    ObjectType(ObjectIdentity(oid)),
+                    lexicographicMode=False,
+                    lookupMib=False
+                ):
+                    self.pdus_sent += 1
+                    if errorIndication or errorStatus:
+                        break
+                    if results and varBinds and varBinds[0][0] <= results[-1][0]:
+                        # pysnmp repeats the last row when a v1 agent reports the end of its MIB
+                        complete = True
+                        break
+                    results.extend(varBinds)
+                else:
+                    # The GETNEXT that left the subtree is not yielded
+                    self.pdus_sent += 1
+                    complete = True
+        except Exception as e:
+            logger.debug(f"SNMP walk of {oid} on {self.host} failed: {e}")
+        return results, complete
+
+    def get_many(self, oids: List[str], max_varbinds: Optional[int] = None) -> Dict[str, SNMPResult]:
+        """
+        GET many OIDs with as few PDUs as possible.
+
+        OIDs are packed into PDUs of at most max_varbinds varbinds
+        (SNMP_MAX_VARBINDS_PER_PDU) whose estimated response stays within
+        SNMP_MAX_RESPONSE_SIZE. A tooBig reply splits the PDU in half, and an
+        SNMPv1 error that blames a single varbind is recorded against that OID
+        before the rest of the PDU is retried. Every requested OID is present
+        in the result with either a value or an error.
+        """
+        results: Dict[str, SNMPResult] = {}
+        if not oids:
+            return results
+        max_varbinds = max_varbinds or settings.SNMP_MAX_VARBINDS_PER_PDU
+        try:
+            session = self._session()
+            with session.lock:
+                for chunk in self._pack_varbinds(oids, max_varbinds):
+                    self._get_chunk(session, chunk, results)
+        except Exception as e:
+            for oid in oids:
+                results.setdefault(oid, SNMPResult(None, str(e)))
         return results
 
+    @staticmethod
+    def _pack_varbinds(oids: List[str], max_varbinds: int) -> List[List[str]]:
+        budget = settings.SNMP_MAX_RESPONSE_SIZE - 64
+        chunks: List[List[str]] = []
+        chunk: List[str] = []
+        size = 0
+        for oid in oids:
+            # BER-encoded name plus an allowance for the returned value
+            vb_size = 4 + len(oid) // 2 + VALUE_SIZE_ALLOWANCE
+            if chunk and (len(chunk) >= max_varbinds or size + vb_size > budget):
+                chunks.append(chunk)
+                chunk = []
+                size = 0
+            chunk.append(oid)
+            size += vb_size
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+
+    def _get_chunk(self, session: SNMPSession, chunk: List[str], results: Dict[str, SNMPResult]):
+        pending = list(chunk)
+        while pending:
+            self.pdus_sent += 1
+            errorIndication, errorStatus, errorIndex, varBinds = next(getCmd(
+                session.engine,
+                session.auth,
+                session.target,
+                session.context,
+                *[ObjectType(ObjectIdentity(oid)) for oid in pending],
+                lookupMib=False
+            ))
+            if errorIndication:
+                for oid in pending:
+                    results[oid] = SNMPResult(None, str(errorIndication))
+                return
+            if errorStatus:
+                status = errorStatus.prettyPrint()
+                if int(errorStatus) == 1 and len(pending) > 1:
+                    half = len(pending) // 2
+                    self._get_chunk(session, pending[:half], results)
+                    self._get_chunk(session, pending[half:], results)
+                    return
+                index = int(errorIndex) - 1
+                if len(pending) > 1 and 0 <= index < len(pending):
+                    results[pending.pop(index)] = SNMPResult(None, status)
+                    continue
+                for oid in pending:
+                    results[oid] = SNMPResult(None, status)
+                return
+            for oid, (name, val) in zip(pending, varBinds):
+                exception = EXCEPTION_VALUES.get(val.__class__)
+                if exception:
+                    results[oid] = SNMPResult(None, exception)
+                else:
+                    results[oid] = SNMPResult(str(val), None)
+            return
+
+    def bulk_walk(self, oid: str, max_repetitions: Optional[int] = None,
+                  auto_tune: Optional[bool] = None) -> List[Tuple[str, str]]:
+        """
+        Walk a subtree with GETBULK instead of one GETNEXT round trip per row.
+
+        Each PDU asks for up to max_repetitions rows. With auto_tune the
+        repetition count is re-sized after the first response so that replies
+        stay within SNMP_MAX_RESPONSE_SIZE, and it is halved on timeouts or
+        tooBig errors. The tuned value is remembered on the OLT session and
+        used as the starting point of later walks. SNMP v1 has no GETBULK, so
+        v1 OLTs fall back to walk().
+        """
+        if self.version == "1":
+            return self.walk(oid)
+        walked, self.walk_complete = self._bulk_walk_columns([oid], max_repetitions, auto_tune)
+        return [(str(name), str(val)) for name, val in walked[oid]]
+
+    def _bulk_walk_columns(self, columns: List[str], max_repetitions: Optional[int] = None,
+                           auto_tune: Optional[bool] = None) -> Tuple[Dict[str, List[Tuple]], bool]:
+        """
+        Walk several subtrees together, one varbind per column in each GETBULK
+        repetition. A column drops out of later PDUs once it leaves its
+        subtree. Returns the raw (ObjectName, value) pairs per column, and
+        whether every column was walked to its end.
+        """
+        if auto_tune is None:
+            auto_tune = settings.SNMP_BULK_AUTO_TUNE
+
+        results: Dict[str, List[Tuple]] = {column: [] for column in columns}
+        prefixes = {column: tuple(int(x) for x in column.strip(".").split(".")) for column in columns}
+        # Columns still being walked -> OID to continue from
+        cursors = {column: column for column in columns}
+        received = False
+        try:
+            session = self._session()
+            repetitions = max_repetitions or session.bulk_repetitions or settings.SNMP_BULK_MAX_REPETITIONS
+            tuned = not auto_tune
+            with session.lock:
+                while cursors:
+                    active = list(cursors)
+                    self.pdus_sent += 1
+                    errorIndication, errorStatus, varBindTable = self._bulk_request(
+                        session, [cursors[column] for column in active], repetitions
+                    )
+                    if errorIndication or errorStatus:
+                        # tooBig always comes from a live agent; a timeout only
+                        # suggests an oversized (fragmented) reply once the OLT
+                        # has already answered in this walk
+                        too_big = not errorIndication and int(errorStatus) == 1
+                        timed_out = received and errorIndication == errind.requestTimedOut
+                        retryable = too_big or timed_out
+                        if retryable and repetitions > 1:
+                            repetitions //= 2
+                            if auto_tune:
+                                session.bulk_repetitions = repetitions
+                            continue
+                        break
+                    if not varBindTable:
+                        break
+                    received = True
+                    if not tuned:
+                        repetitions = self._tune_repetitions(varBindTable)
+                        session.bulk_repetitions = repetitions
+                        tuned = True
+
+                    for varBinds in varBindTable:
+                        for column, (name, val) in zip(active, varBinds):
+                            if column not in cursors:
+                                continue
+                            prefix = prefixes[column]
+                            if isinstance(val, EndOfMibView) or tuple(name[:len(prefix)]) != prefix:
+                                del cursors[column]
+                                continue
+                            results[column].append((name, val))
+                            cursors[column] = name
+        except Exception as e:
+            logger.debug(f"SNMP bulk walk on {self.host} failed: {e}")
+            return results, False
+        return results, not cursors
+
+    @staticmethod
+    def _bulk_request(session: SNMPSession, starts: List, repetitions: int):
+        """Send a single GETBULK PDU and return (errorIndication, errorStatus, varBindTable)"""
+        varBindTable = []
+        for (errorIndication, errorStatus, errorIndex, varBinds) in bulkCmd(
+            session.engine,
+            session.auth,
+            session.target,
+            session.context,
+            0, repetitions,
+            *[ObjectType(ObjectIdentity(start)) for start in starts],
+            lexicographicMode=True,
+            lookupMib=False,
+            maxCalls=1
+        ):
+            if errorIndication or errorStatus:
+                return errorIndication, errorStatus, varBindTable
+            varBindTable.append(varBinds)
+        return None, 0, varBindTable
+
+    @staticmethod
+    def _tune_repetitions(varBindTable) -> int:
+        """Size max-repetitions so a response fits in SNMP_MAX_RESPONSE_SIZE"""
+        sample = varBindTable[:8]
+        # Columns that already ran off the end carry no payload worth sizing
+        size = sum(
+            len(ber_encoder.encode(name)) + len(ber_encoder.encode(val)) + 2
+            for varBinds in sample for name, val in varBinds
+            if val.__class__ not in EXCEPTION_VALUES
+        )
+        if not size:
+            return settings.SNMP_BULK_MAX_REPETITIONS
+        row_size = size / len(sample)
+        # Leave room for the message/PDU headers and community string
+        budget = settings.SNMP_MAX_RESPONSE_SIZE - 64
+        return max(1, min(settings.SNMP_BULK_REPETITIONS_CEILING, int(budget // max(row_size, 1))))
+
     def test_connection(self) -> bool:
         return self.get(self.OID_SYSTEM_DESCR) is not None
 
     def get_system_info(self) -> Dict:
+        values = self.get_many([self.OID_SYSTEM_DESCR, self.OID_SYSTEM_UPTIME, self.OID_SYSTEM_NAME])
         return {
-            "description": self.get(self.OID_SYSTEM_DESCR),
-            "uptime": self.get(self.OID_SYSTEM_UPTIME),
-            "name": self.get(self.OID_SYSTEM_NAME)
+            "description": values[self.OID_SYSTEM_DESCR].value,
+            "uptime": values[self.OID_SYSTEM_UPTIME].value,
+            "name": values[self.OID_SYSTEM_NAME].value
         }
 
     @staticmethod
@@ -85,88 +476,142 @@ class SNMPClient:
         except Exception:
             return int(port_index)
 
-    def get_onu_list(self, slot: int = None, port: int = None) -> List[Dict]:
+    def get_onu_list(self, slot: int = None, port: int = None) -> List[ONUIndex]:
         """
         Get list of ONUs from OLT
-        Returns list with both decoded port and raw suffix for detail queries.
-        """
-        onus: List[Dict] = []
-        status_results = self.walk(self.OID_ONU_STATUS)
-        for oid, status in status_results:
-            oid_parts = oid.split('.')
-            if len(oid_parts) >= 3:
-                try:
-                    onu_slot = int(oid_parts[-3])
-                    port_idx = int(oid_parts[-2])
-                    onu_id = int(oid_parts[-1])
-
-                    decoded_port = self.decode_port_index(port_idx)
-
-                    if slot is not None and onu_slot != slot:
-                        continue
-                    if port is not None and decoded_port != port:
-                        continue
-
-                    suffix_raw = f"{onu_slot}.{port_idx}.{onu_id}"
-                    onu_info = {
-                        "slot": onu_slot,
-                        "port": decoded_port,
-                        "onu_id": onu_id,
-                        "status": status,
-                        "oid_suffix": suffix_raw,
-                        "port_index": port_idx
-                    }
-                    onus.append(onu_info)
-                except (ValueError, IndexError):
-                    continue
+        Returns ONUIndex records with both decoded port and raw suffix for
+        detail queries. A slot filter narrows the walk to that slot's subtree.
+        """
+        column = self.OID_ONU_STATUS if slot is None else f"{self.OID_ONU_STATUS}.{slot}"
+        if self.version in ("2c", "3"):
+            walked, self.walk_complete = self._bulk_walk_columns([column])
+            walked = walked[column]
+        else:
+            walked, self.walk_complete = self._walk_raw(column)
+        return self.build_onu_list(walked, slot, port)
+
+    @staticmethod
+    def build_onu_list(walked: List[Tuple], slot: int = None, port: int = None) -> List[ONUIndex]:
+        """Decode raw (ObjectName, value) pairs of an OID_ONU_STATUS walk into ONUIndex records"""
+        onus: List[ONUIndex] = []
+        append = onus.append
+        texts: Dict[str, str] = {}
+        for name, val in walked:
+            index = name.asTuple()[-3:]
+            if len(index) != 3:
+                continue
+            onu_slot, port_idx, onu_id = index
+            if slot is not None and onu_slot != slot:
+                continue
+            decoded_port = (port_idx >> 16) & 0xFF
+            if port is not None and decoded_port != port:
+                continue
+            status = str(val)
+            # Share one string per distinct status value across rows
+            if status not in texts:
+                texts[status] = SNMPClient.ONU_STATUS_NAMES.get(status, status)
+            append(ONUIndex(onu_slot, decoded_port, onu_id, texts[status], port_idx))
         return onus
 
+    def get_onu_table(self, slot: int = None, port: int = None) -> List[ONUTableRow]:
+        """
+        Get every ONU with status, SN, optics and distance in one pass.
+
+        The detail columns are walked together (interleaved GETBULK on v2c/v3,
+        one GETNEXT walk per column on v1) and joined in memory on the
+        slot.port_index.onu_id index, instead of one GET per ONU. If any
+        column walk stops early, walk_complete is False afterwards.
+        """
+        columns = list(self.ONU_DETAIL_COLUMNS.values())
+        if self.version in ("2c", "3"):
+            walked, self.walk_complete = self._bulk_walk_columns(columns)
+        else:
+            walks = {column: self._walk_raw(column) for column in columns}
+            walked = {column: rows for column, (rows, _) in walks.items()}
+            self.walk_complete = all(complete for _, complete in walks.values())
+        return self.join_onu_table(walked, slot, port)
+
+    @classmethod
+    def join_onu_table(cls, walked: Dict[str, List[Tuple]], slot: int = None, port: int = None) -> List[ONUTableRow]:
+        """Join raw (ObjectName, value) walks of ONU_DETAIL_COLUMNS on the ONU index"""
+        columns = cls.ONU_DETAIL_COLUMNS
+        onus = cls.build_onu_list(walked[columns["status"]], slot, port)
+        details: Dict[str, Dict[Tuple[int, int, int], str]] = {
+            field: {name.asTuple()[-3:]: str(val) for name, val in walked[column]}
+            for field, column in columns.items() if field != "status"
+        }
+        rx_power, tx_power, distance, sn = (
+            details["rx_power"], details["tx_power"], details["distance"], details["sn"]
+        )
+        rows: List[ONUTableRow] = []
+        for onu in onus:
+            index = (onu.slot, onu.port_index, onu.onu_id)
+            rows.append(ONUTableRow(
+                *onu,
+                rx_power=cls.convert_power(rx_power.get(index)),
+                tx_power=cls.convert_power(tx_power.get(index)),
+                distance=distance.get(index),
+                sn=sn.get(index),
+            ))
+        return rows
+
     def get_onu_details_suffix(self, suffix_raw: str) -> Dict:
         """Fetch ONU details using the raw OID suffix returned by walk."""
-        details = {
-            "status": self.get(f"{self.OID_ONU_STATUS}.{suffix_raw}"),
-            "rx_power": self.get(f"{self.OID_ONU_RX_POWER}.{suffix_raw}"),
-            "tx_power": self.get(f"{self.OID_ONU_TX_POWER}.{suffix_raw}"),
-            "distance": self.get(f"{self.OID_ONU_DISTANCE}.{suffix_raw}"),
-            "sn": self.get(f"{self.OID_ONU_SN}.{suffix_raw}")
-        }
-        # Convert power values
-        try:
-            if details["rx_power"] is not None:
-                details["rx_power"] = float(details["rx_power"]) / 100
-        except Exception:
-            pass
-        try:
-            if details["tx_power"] is not None:
-                details["tx_power"] = float(details["tx_power"]) / 100
-        except Exception:
-            pass
-        return details
+        return self._get_onu_details(suffix_raw)
 
     def get_onu_details(self, slot: int, port: int, onu_id: int) -> Dict:
         """
         Legacy helper: build suffix using decoded port number.
         Note: On some ZTE MIBs this may not resolve; prefer get_onu_details_suffix.
         """
-        suffix = f".{slot}.{port}.{onu_id}"
         details = {
             "slot": slot,
             "port": port,
             "onu_id": onu_id,
-            "status": self.get(f"{self.OID_ONU_STATUS}{suffix}"),
-            "rx_power": self.get(f"{self.OID_ONU_RX_POWER}{suffix}"),
-            "tx_power": self.get(f"{self.OID_ONU_TX_POWER}{suffix}"),
-            "distance": self.get(f"{self.OID_ONU_DISTANCE}{suffix}"),
-            "sn": self.get(f"{self.OID_ONU_SN}{suffix}")
         }
+        details.update(self._get_onu_details(f"{slot}.{port}.{onu_id}"))
+        return details
+
+    def _get_onu_details(self, suffix: str) -> Dict:
+        """Fetch every ONU detail column for one index in a single GET"""
+        oids = {field: f"{column}.{suffix}" for field, column in self.ONU_DETAIL_COLUMNS.items()}
+        values = self.get_many(list(oids.values()))
+        details = {field: values[oid].value for field, oid in oids.items()}
+        if details["status"] is not None:
+            details["status"] = self.ONU_STATUS_NAMES.get(details["status"], details["status"])
+        # Convert power values
+        details["rx_power"] = self.convert_power(details["rx_power"])
+        details["tx_power"] = self.convert_power(details["tx_power"])
+        return details
+
+    @staticmethod
+    def convert_power(value):
+        """ZTE reports optical power in 0.01 dBm units"""
         try:
-            if details["rx_power"] is not None:
-                details["rx_power"] = float(details["rx_power"]) / 100
-        except Exception:
-            pass
-        try:
-            if details["tx_power"] is not None:
-                details["tx_power"] = float(details["tx_power"]) / 100
+            if value is not None:
+                return float(value) / 100
         except Exception:
             pass
-        return details
+        return value
+
+
+def create_snmp_client(olt):
+    """
+    SNMP client for an OLT row. With SNMP_ASYNC_ENABLED the requests run on
+    the shared asyncio SNMP loop through a blocking facade with the same
+    interface as SNMPClient.
+    """
+    if settings.SNMP_ASYNC_ENABLED:
+        from app.services.async_snmp_client import AsyncSNMPClient, BlockingSNMPClient
+        return BlockingSNMPClient(AsyncSNMPClient(
+            host=olt.ip_address,
+            community=olt.snmp_community,
+            port=olt.snmp_port,
+            version=olt.snmp_version
+        ))
+    return SNMPClient(
+        host=olt.ip_address,
+        community=olt.snmp_community,
+        port=olt.snmp_port,
+        version=olt.snmp_version
+    )
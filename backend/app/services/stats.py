@@ -0,0 +1,105 @@
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, Optional
+import threading
+import time
+
+from app.core.config import settings
+from app.models.olt import OLT
+from app.models.onu import ONU
+from app.models.odp import ODP
+from app.services.versions import on_commit
+
+# Tables whose writes change the dashboard statistics
+STATS_TABLES = {OLT.__tablename__, ONU.__tablename__, ODP.__tablename__}
+
+
+# One conditional-aggregate query per table. ONU figures come from the
+# per-OLT counters, so the cost does not grow with the onus table.
+OLT_STATS = select(
+    func.count(OLT.id),
+    func.sum(case((OLT.status == "online", 1), else_=0)),
+    func.sum(case((OLT.status == "offline", 1), else_=0)),
+    func.sum(OLT.total_onus),
+    func.sum(OLT.online_onus),
+    func.sum(OLT.offline_onus),
+)
+ODP_STATS = select(
+    func.count(ODP.id),
+    func.sum(case((ODP.status == "active", 1), else_=0)),
+    func.sum(ODP.total_ports),
+    func.sum(ODP.used_ports),
+)
+
+
+async def compute_dashboard_stats(db: AsyncSession) -> Dict[str, Any]:
+    """Dashboard statistics from OLT_STATS and ODP_STATS"""
+    olts = (await db.execute(OLT_STATS)).one()
+    odps = (await db.execute(ODP_STATS)).one()
+    total_olts, online_olts, offline_olts, total_onus, online_onus, offline_onus = (int(value or 0) for value in olts)
+    total_odps, active_odps, total_ports, used_ports = (int(value or 0) for value in odps)
+    port_utilization = (used_ports / total_ports * 100) if total_ports > 0 else 0
+
+    return {
+        "olts": {
+            "total": total_olts,
+            "online": online_olts,
+            "offline": offline_olts
+        },
+        "onus": {
+            "total": total_onus,
+            "online": online_onus,
+            "offline": offline_onus
+        },
+        "odps": {
+            "total": total_odps,
+            "active": active_odps
+        },
+        "port_utilization": round(port_utilization, 2)
+    }
+
+
+class StatsSnapshot:
+    """
+    In-process copy of the dashboard statistics, recomputed after `ttl`
+    seconds or as soon as a committed session wrote olts, onus or odps.
+    Callers that pass the tables' version token (app.services.versions)
+    also see writes made by other processes (extra API workers, poller.py)
+    right away.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._value: Optional[Dict[str, Any]] = None
+        self._expires = 0.0
+        self._generation = 0
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+
+    async def get(self, db: AsyncSession, version: Optional[str] = None) -> Dict[str, Any]:
+        with self._lock:
+            if self._value is not None and time.monotonic() < self._expires and version == self._version:
+                return self._value
+            generation = self._generation
+        value = await compute_dashboard_stats(db)
+        with self._lock:
+            # Don't cache a result that an invalidation raced with
+            if generation == self._generation:
+                self._value = value
+                self._expires = time.monotonic() + self.ttl
+                self._version = version
+        return value
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._value = None
+
+
+dashboard_stats = StatsSnapshot(settings.DASHBOARD_STATS_TTL)
+
+
+@on_commit
+def _invalidate_on_commit(tables):
+    if tables & STATS_TABLES:
+        dashboard_stats.invalidate()
@@ -0,0 +1,90 @@
+from sqlalchemy import event, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from datetime import datetime, timezone
+from typing import Callable, Iterable, List, Optional, Set, Tuple
+
+from app.models.cable_route import CableRoute
+from app.models.odp import ODP
+from app.models.olt import OLT
+from app.models.onu import ONU
+from app.models.version import TableVersion
+
+# Tables with a row in table_versions
+VERSIONED_TABLES = {OLT.__tablename__, ONU.__tablename__, ODP.__tablename__, CableRoute.__tablename__}
+
+_commit_listeners: List[Callable[[Set[str]], None]] = []
+
+
+def on_commit(listener: Callable[[Set[str]], None]):
+    """Call listener(tables) after each commit that wrote one of VERSIONED_TABLES"""
+    _commit_listeners.append(listener)
+    return listener
+
+
+async def table_versions(db: AsyncSession, tables: Iterable[str]) -> Tuple[str, Optional[datetime]]:
+    """
+    Version token of a set of tables ("olts.42-onus.1337") and the time
+    of the last commit that changed any of them. One primary key lookup.
+    """
+    rows = (await db.execute(
+        select(TableVersion.table_name, TableVersion.version, TableVersion.updated_at)
+        .where(TableVersion.table_name.in_(list(tables)))
+        .order_by(TableVersion.table_name)
+    )).all()
+    token = "-".join(f"{name}.{version}" for name, version, _ in rows)
+    changed = max((updated_at for _, _, updated_at in rows), default=None)
+    if changed is not None and changed.tzinfo is None:
+        changed = changed.replace(tzinfo=timezone.utc)  # SQLite
+    return token, changed
+
+
+# Every session that writes a versioned table, through the unit of work
+# (CRUD) or bulk insert/update/delete (discovery, polling, import), bumps
+# the table's version in the same transaction. Writes that bypass the
+# Session (raw connections) are not seen.
+
+def _written(session) -> Set[str]:
+    return session.info.setdefault("written_tables", set())
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flushed_writes(session, flush_context):
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(instance, "__tablename__", None)
+        if table in VERSIONED_TABLES:
+            _written(session).add(table)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_bulk_writes(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(getattr(orm_execute_state.statement, "table", None), "name", None)
+        if table in VERSIONED_TABLES:
+            _written(orm_execute_state.session).add(table)
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_versions(session):
+    # before_commit runs ahead of the final flush; flush now to see its writes
+    session.flush()
+    tables = session.info.get("written_tables")
+    if tables:
+        session.execute(
+            update(TableVersion)
+            .where(TableVersion.table_name.in_(sorted(tables)))  # fixed lock order
+            .values(version=TableVersion.version + 1, updated_at=func.now())
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_commit(session):
+    tables = session.info.pop("written_tables", None)
+    if tables:
+        for listener in _commit_listeners:
+            listener(tables)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back(session):
+    session.info.pop("written_tables", None)
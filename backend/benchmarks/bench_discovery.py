@@ -0,0 +1,228 @@
+"""
+ONU discovery benchmarks against the local SNMP simulator
+Measures wall time, SNMP PDUs, DB statements and peak RSS of:
+  - SNMPClient.get_onu_list
+  - SNMPClient.get_onu_details_suffix (one call per ONU, up to --details-limit)
+  - full ONU discovery (discover_olt, the body of the discover job),
+    initial run and re-sync, on a throwaway SQLite DB
+
+Each scenario runs in its own process so peak RSS is not shared; the
+simulator runs in this process and counts the PDUs it receives.
+
+Usage (from backend/):
+    python -m benchmarks.bench_discovery [--sizes 128,1024,8192,32768]
+                                         [--scenarios onu_list,onu_details,discover]
+                                         [--output benchmarks/results/run.json]
+    python -m benchmarks.bench_discovery --compare old.json new.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from snmp_simulator import SimulatedMIB, SNMPAgentSimulator  # noqa: E402
+
+DEFAULT_SIZES = [128, 1024, 8192, 32768]
+SCENARIOS = ["onu_list", "onu_details", "discover"]
+ONUS_PER_PORT = 128
+PORTS_PER_SLOT = 16
+
+
+def olt_layout(total_onus: int):
+    """(slots, ports per slot, ONUs per port) for roughly total_onus ONUs"""
+    onus = min(total_onus, ONUS_PER_PORT)
+    ports_total = max(1, total_onus // onus)
+    ports = min(ports_total, PORTS_PER_SLOT)
+    slots = max(1, ports_total // ports)
+    return slots, ports, onus
+
+
+# Worker side: runs inside a fresh interpreter
+
+def _run_worker(scenario: str, port: int, details_limit: int) -> dict:
+    db_dir = tempfile.mkdtemp(prefix="olt-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(db_dir, 'bench.db')}"
+    os.environ["DEBUG"] = "false"
+
+    from sqlalchemy import event
+    from app.db.database import SessionLocal, engine, init_db
+    from app.services.snmp_client import SNMPClient
+
+    statements = {"count": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements["count"] += 1
+
+    init_db()
+    client = SNMPClient("127.0.0.1", port=port)
+    client.test_connection()  # engine bootstrap is not part of the measurement
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    statements["count"] = 0
+
+    result = {}
+    if scenario == "onu_list":
+        start = time.perf_counter()
+        onus = client.get_onu_list()
+        result["wall_time"] = time.perf_counter() - start
+        result["rows"] = len(onus)
+    elif scenario == "onu_details":
+        onus = client.get_onu_list()
+        sample = onus[:details_limit]
+        start = time.perf_counter()
+        for onu in sample:
+            client.get_onu_details_suffix(onu.oid_suffix)
+        result["wall_time"] = time.perf_counter() - start
+        result["rows"] = len(sample)
+    else:
+        from app.models.olt import OLT
+        from app.services.discovery import discover_olt
+
+        db = SessionLocal()
+        olt = OLT(name="bench-olt", ip_address="127.0.0.1", snmp_port=port)
+        db.add(olt)
+        db.commit()
+        statements["count"] = 0
+        runs = []
+        for phase in ("initial", "resync"):
+            before = statements["count"]
+            start = time.perf_counter()
+            response = discover_olt(db, olt)
+            runs.append({
+                "phase": phase,
+                "wall_time": time.perf_counter() - start,
+                "db_statements": statements["count"] - before,
+                "response": response,
+            })
+        db.close()
+        result["wall_time"] = sum(run["wall_time"] for run in runs)
+        result["rows"] = runs[0]["response"].get("found", 0)
+        result["runs"] = runs
+
+    result["db_statements"] = statements["count"]
+    result["baseline_rss_kb"] = baseline_rss
+    result["peak_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return result
+
+
+# Driver side
+
+def run_scenario(agent: SNMPAgentSimulator, scenario: str, details_limit: int) -> dict:
+    agent.reset_stats()
+    proc = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_discovery", "--worker", scenario,
+         "--port", str(agent.port), "--details-limit", str(details_limit)],
+        cwd=BACKEND_DIR, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{scenario} worker failed:\n{proc.stderr}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["pdus"] = agent.stats["requests"]
+    result["varbinds"] = agent.stats["varbinds"]
+    return result
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True
+        ).stdout.strip() or "unknown"
+    except OSError:
+        return "unknown"
+
+
+def run_suite(sizes, scenarios, details_limit: int, latency_ms: float) -> dict:
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "latency_ms": latency_ms,
+        "results": [],
+    }
+    for size in sizes:
+        slots, ports, onus = olt_layout(size)
+        mib = SimulatedMIB.synthetic(slots, ports, onus)
+        agent = SNMPAgentSimulator(mib, latency=latency_ms / 1000)
+        agent.start()
+        try:
+            for scenario in scenarios:
+                result = run_scenario(agent, scenario, details_limit)
+                result.update({"scenario": scenario, "onus": slots * ports * onus})
+                report["results"].append(result)
+                print(
+                    f"{scenario:<12} {result['onus']:>6} ONUs  {result['wall_time']:>9.3f}s  "
+                    f"{result['pdus']:>7} PDUs  {result['db_statements']:>7} SQL  "
+                    f"{result['peak_rss_kb'] / 1024:>7.1f} MiB peak"
+                )
+        finally:
+            agent.stop()
+    return report
+
+
+def compare(old_path: str, new_path: str):
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    baseline = {(r["scenario"], r["onus"]): r for r in old["results"]}
+    print(f"{old['commit']} -> {new['commit']}")
+    for result in new["results"]:
+        previous = baseline.get((result["scenario"], result["onus"]))
+        if not previous:
+            continue
+        line = f"{result['scenario']:<12} {result['onus']:>6} ONUs"
+        for metric in ("wall_time", "pdus", "db_statements", "peak_rss_kb"):
+            before, after = previous[metric], result[metric]
+            change = (after - before) / before * 100 if before else 0.0
+            line += f"  {metric} {change:+6.1f}%"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ONU discovery benchmarks")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)))
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--details-limit", type=int, default=1000,
+                        help="max ONUs for the per-ONU get_onu_details_suffix scenario")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="simulated agent latency")
+    parser.add_argument("--output", help="JSON report path (default benchmarks/results/<commit>-<time>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"))
+    parser.add_argument("--worker", choices=SCENARIOS, help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(_run_worker(args.worker, args.port, args.details_limit), default=str))
+        return
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    scenarios = [scenario for scenario in args.scenarios.split(",") if scenario]
+    report = run_suite(sizes, scenarios, args.details_limit, args.latency_ms)
+
+    output = args.output or os.path.join(
+        BACKEND_DIR, "benchmarks", "results",
+        f"{report['commit']}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2, default=str)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""
+Standalone OLT poller
+Runs the periodic polling scheduler (reachability, ONU status, optics)
+outside the API process. Use this instead of POLL_SCHEDULER_ENABLED when
+the API runs with several workers.
+
+Usage:
+    python poller.py
+"""
+
+import logging
+
+from app.db.database import init_db
+from app.services.metrics import metrics_writer
+from app.services.poller import poll_scheduler
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    init_db()
+    metrics_writer.start()
+    try:
+        poll_scheduler.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        poll_scheduler.stop()
+        metrics_writer.stop()
+
+
+if __name__ == "__main__":
+    main()
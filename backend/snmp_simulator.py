@@ -0,0 +1,506 @@
+"""
+Local ZTE C320 SNMP agent simulator
+Serves the system OIDs and the ONU tables used by SNMPClient so discovery can
+be exercised and benchmarked without an OLT.
+
+Usage:
+    python snmp_simulator.py [--port 1161] [--slots 2] [--ports 16] [--onus 128]
+                             [--latency-ms 0] [--jitter-ms 0] [--loss 0]
+                             [--cpu-us-per-varbind 0] [--replay walk.txt]
+                             [--dump dataset.snmprec]
+
+Then point the client at it, e.g. python test_snmp.py 127.0.0.1 public 1161
+"""
+
+import argparse
+import asyncio
+import bisect
+import random
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from pyasn1.codec.ber import decoder, encoder
+from pysnmp.proto import api
+
+# Column OIDs served for every ONU, matching SNMPClient
+OID_SYSTEM_DESCR = (1, 3, 6, 1, 2, 1, 1, 1, 0)
+OID_SYSTEM_OBJECT_ID = (1, 3, 6, 1, 2, 1, 1, 2, 0)
+OID_SYSTEM_UPTIME = (1, 3, 6, 1, 2, 1, 1, 3, 0)
+OID_SYSTEM_NAME = (1, 3, 6, 1, 2, 1, 1, 5, 0)
+OID_ONU_STATUS = (1, 3, 6, 1, 4, 1, 3902, 1012, 3, 28, 1, 1, 3)
+OID_ONU_SN = (1, 3, 6, 1, 4, 1, 3902, 1012, 3, 28, 1, 1, 5)
+OID_ONU_DISTANCE = (1, 3, 6, 1, 4, 1, 3902, 1012, 3, 28, 1, 1, 8)
+OID_ONU_RX_POWER = (1, 3, 6, 1, 4, 1, 3902, 1012, 3, 28, 2, 1, 5)
+OID_ONU_TX_POWER = (1, 3, 6, 1, 4, 1, 3902, 1012, 3, 28, 2, 1, 6)
+
+ONU_COLUMNS = {
+    "status": OID_ONU_STATUS,
+    "sn": OID_ONU_SN,
+    "distance": OID_ONU_DISTANCE,
+    "rx_power": OID_ONU_RX_POWER,
+    "tx_power": OID_ONU_TX_POWER,
+}
+
+# Value type tags (snmprec numbering)
+INTEGER = 2
+OCTET_STRING = 4
+HEX_STRING = "4x"
+OBJECT_ID = 6
+IP_ADDRESS = 64
+COUNTER32 = 65
+GAUGE32 = 66
+TIMETICKS = 67
+COUNTER64 = 70
+
+# ZTE ONU phase states, weighted towards "working"
+ONU_STATES = [(4, 0.85), (7, 0.07), (2, 0.04), (5, 0.02), (1, 0.02)]
+
+
+def encode_port_index(slot: int, port: int) -> int:
+    """ZTE-style 32-bit PON port index; SNMPClient.decode_port_index returns port"""
+    return (0x10 << 24) | ((port & 0xFF) << 16) | ((slot & 0xFF) << 8)
+
+
+def parse_oid(text: str) -> Tuple[int, ...]:
+    return tuple(int(x) for x in text.strip().strip(".").split("."))
+
+
+class SimulatedMIB:
+    """Sorted OID -> (type tag, value) table with GETNEXT lookup"""
+
+    def __init__(self):
+        self.values: Dict[Tuple[int, ...], Tuple] = {}
+        self._keys: Optional[List[Tuple[int, ...]]] = None
+
+    def set(self, oid: Tuple[int, ...], tag, value):
+        if oid not in self.values:
+            self._keys = None
+        self.values[oid] = (tag, value)
+
+    def remove(self, oid: Tuple[int, ...]):
+        if self.values.pop(oid, None) is not None:
+            self._keys = None
+
+    def get(self, oid: Tuple[int, ...]) -> Optional[Tuple]:
+        return self.values.get(oid)
+
+    def next(self, oid: Tuple[int, ...]) -> Optional[Tuple[int, ...]]:
+        if self._keys is None:
+            self._keys = sorted(self.values)
+        i = bisect.bisect_right(self._keys, oid)
+        return self._keys[i] if i < len(self._keys) else None
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    # Synthetic ZTE C320 inventory
+
+    @classmethod
+    def synthetic(cls, slots: int = 2, ports: int = 16, onus: int = 128, seed: int = 0) -> "SimulatedMIB":
+        """slots x ports x onus ONUs with random but reproducible state"""
+        mib = cls()
+        rng = random.Random(seed)
+        mib.set(OID_SYSTEM_DESCR, OCTET_STRING, "ZTE ZXA10 C320, Version V2.1.0 (simulated)")
+        mib.set(OID_SYSTEM_OBJECT_ID, OBJECT_ID, (1, 3, 6, 1, 4, 1, 3902, 1082, 1001, 320))
+        mib.set(OID_SYSTEM_UPTIME, TIMETICKS, None)  # computed from agent start
+        mib.set(OID_SYSTEM_NAME, OCTET_STRING, "zte-c320-sim")
+        states, weights = zip(*ONU_STATES)
+        for slot in range(1, slots + 1):
+            for port in range(1, ports + 1):
+                for onu_id in range(1, onus + 1):
+                    state = rng.choices(states, weights)[0]
+                    mib.set_onu(
+                        slot, port, onu_id,
+                        status=state,
+                        sn=f"ZTEG{rng.getrandbits(32):08X}",
+                        distance=rng.randint(50, 20000),
+                        rx_power=rng.randint(-2900, -1500),
+                        tx_power=rng.randint(150, 300),
+                    )
+        return mib
+
+    def set_onu(self, slot: int, port: int, onu_id: int, **fields):
+        """Create or update an ONU row; fields are status, sn, distance, rx_power, tx_power"""
+        index = (slot, encode_port_index(slot, port), onu_id)
+        for field, value in fields.items():
+            tag = OCTET_STRING if field == "sn" else INTEGER
+            self.set(ONU_COLUMNS[field] + index, tag, value)
+
+    def remove_onu(self, slot: int, port: int, onu_id: int):
+        index = (slot, encode_port_index(slot, port), onu_id)
+        for column in ONU_COLUMNS.values():
+            self.remove(column + index)
+
+    # Recorded walks
+
+    SNMPWALK_TYPES = {
+        "INTEGER": INTEGER, "STRING": OCTET_STRING, "Hex-STRING": HEX_STRING,
+        "OID": OBJECT_ID, "IpAddress": IP_ADDRESS, "Counter32": COUNTER32,
+        "Gauge32": GAUGE32, "Timeticks": TIMETICKS, "Counter64": COUNTER64,
+    }
+
+    @classmethod
+    def from_walk_file(cls, path: str) -> "SimulatedMIB":
+        """
+        Load a recorded walk, either snmprec ("oid|tag|value") or
+        `snmpwalk -On` output (".1.3.6... = TYPE: value").
+        """
+        mib = cls()
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                line = line.rstrip("\r\n")
+                if not line or line.startswith("#"):
+                    continue
+                try:
+                    if "|" in line and " = " not in line:
+                        oid, tag, value = line.split("|", 2)
+                        mib._set_snmprec(parse_oid(oid), tag, value)
+                    else:
+                        mib._set_snmpwalk(line)
+                except ValueError:
+                    continue
+        return mib
+
+    def _set_snmprec(self, oid, tag: str, value: str):
+        if tag == HEX_STRING:
+            self.set(oid, HEX_STRING, value)
+        elif int(tag) == OCTET_STRING:
+            self.set(oid, OCTET_STRING, value)
+        elif int(tag) == OBJECT_ID:
+            self.set(oid, OBJECT_ID, parse_oid(value))
+        elif int(tag) == IP_ADDRESS:
+            self.set(oid, IP_ADDRESS, value)
+        else:
+            self.set(oid, int(tag), int(value))
+
+    def _set_snmpwalk(self, line: str):
+        oid, _, rest = line.partition(" = ")
+        type_name, _, value = rest.partition(": ")
+        tag = self.SNMPWALK_TYPES.get(type_name.strip())
+        if tag is None:
+            return
+        value = value.strip()
+        if tag == OCTET_STRING:
+            value = value[1:-1] if value.startswith('"') and value.endswith('"') else value
+        elif tag == HEX_STRING:
+            value = value.replace(" ", "")
+        elif tag == OBJECT_ID:
+            value = parse_oid(value)
+        elif tag == TIMETICKS:
+            # "(12345) 0:02:03.45", or the bare tick count
+            match = re.match(r"\((\d+)\)", value)
+            value = int(match.group(1)) if match else int(value)
+        elif tag == INTEGER:
+            # Enumerations are printed as "name(3)", plain values as "3";
+            # anything else fails int() and the line is skipped
+            match = re.search(r"-?\d+", value)
+            value = int(match.group(0)) if match else int(value)
+        elif tag != IP_ADDRESS:
+            value = int(value)
+        self.set(parse_oid(oid), tag, value)
+
+    def write_snmprec(self, path: str):
+        """Dump the table in snmprec format, replayable with from_walk_file"""
+        with open(path, "w", encoding="utf-8") as f:
+            for oid in sorted(self.values):
+                tag, value = self.values[oid]
+                if value is None:
+                    continue
+                if tag == OBJECT_ID:
+                    value = ".".join(map(str, value))
+                f.write(f"{'.'.join(map(str, oid))}|{tag}|{value}\n")
+
+
+class _AgentProtocol(asyncio.DatagramProtocol):
+    def __init__(self, agent: "SNMPAgentSimulator"):
+        self.agent = agent
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.agent._handle(self.transport, data, addr)
+
+
+class SNMPAgentSimulator:
+    """
+    Minimal SNMPv1/v2c command responder (GET, GETNEXT, GETBULK) over a
+    SimulatedMIB, with injectable latency, packet loss and agent CPU cost.
+
+    cpu_per_varbind models a single-threaded agent CPU: requests queue
+    behind each other and each costs that many seconds per varbind served,
+    without blocking the simulator's own event loop.
+    """
+
+    def __init__(self, mib: SimulatedMIB, host: str = "127.0.0.1", port: int = 0,
+                 community: str = "public", latency: float = 0.0, jitter: float = 0.0,
+                 loss: float = 0.0, cpu_per_varbind: float = 0.0,
+                 max_message_size: int = 1472, seed: Optional[int] = None):
+        self.mib = mib
+        self.host = host
+        self.port = port
+        self.community = community
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.cpu_per_varbind = cpu_per_varbind
+        self.max_message_size = max_message_size
+        self.stats = {"requests": 0, "responses": 0, "dropped": 0, "varbinds": 0, "errors": 0}
+        self._rng = random.Random(seed)
+        self._started = time.monotonic()
+        self._cpu_free_at = 0.0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._transport = None
+
+    # Lifecycle
+
+    async def _open(self):
+        loop = asyncio.get_running_loop()
+        self._transport, protocol = await loop.create_datagram_endpoint(
+            lambda: _AgentProtocol(self), local_addr=(self.host, self.port)
+        )
+        self.port = self._transport.get_extra_info("sockname")[1]
+
+    def start(self) -> Tuple[str, int]:
+        """Serve from a background thread; returns the bound (host, port)"""
+        ready = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self._open())
+            ready.set()
+            self._loop.run_forever()
+            self._transport.close()
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name="snmp-simulator", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self.host, self.port
+
+    def stop(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop = None
+
+    def serve_forever(self):
+        async def main():
+            await self._open()
+            print(f"ZTE C320 simulator: {len(self.mib)} OIDs on udp://{self.host}:{self.port}")
+            await asyncio.Event().wait()
+        try:
+            asyncio.run(main())
+        except KeyboardInterrupt:
+            pass
+
+    def reset_stats(self):
+        for key in self.stats:
+            self.stats[key] = 0
+
+    # Request handling
+
+    def _handle(self, transport, data: bytes, addr):
+        self.stats["requests"] += 1
+        if self.loss and self._rng.random() < self.loss:
+            self.stats["dropped"] += 1
+            return
+        try:
+            response, varbind_count = self._respond(data)
+        except Exception:
+            self.stats["errors"] += 1
+            return
+        if response is None:
+            self.stats["dropped"] += 1
+            return
+        self.stats["varbinds"] += varbind_count
+
+        delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        if self.cpu_per_varbind:
+            now = time.monotonic()
+            self._cpu_free_at = max(now, self._cpu_free_at) + self.cpu_per_varbind * max(varbind_count, 1)
+            delay += self._cpu_free_at - now
+        if delay > 0:
+            asyncio.get_running_loop().call_later(delay, self._send, transport, response, addr)
+        else:
+            self._send(transport, response, addr)
+
+    def _send(self, transport, response: bytes, addr):
+        if not transport.is_closing():
+            transport.sendto(response, addr)
+            self.stats["responses"] += 1
+
+    def _respond(self, data: bytes):
+        version = int(api.decodeMessageVersion(data))
+        pMod = api.protoModules[version]
+        request, _ = decoder.decode(data, asn1Spec=pMod.Message())
+        if str(pMod.apiMessage.getCommunity(request)) != self.community:
+            return None, 0
+        pdu = pMod.apiMessage.getPDU(request)
+        response = pMod.apiMessage.getResponse(request)
+        response_pdu = pMod.apiMessage.getPDU(response)
+        requested = [tuple(name) for name, _ in pMod.apiPDU.getVarBinds(pdu)]
+        v1 = version == api.protoVersion1
+
+        if pdu.isSameTypeWith(pMod.GetRequestPDU()):
+            varbinds, error = self._get(pMod, requested, v1)
+        elif pdu.isSameTypeWith(pMod.GetNextRequestPDU()):
+            varbinds, error = self._get_next(pMod, requested, v1)
+        elif not v1 and pdu.isSameTypeWith(pMod.GetBulkRequestPDU()):
+            non_repeaters = int(pMod.apiBulkPDU.getNonRepeaters(pdu))
+            max_repetitions = int(pMod.apiBulkPDU.getMaxRepetitions(pdu))
+            return self._get_bulk(pMod, response, response_pdu, requested, non_repeaters, max_repetitions)
+        else:
+            varbinds, error = [(oid, pMod.Null("")) for oid in requested], (5, 0)  # genErr
+
+        if error:
+            # Errors echo the request varbinds and blame one of them
+            pMod.apiPDU.setErrorStatus(response_pdu, error[0])
+            pMod.apiPDU.setErrorIndex(response_pdu, error[1])
+            varbinds = [(oid, pMod.Null("")) for oid in requested]
+        pMod.apiPDU.setVarBinds(response_pdu, varbinds)
+        message = encoder.encode(response)
+        if len(message) > self.max_message_size:
+            pMod.apiPDU.setErrorStatus(response_pdu, 1)  # tooBig
+            pMod.apiPDU.setErrorIndex(response_pdu, 0)
+            pMod.apiPDU.setVarBinds(response_pdu, [(oid, pMod.Null("")) for oid in requested])
+            message = encoder.encode(response)
+        return message, len(varbinds)
+
+    def _value(self, pMod, oid):
+        entry = self.mib.get(oid)
+        if entry is None:
+            return None
+        tag, value = entry
+        if tag == INTEGER:
+            return pMod.Integer(value)
+        if tag == OCTET_STRING:
+            return pMod.OctetString(value)
+        if tag == HEX_STRING:
+            return pMod.OctetString(hexValue=value)
+        if tag == OBJECT_ID:
+            return pMod.ObjectIdentifier(value)
+        if tag == IP_ADDRESS:
+            return pMod.IpAddress(value)
+        if tag == COUNTER32:
+            return pMod.Counter(value) if pMod is api.v1 else pMod.Counter32(value)
+        if tag == GAUGE32:
+            return pMod.Gauge(value) if pMod is api.v1 else pMod.Gauge32(value)
+        if tag == TIMETICKS:
+            if value is None:
+                value = int((time.monotonic() - self._started) * 100)
+            return pMod.TimeTicks(value)
+        if tag == COUNTER64 and pMod is not api.v1:
+            return pMod.Counter64(value)
+        return None
+
+    def _get(self, pMod, requested, v1):
+        varbinds = []
+        for position, oid in enumerate(requested, 1):
+            value = self._value(pMod, oid)
+            if value is None:
+                if v1:
+                    return varbinds, (2, position)  # noSuchName
+                value = api.v2c.NoSuchInstance("") if self._has_object(oid) else api.v2c.NoSuchObject("")
+            varbinds.append((oid, value))
+        return varbinds, None
+
+    def _has_object(self, oid) -> bool:
+        following = self.mib.next(oid[:-1])
+        return following is not None and following[:len(oid) - 1] == oid[:-1]
+
+    def _successor(self, pMod, oid):
+        """Next OID with a value this protocol version can carry"""
+        while True:
+            oid = self.mib.next(oid)
+            if oid is None:
+                return None, None
+            value = self._value(pMod, oid)
+            if value is not None:
+                return oid, value
+
+    def _get_next(self, pMod, requested, v1):
+        varbinds = []
+        for position, oid in enumerate(requested, 1):
+            following, value = self._successor(pMod, oid)
+            if following is None:
+                if v1:
+                    return varbinds, (2, position)  # noSuchName
+                following, value = oid, api.v2c.EndOfMibView("")
+            varbinds.append((following, value))
+        return varbinds, None
+
+    def _get_bulk(self, pMod, response, response_pdu, requested, non_repeaters, max_repetitions):
+        varbinds, _ = self._get_next(pMod, requested[:non_repeaters], False)
+        cursors = requested[non_repeaters:]
+        rows = []
+        for _ in range(max_repetitions if cursors else 0):
+            row, _ = self._get_next(pMod, cursors, False)
+            rows.append(row)
+            cursors = [name for name, _ in row]
+            if all(isinstance(value, api.v2c.EndOfMibView) for _, value in row):
+                break
+
+        # Agents trim repetitions so the response fits (RFC 3416 4.2.3)
+        count = len(rows)
+        while True:
+            flat = varbinds + [vb for row in rows[:count] for vb in row]
+            pMod.apiPDU.setVarBinds(response_pdu, flat)
+            message = encoder.encode(response)
+            if len(message) <= self.max_message_size or count == 0:
+                break
+            count = max(0, min(count - 1, int(count * self.max_message_size / len(message))))
+        if len(message) > self.max_message_size:
+            pMod.apiPDU.setErrorStatus(response_pdu, 1)  # tooBig
+            pMod.apiPDU.setVarBinds(response_pdu, [])
+            message = encoder.encode(response)
+        return message, len(flat)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ZTE C320 SNMP agent simulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1161)
+    parser.add_argument("--community", default="public")
+    parser.add_argument("--slots", type=int, default=2)
+    parser.add_argument("--ports", type=int, default=16, help="PON ports per slot")
+    parser.add_argument("--onus", type=int, default=128, help="ONUs per PON port")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--loss", type=float, default=0.0, help="request drop probability (0-1)")
+    parser.add_argument("--cpu-us-per-varbind", type=float, default=0.0)
+    parser.add_argument("--max-message-size", type=int, default=1472)
+    parser.add_argument("--replay", help="serve a recorded walk (snmprec or snmpwalk -On output)")
+    parser.add_argument("--dump", help="write the dataset as snmprec and exit")
+    args = parser.parse_args()
+
+    if args.replay:
+        mib = SimulatedMIB.from_walk_file(args.replay)
+    else:
+        mib = SimulatedMIB.synthetic(args.slots, args.ports, args.onus, args.seed)
+    if args.dump:
+        mib.write_snmprec(args.dump)
+        print(f"Wrote {len(mib)} OIDs to {args.dump}")
+        return
+
+    SNMPAgentSimulator(
+        mib,
+        host=args.host,
+        port=args.port,
+        community=args.community,
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        loss=args.loss,
+        cpu_per_varbind=args.cpu_us_per_varbind / 1_000_000,
+        max_message_size=args.max_message_size,
+        seed=args.seed,
+    ).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
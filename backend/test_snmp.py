@@ -1,18 +1,22 @@
 """
 Test SNMP connection to OLT
-Usage: python test_snmp.py <olt_ip> [community]
+Usage: python test_snmp.py <olt_ip> [community] [port]
+
+Without hardware, run against the simulator:
+    python snmp_simulator.py --port 1161
+    python test_snmp.py 127.0.0.1 public 1161
 """
 
 import sys
 from app.services.snmp_client import SNMPClient
 
-def test_snmp_connection(host, community="public"):
+def test_snmp_connection(host, community="public", port=161):
     print("=" * 60)
-    print(f"Testing SNMP Connection to {host}")
+    print(f"Testing SNMP Connection to {host}:{port}")
     print("=" * 60)
     
     # Create SNMP client
-    snmp = SNMPClient(host=host, community=community)
+    snmp = SNMPClient(host=host, community=community, port=port)
     
     # Test 1: Connection test
     print("\n1. Testing connection...")
@@ -45,7 +49,7 @@ def test_snmp_connection(host, community="public"):
         if onus:
             print(f"   ✓ Discovered {len(onus)} ONUs")
             for onu in onus[:5]:  # Show first 5
-                print(f"     - Slot {onu['slot']}, Port {onu['port']}, ONU ID {onu['onu_id']}")
+                print(f"     - Slot {onu.slot}, Port {onu.port}, ONU ID {onu.onu_id}")
             if len(onus) > 5:
                 print(f"     ... and {len(onus) - 5} more")
         else:
@@ -60,11 +64,12 @@ def test_snmp_connection(host, community="public"):
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Usage: python test_snmp.py <olt_ip> [community]")
+        print("Usage: python test_snmp.py <olt_ip> [community] [port]")
         print("Example: python test_snmp.py 192.168.1.100 public")
         sys.exit(1)
     
     host = sys.argv[1]
     community = sys.argv[2] if len(sys.argv) > 2 else "public"
+    port = int(sys.argv[3]) if len(sys.argv) > 3 else 161
     
-    test_snmp_connection(host, community)
+    test_snmp_connection(host, community, port)
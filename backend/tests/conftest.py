@@ -0,0 +1,27 @@
+import os
+
+import pytest
+from alembic import command
+
+from app.db.database import alembic_config
+
+
+@pytest.fixture(scope="session")
+def postgres_url():
+    """
+    Throwaway PostgreSQL database from TEST_DATABASE_URL; everything in it
+    is dropped. Tests that need it are skipped when it is not set.
+    """
+    url = os.environ.get("TEST_DATABASE_URL")
+    if not url or not url.startswith("postgresql"):
+        pytest.skip("TEST_DATABASE_URL (PostgreSQL) not set")
+    return url
+
+
+@pytest.fixture(scope="session")
+def migrate():
+    def run(url: str):
+        config = alembic_config(url)
+        command.downgrade(config, "base")
+        command.upgrade(config, "head")
+    return run
@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from alembic import command
+from sqlalchemy import create_engine, insert, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import alembic_config
+from app.models.alert import Alert
+from app.models.olt import OLT, Slot, Port
+from app.models.onu import ONU
+from app.services.alerts import AlertBatch, alert_key, evaluate_olt, evaluate_onus
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ALERT_CLEAR_AFTER", 60)
+    monkeypatch.setattr(settings, "ALERT_REOPEN_WINDOW", 3600)
+    url = f"sqlite:///{tmp_path / 'alerts.db'}"
+    command.upgrade(alembic_config(url), "head")
+    engine = create_engine(url)
+    with Session(engine) as session:
+        session.add(OLT(id=1, name="olt-1", ip_address="10.0.0.1", status="online"))
+        session.execute(insert(Slot), [{"id": 1, "olt_id": 1, "slot_number": 1}])
+        session.execute(insert(Port), [{"id": 1, "slot_id": 1, "port_number": 1}])
+        session.execute(insert(ONU), [
+            {"id": n, "sn": f"SN{n}", "olt_id": 1, "port_id": 1, "onu_id": n, "status": "online", "rx_power": -20.0}
+            for n in range(1, 5)
+        ])
+        session.commit()
+        yield session
+    engine.dispose()
+
+
+def _observe(db, now, holds, delay=60):
+    batch = AlertBatch(now)
+    batch.observe("onu_offline", "onu_offline:onu:1", holds, {"olt_id": 1, "port_id": 1, "onu_id": 1},
+                  "ONU SN1 is los", delay=delay)
+    counts = batch.apply(db)
+    db.commit()
+    return counts
+
+
+def _alerts(db, rule=None):
+    db.expire_all()
+    query = db.query(Alert)
+    if rule is not None:
+        query = query.filter(Alert.rule == rule)
+    return [(alert.state, alert.flaps) for alert in query.order_by(Alert.id)]
+
+
+def test_delay_and_flap_suppression(db):
+    _observe(db, T0, True)
+    assert _alerts(db) == [("pending", 0)]
+    _observe(db, T0 + timedelta(seconds=30), False)  # shorter than the delay: never raised
+    assert _alerts(db) == []
+
+    _observe(db, T0 + timedelta(seconds=40), True)
+    assert _observe(db, T0 + timedelta(seconds=100), True)["opened"] == 1
+    assert _alerts(db) == [("open", 0)]
+
+    # Gone and back within ALERT_CLEAR_AFTER: stays open
+    _observe(db, T0 + timedelta(seconds=110), False)
+    _observe(db, T0 + timedelta(seconds=120), True)
+    _observe(db, T0 + timedelta(seconds=200), False)
+    assert _alerts(db) == [("open", 0)]
+    assert _observe(db, T0 + timedelta(seconds=260), False)["cleared"] == 1
+    assert _alerts(db) == [("cleared", 0)]
+
+    # Back within the reopen window: the same alert again, no delay
+    assert _observe(db, T0 + timedelta(seconds=300), True)["reopened"] == 1
+    assert _alerts(db) == [("open", 1)]
+
+
+def test_power_threshold_hysteresis(db, monkeypatch):
+    monkeypatch.setattr(settings, "ALERT_CLEAR_AFTER", 0)
+    olt = db.get(OLT, 1)
+
+    def poll(rx_power):
+        db.execute(update(ONU).where(ONU.id == 1).values(rx_power=rx_power))
+        evaluate_onus(db, olt, ["SN1"])
+        db.commit()
+        return _alerts(db, "onu_rx_low")
+
+    assert poll(-28.0) == [("open", 0)]
+    assert poll(-26.5) == [("open", 0)]  # above the threshold, within ALERT_POWER_HYSTERESIS
+    assert poll(-25.5) == [("cleared", 0)]
+    assert poll(-26.5) == [("cleared", 0)]
+
+
+def test_port_los_and_events(db):
+    olt = db.get(OLT, 1)
+    db.execute(update(ONU).values(status="los"))
+    evaluate_onus(db, olt, [f"SN{n}" for n in range(1, 5)])
+    events = [item for item in db.info["events"] if item["type"] == "alert"]
+    db.commit()
+    assert _alerts(db, "port_los") == [("open", 0)]
+    assert [(item["rule"], item["state"], item["port_id"]) for item in events] == [("port_los", "open", 1)]
+    # Offline duration has not passed yet
+    assert _alerts(db, "onu_offline") == [("pending", 0)] * 4
+
+
+def test_sweep_holds_onu_alerts_while_olt_is_offline(db, monkeypatch):
+    monkeypatch.setattr(settings, "ALERT_OLT_UNREACHABLE_AFTER", 0)
+    olt = db.get(OLT, 1)
+    db.execute(update(ONU).where(ONU.id == 1).values(status="offline"))
+    evaluate_onus(db, olt, ["SN1"])
+    db.commit()
+    db.execute(update(Alert).values(raise_at=T0))  # delay has run out
+
+    olt.status = "offline"
+    evaluate_olt(db, olt)
+    db.commit()
+    assert _alerts(db) == [("pending", 0), ("open", 0)]
+    assert db.query(Alert.key).filter(Alert.state == "open").scalar() == alert_key("olt_unreachable", "olt", 1)
+
+    olt.status = "online"
+    evaluate_olt(db, olt)
+    db.commit()
+    assert _alerts(db, "onu_offline") == [("open", 0)]
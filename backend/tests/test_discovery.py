@@ -0,0 +1,129 @@
+import asyncio
+import io
+
+import pytest
+from alembic import command
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import Session
+
+from app.db.database import alembic_config
+from app.models.olt import OLT, Port
+from app.models.onu import ONU
+from app.services.async_snmp_client import AsyncSNMPClient
+from app.services.counters import reconcile_counters
+from app.services.discovery import sync_onus
+from app.services.importer import import_csv
+from snmp_simulator import SimulatedMIB, SNMPAgentSimulator
+
+
+@pytest.fixture
+def agent():
+    simulator = SNMPAgentSimulator(SimulatedMIB.synthetic(slots=1, ports=2, onus=64, seed=1))
+    simulator.start()
+    yield simulator
+    simulator.stop()
+
+
+def truncate_after(simulator: SNMPAgentSimulator, requests: int):
+    """Make the agent stop answering after its first few requests"""
+    respond = simulator._respond
+
+    def limited(data):
+        if simulator.stats["requests"] > requests:
+            return None, 0
+        return respond(data)
+    simulator._respond = limited
+
+
+def table(simulator: SNMPAgentSimulator, version: str, **options):
+    client = AsyncSNMPClient(simulator.host, port=simulator.port, version=version, **options)
+    rows = asyncio.run(client.get_onu_table())
+    return rows, client.walk_complete
+
+
+@pytest.mark.parametrize("version", ["1", "2c"])
+def test_full_walk_is_complete(agent, version):
+    rows, complete = table(agent, version)
+    assert len(rows) == 128
+    assert complete
+
+
+@pytest.mark.parametrize("version", ["1", "2c"])
+def test_truncated_walk_is_incomplete(agent, version):
+    truncate_after(agent, 2)
+    rows, complete = table(agent, version, timeout=0.1, retries=0)
+    assert len(rows) < 128
+    assert not complete
+
+
+@pytest.fixture
+def db(tmp_path):
+    url = f"sqlite:///{tmp_path / 'discovery.db'}"
+    command.upgrade(alembic_config(url), "head")
+    engine = create_engine(url)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+@pytest.mark.parametrize("complete, missing", [(True, 64), (False, 0)])
+def test_incomplete_walk_keeps_unseen_onus(db, agent, complete, missing):
+    olt = OLT(name="olt-1", ip_address="10.0.0.1")
+    db.add(olt)
+    db.commit()
+    rows, _ = table(agent, "2c")
+    sync_onus(db, olt, rows)
+
+    counts = sync_onus(db, olt, rows[:64], complete=complete)
+    assert counts["vanished"] == missing
+    assert db.query(ONU).filter(ONU.status == "missing").count() == missing
+
+
+def assert_counters_match_rows(db):
+    """OLT and Port total/online/offline counters equal a recount of their ONUs"""
+    db.expire_all()
+    onus = db.query(ONU.olt_id, ONU.port_id, ONU.status).all()
+    for model, column in ((OLT, 0), (Port, 1)):
+        for row in db.query(model):
+            statuses = [onu.status for onu in onus if onu[column] == row.id]
+            assert (row.total_onus, row.online_onus, row.offline_onus) == (
+                len(statuses), statuses.count("online"), statuses.count("offline")
+            ), f"{model.__name__} {row.id}"
+
+
+def test_onu_counters_follow_discovery_import_and_reconcile(db, agent):
+    olt = OLT(name="olt-1", ip_address="10.0.0.1")
+    db.add(olt)
+    db.commit()
+    rows, _ = table(agent, "2c")
+    sync_onus(db, olt, rows)
+    assert_counters_match_rows(db)
+
+    # Statuses flip on the next walk, and one ONU is gone
+    agent.mib.set_onu(1, 1, 1, status=2)  # los
+    agent.mib.set_onu(1, 1, 2, status=5)  # dying-gasp
+    agent.mib.set_onu(1, 1, 3, status=7)  # offline
+    agent.mib.set_onu(1, 2, 1, status=4)  # online
+    agent.mib.remove_onu(1, 2, 2)
+    rows, complete = table(agent, "2c")
+    counts = sync_onus(db, olt, rows, complete=complete)
+    assert counts["vanished"] == 1
+    assert_counters_match_rows(db)
+    # ONUs that are neither online nor offline only count towards the total
+    db.refresh(olt)
+    statuses = [status for status, in db.query(ONU.status)]
+    assert {"los", "dying-gasp", "missing"} <= set(statuses)
+    assert olt.total_onus - olt.online_onus - olt.offline_onus == sum(
+        1 for status in statuses if status not in ("online", "offline")
+    )
+
+    port_id = db.query(ONU.port_id).first()[0]
+    report = import_csv(db, "onus", io.StringIO(f"sn,olt_id,port_id\nIMPORTED1,{olt.id},{port_id}\n"))
+    assert report["inserted"] == 1
+    assert_counters_match_rows(db)
+
+    db.execute(update(OLT).values(online_onus=0))
+    db.execute(update(Port).where(Port.id == port_id).values(total_onus=1))
+    db.commit()
+    assert reconcile_counters(db) == {"ports": 1, "olts": 1}
+    assert_counters_match_rows(db)
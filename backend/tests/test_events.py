@@ -0,0 +1,45 @@
+import asyncio
+
+from app.services.events import Subscription, onu_event
+
+
+def _olt_event(olt_id, status, previous):
+    return {"type": "olt", "olt_id": olt_id, "status": status, "previous": previous}
+
+
+def _drain(subscription):
+    return asyncio.run(subscription.next_batch(timeout=0.1, coalesce=0))
+
+
+def test_filters():
+    subscription = Subscription({1}, {10}, set(), buffer_size=10)
+    assert subscription.matches(onu_event("A", 1, 10, "los", "online"))
+    assert not subscription.matches(onu_event("B", 1, 11, "los", "online"))
+    assert not subscription.matches(onu_event("C", 2, 10, "los", "online"))
+    assert subscription.matches(_olt_event(1, "offline", "online"))
+
+    olts_only = Subscription(set(), set(), {"olt"}, buffer_size=10)
+    assert not olts_only.matches(onu_event("A", 1, 10, "los", "online"))
+    assert olts_only.matches(_olt_event(2, "offline", "online"))
+
+
+def test_coalescing():
+    subscription = Subscription(set(), set(), set(), buffer_size=10)
+    subscription.put(onu_event("A", 1, 10, "los", "online"))
+    subscription.put(onu_event("B", 1, 10, "los", "online"))
+    subscription.put(onu_event("A", 1, 10, "dying-gasp", "los"))
+    subscription.put(onu_event("B", 1, 10, "online", "los"))  # back where it started
+
+    assert _drain(subscription) == [onu_event("A", 1, 10, "dying-gasp", "online")]
+    assert _drain(subscription) is None
+
+
+def test_slow_client_is_dropped():
+    subscription = Subscription(set(), set(), set(), buffer_size=2)
+    for sn in ("A", "B", "A"):
+        subscription.put(onu_event(sn, 1, 10, "los", "online"))
+    assert not subscription.dropped
+
+    subscription.put(onu_event("C", 1, 10, "los", "online"))
+    assert subscription.dropped
+    assert _drain(subscription) == []
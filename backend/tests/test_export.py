@@ -0,0 +1,64 @@
+import asyncio
+import csv
+import gzip
+import io
+import json
+from datetime import datetime, timezone
+
+from app.services.export import EXPORTS, encode_csv, encode_ndjson, gzip_chunks
+
+COLUMNS = ["id", "name", "created_at", "route_coordinates"]
+CREATED = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+BATCHES = [
+    [(1, "a", CREATED, [{"lat": 1.5, "lng": 2}])],
+    [(2, "b,c", None, None), (3, 'd"e', CREATED, None)],
+]
+
+
+async def _batches():
+    for rows in BATCHES:
+        yield rows
+
+
+def _collect(chunks) -> bytes:
+    async def run():
+        return b"".join([chunk async for chunk in chunks])
+    return asyncio.run(run())
+
+
+def test_exports_never_include_secrets():
+    for _, columns in EXPORTS.values():
+        assert columns[0] == "id"
+        assert not {"snmp_community", "telnet_password"} & set(columns)
+
+
+def test_ndjson_one_object_per_row():
+    lines = _collect(encode_ndjson(COLUMNS, _batches())).decode().splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"id": 1, "name": "a", "created_at": "2024-01-02T03:04:05+00:00", "route_coordinates": [{"lat": 1.5, "lng": 2}]},
+        {"id": 2, "name": "b,c", "created_at": None, "route_coordinates": None},
+        {"id": 3, "name": 'd"e', "created_at": "2024-01-02T03:04:05+00:00", "route_coordinates": None},
+    ]
+
+
+def test_csv_header_and_quoting():
+    rows = list(csv.reader(io.StringIO(_collect(encode_csv(COLUMNS, _batches())).decode())))
+    assert rows == [
+        COLUMNS,
+        ["1", "a", "2024-01-02T03:04:05+00:00", '[{"lat": 1.5, "lng": 2}]'],
+        ["2", "b,c", "", ""],
+        ["3", 'd"e', "2024-01-02T03:04:05+00:00", ""],
+    ]
+
+
+def test_csv_without_rows_is_just_the_header():
+    async def empty():
+        return
+        yield
+
+    assert _collect(encode_csv(COLUMNS, empty())).decode().splitlines() == [",".join(COLUMNS)]
+
+
+def test_gzip_round_trip():
+    plain = _collect(encode_ndjson(COLUMNS, _batches()))
+    assert gzip.decompress(_collect(gzip_chunks(encode_ndjson(COLUMNS, _batches())))) == plain
@@ -0,0 +1,72 @@
+import io
+
+import pytest
+from alembic import command
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.db.database import alembic_config
+from app.models.odp import ODP
+from app.models.olt import OLT, Slot, Port
+from app.models.onu import ONU
+from app.services.importer import import_csv
+
+
+@pytest.fixture
+def db(tmp_path):
+    url = f"sqlite:///{tmp_path / 'import.db'}"
+    command.upgrade(alembic_config(url), "head")
+    engine = create_engine(url)
+    with Session(engine) as session:
+        olt = OLT(name="olt-1", ip_address="10.0.0.1")
+        olt.slots = [Slot(slot_number=1, ports=[Port(port_number=1)])]
+        session.add_all([olt, ODP(name="existing", code="E1")])
+        session.commit()
+        yield session
+    engine.dispose()
+
+
+def test_bad_rows_are_reported_and_skipped(db):
+    port_id = db.scalar(select(Port.id))
+    report = import_csv(db, "onus", io.StringIO(
+        "sn,olt_id,port_id,customer_name\n"
+        f"SN1,1,{port_id},Alice\n"
+        f"SN1,1,{port_id},duplicate in file\n"
+        "SN2,1,999,unknown port\n"
+        f"SN3,x,{port_id},bad olt_id\n"
+        f"SN4,1,{port_id},\n"
+        f"SN5,1,{port_id},Bob\n"
+    ), batch_size=2)
+
+    assert report["rows"] == 6
+    assert report["inserted"] == 3
+    assert [error["line"] for error in report["errors"]] == [3, 4, 5]
+    assert report["errors"][0]["errors"] == ["duplicate sn: SN1"]
+    assert db.scalars(select(ONU.sn).order_by(ONU.sn)).all() == ["SN1", "SN4", "SN5"]
+    assert db.scalar(select(ONU.customer_name).where(ONU.sn == "SN4")) is None
+
+    olt, port = db.get(OLT, 1), db.get(Port, port_id)
+    assert (olt.total_onus, olt.offline_onus, port.total_onus) == (3, 3, 3)
+
+
+def test_multi_line_cells_report_the_first_line(db):
+    report = import_csv(db, "odps", io.StringIO(
+        'name,code,total_ports,address\n'
+        'one,C1,8,"Jl. Merdeka 1\nBlok A"\n'
+        'two,C2,x,"Jl. Merdeka 2\nBlok B\nRT 3"\n'
+        'three,C1,8,\n'
+    ))
+    assert report["inserted"] == 1
+    assert [error["line"] for error in report["errors"]] == [4, 7]
+
+
+def test_duplicates_of_existing_rows(db):
+    report = import_csv(db, "odps", io.StringIO("name,code,total_ports\nexisting,N1,8\nnew,E1,8\nnewer,,16\n"))
+    assert report["inserted"] == 1
+    assert [error["errors"] for error in report["errors"]] == [["duplicate name: existing"], ["duplicate code: E1"]]
+    assert db.scalar(select(ODP.available_ports).where(ODP.name == "newer")) == 16
+
+
+def test_missing_required_columns(db):
+    with pytest.raises(ValueError, match="olt_id, port_id"):
+        import_csv(db, "onus", io.StringIO("sn\nSN1\n"))
@@ -0,0 +1,114 @@
+import threading
+import time
+
+import pytest
+from alembic import command
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.api.endpoints import jobs, olt
+from app.db.database import alembic_config, get_db
+from app.models.olt import OLT
+from app.services import discovery
+from app.services.jobs import Job, JobManager
+from snmp_simulator import SimulatedMIB, SNMPAgentSimulator
+
+
+def wait_for(job: Job, timeout: float = 10) -> Job:
+    deadline = time.monotonic() + timeout
+    while not job.finished and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return job
+
+
+@pytest.fixture
+def manager():
+    jobs = JobManager(max_workers=2, retention=60)
+    yield jobs
+    jobs.shutdown()
+
+
+def test_one_unfinished_job_per_kind_and_olt(manager):
+    release = threading.Event()
+    first = manager.submit("discover", 301, lambda job: {"waited": release.wait(5)})
+    assert manager.submit("discover", 301, lambda job: {}) is first
+    assert manager.submit("discover", 302, lambda job: {}) is not first
+
+    release.set()
+    assert wait_for(first).result == {"waited": True}
+    again = manager.submit("discover", 301, lambda job: {})
+    assert again is not first
+    assert wait_for(again).phase == "done"
+
+
+def test_failed_job_keeps_the_error(manager):
+    def fail(job):
+        job.phase = "walking"
+        raise ValueError("OLT not found")
+
+    job = wait_for(manager.submit("sync", 303, fail))
+    assert (job.phase, job.error, job.result) == ("failed", "OLT not found", None)
+    assert job.to_dict()["elapsed"] >= 0
+
+
+def test_finished_jobs_expire():
+    manager = JobManager(max_workers=1, retention=0.05)
+    try:
+        job = wait_for(manager.submit("sync", 304, lambda job: {}))
+        assert manager.list(304) == [job]
+        time.sleep(0.1)
+        assert manager.list(304) == []
+        assert manager.get(job.id) is None
+    finally:
+        manager.shutdown()
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'jobs.db'}"
+    command.upgrade(alembic_config(url), "head")
+    engine = create_engine(url)
+    # Jobs open their own sessions
+    monkeypatch.setattr(discovery, "SessionLocal", sessionmaker(bind=engine))
+    simulator = SNMPAgentSimulator(SimulatedMIB.synthetic(slots=1, ports=2, onus=8, seed=1))
+    host, port = simulator.start()
+    with Session(engine) as session:
+        session.add(OLT(name="olt-1", ip_address=host, snmp_port=port))
+        session.commit()
+
+    app = FastAPI()
+    app.include_router(olt.router, prefix="/olt")
+    app.include_router(jobs.router, prefix="/jobs")
+
+    def get_test_db():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_db] = get_test_db
+    yield TestClient(app)
+    simulator.stop()
+    engine.dispose()
+
+
+def test_sync_is_accepted_and_followed_through_jobs(api):
+    response = api.post("/olt/1/sync")
+    assert response.status_code == 202
+    job_id = response.json()["id"]
+
+    deadline = time.monotonic() + 10
+    while True:
+        job = api.get(f"/jobs/{job_id}").json()
+        if job["phase"] in ("done", "failed") or time.monotonic() > deadline:
+            break
+        time.sleep(0.02)
+    assert job["phase"] == "done", job["error"]
+    assert job["result"]["onus_discovered"] == 16
+    assert job["pdus_sent"] > 0
+    assert [item["id"] for item in api.get("/jobs/", params={"olt_id": 1}).json()] == [job_id]
+
+
+def test_unknown_olt_and_job(api):
+    assert api.post("/olt/99/sync").status_code == 404
+    assert api.get("/jobs/missing").status_code == 404
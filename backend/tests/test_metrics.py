@@ -0,0 +1,90 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from alembic import command
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.api.endpoints import metrics
+from app.db.database import alembic_config, get_db
+from app.models.olt import OLT, Slot, Port
+from app.models.onu import ONU
+from app.services import metrics as metrics_service
+from app.services.metrics import MetricsWriter, write_metrics
+
+
+@pytest.fixture
+def client(tmp_path):
+    url = f"sqlite:///{tmp_path / 'metrics.db'}"
+    command.upgrade(alembic_config(url), "head")
+    engine = create_engine(url)
+    with Session(engine) as session:
+        olt = OLT(name="olt-1", ip_address="10.0.0.1")
+        olt.slots = [Slot(slot_number=1, ports=[Port(port_number=1)])]
+        session.add(olt)
+        session.flush()
+        session.add(ONU(sn="SN1", olt_id=olt.id, port_id=olt.slots[0].ports[0].id))
+        session.commit()
+        write_metrics(session, [
+            {"onu_id": 1, "ts": datetime(2026, 1, 1, hour, tzinfo=timezone.utc), "rx_power": -20.0 - hour}
+            for hour in range(4)
+        ])
+
+    app = FastAPI()
+    app.include_router(metrics.router, prefix="/metrics")
+
+    def get_test_db():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_db] = get_test_db
+    yield TestClient(app)
+    engine.dispose()
+
+
+@pytest.mark.parametrize("start, end", [
+    ("2026-01-01T01:00:00", "2026-01-01T03:00:00"),  # no offset: UTC
+    ("2026-01-01T01:00:00Z", "2026-01-01T03:00:00Z"),
+    ("2026-01-01T08:00:00+07:00", "2026-01-01T03:00:00"),
+])
+def test_naive_and_offset_bounds(client, start, end):
+    response = client.get("/metrics/onu", params={"onu_id": 1, "start": start, "end": end, "points": 10})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["start"].startswith("2026-01-01T01:00:00")
+    assert [point[1] for point in body["series"]["1"]] == [-21.0, -22.0]
+
+
+def test_start_must_be_before_end(client):
+    response = client.get("/metrics/onu", params={"onu_id": 1, "start": "2026-01-01T03:00:00",
+                                                  "end": "2026-01-01T01:00:00+00:00"})
+    assert response.status_code == 400
+
+
+def test_writer_is_disabled_on_unsupported_databases(monkeypatch, caplog):
+    monkeypatch.setattr(metrics_service.settings, "METRICS_ENABLED", True)
+    monkeypatch.setattr(metrics_service, "engine", SimpleNamespace(dialect=SimpleNamespace(name="mssql")))
+    writer = MetricsWriter(batch_size=1, flush_interval=60)
+    writer.start()
+    assert not writer.enabled
+    assert writer._thread is None
+    assert "not mssql" in caplog.text
+
+    writer.record([{"onu_id": 1, "ts": datetime(2026, 1, 1, tzinfo=timezone.utc), "rx_power": -20.0}])
+    assert (writer._buffer, writer.written, writer.dropped) == ([], 0, 0)
+
+
+def test_partition_survives_a_failed_write(postgres_url, migrate):
+    migrate(postgres_url)
+    engine = create_engine(postgres_url)
+    ts = datetime(2026, 2, 1, tzinfo=timezone.utc)
+    with Session(engine) as session:
+        with pytest.raises(IntegrityError):
+            write_metrics(session, [{"onu_id": 999, "ts": ts, "rx_power": -20.0}])  # no such ONU
+        session.rollback()
+        assert session.scalar(text("SELECT to_regclass('onu_metrics_p20260201')")) is not None
+    engine.dispose()
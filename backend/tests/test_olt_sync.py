@@ -0,0 +1,79 @@
+import json
+import socket
+
+import pytest
+from alembic import command
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pysnmp.hlapi import UdpTransportTarget
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.api.endpoints import olt
+from app.db.database import alembic_config, get_db
+from app.models.olt import OLT
+from app.services import discovery
+from app.services.snmp_client import session_registry
+from snmp_simulator import SimulatedMIB, SNMPAgentSimulator
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'sync.db'}"
+    command.upgrade(alembic_config(url), "head")
+    engine = create_engine(url)
+    monkeypatch.setattr(discovery, "SessionLocal", sessionmaker(bind=engine))
+
+    simulator = SNMPAgentSimulator(SimulatedMIB.synthetic(slots=1, ports=2, onus=8, seed=1))
+    host, port = simulator.start()
+    # A port that takes requests and never answers
+    dead = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    dead.bind((host, 0))
+    dead_port = dead.getsockname()[1]
+    session_registry.acquire(host, dead_port, "public", "2c").target = UdpTransportTarget(
+        (host, dead_port), timeout=0.5, retries=0
+    )
+    with Session(engine) as session:
+        session.add_all([
+            OLT(name="dead", ip_address=host, snmp_port=dead_port),
+            OLT(name="live", ip_address=host, snmp_port=port),
+        ])
+        session.commit()
+
+    app = FastAPI()
+    app.include_router(olt.router, prefix="/olt")
+
+    def get_test_db():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_db] = get_test_db
+    yield TestClient(app)
+    simulator.stop()
+    dead.close()
+    engine.dispose()
+
+
+def test_sync_all_streams_each_olt(api):
+    response = api.post("/olt/sync-all")
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert len(lines) == 3
+
+    # The live OLT finishes first although the dead one comes first by id
+    live, dead, summary = lines
+    assert (live["name"], live["status"]) == ("live", "ok")
+    assert live["result"]["onus_discovered"] == 16
+    assert (dead["name"], dead["status"], dead["error"]) == ("dead", "failed", "Cannot connect to OLT")
+    assert live["elapsed"] < dead["elapsed"]
+
+    assert summary["summary"]["total"] == 2
+    assert (summary["summary"]["succeeded"], summary["summary"]["failed"]) == (1, 1)
+    assert summary["summary"]["olt_time"] == pytest.approx(live["elapsed"] + dead["elapsed"], abs=0.002)
+
+
+def test_sync_all_filters(api):
+    response = api.post("/olt/sync-all", json={"ids": [2]})
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line.get("name") for line in lines[:-1]] == ["live"]
+    assert lines[-1]["summary"]["total"] == 1
@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+from alembic import command
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+
+from app.api.endpoints import onu
+from app.api.pagination import NEXT_CURSOR_HEADER
+from app.core.config import settings
+from app.db.database import alembic_config, get_async_db
+from app.models.olt import OLT, Slot, Port
+from app.models.onu import ONU
+
+STATUSES = ("online", "los", "offline", "dying-gasp", "missing")
+
+
+@pytest.fixture(params=[False, True], ids=["pydantic", "fast_json"])
+def client(request, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "FAST_JSON", request.param)
+    path = tmp_path / "onus.db"
+    command.upgrade(alembic_config(f"sqlite:///{path}"), "head")
+    engine = create_engine(f"sqlite:///{path}")
+    with Session(engine) as session:
+        olt = OLT(name="olt-1", ip_address="10.0.0.1")
+        olt.slots = [Slot(slot_number=1, ports=[Port(port_number=1), Port(port_number=2)])]
+        session.add(olt)
+        session.flush()
+        ports = olt.slots[0].ports
+        session.add_all([
+            ONU(sn=f"SN{n:02d}", olt_id=olt.id, port_id=ports[n % 2].id, status=STATUSES[n % len(STATUSES)])
+            for n in range(30)
+        ])
+        session.commit()
+    engine.dispose()
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+    app = FastAPI()
+    app.include_router(onu.router, prefix="/onu")
+
+    async def get_test_db():
+        async with AsyncSession(async_engine) as session:
+            yield session
+
+    app.dependency_overrides[get_async_db] = get_test_db
+    yield TestClient(app)
+    asyncio.run(async_engine.dispose())
+
+
+def all_pages(client, **params):
+    sns, cursor = [], None
+    while True:
+        response = client.get("/onu/", params={**params, "limit": 4, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        sns += [item["sn"] for item in response.json()]
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return sns
+
+
+def test_pages_of_several_statuses_are_merged_in_id_order(client):
+    expected = [f"SN{n:02d}" for n in range(30) if STATUSES[n % len(STATUSES)] in ("los", "dying-gasp")]
+    assert all_pages(client, status=["los", "dying-gasp"]) == expected
+    assert all_pages(client, status=["los", "los"]) == expected[::2]
+
+
+def test_slot_and_port_filter(client):
+    assert all_pages(client, olt_id=1, slot=1, port=2) == [f"SN{n:02d}" for n in range(1, 30, 2)]
+    assert len(all_pages(client, olt_id=1, slot=1)) == 30
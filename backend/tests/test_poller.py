@@ -0,0 +1,50 @@
+import heapq
+import threading
+
+from app.services.jobs import JobManager, olt_locks
+from app.services.poller import BUSY_RETRY, PollScheduler, PollTask
+
+
+class RecordingExecutor:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, fn, *args):
+        self.submitted.append(args)
+
+
+def scheduler_with_task(olt_id: int, tier: str) -> PollScheduler:
+    scheduler = PollScheduler()
+    scheduler._executor = RecordingExecutor()
+    scheduler._olt_status = {olt_id: "online"}
+    task = PollTask(olt_id, tier, 60)
+    scheduler._tasks[(olt_id, tier)] = task
+    heapq.heappush(scheduler._queue, (task.due, olt_id, tier))
+    return scheduler
+
+
+def test_poll_of_busy_olt_waits():
+    scheduler = scheduler_with_task(101, "optics")
+    task = scheduler._tasks[(101, "optics")]
+    with olt_locks.hold(101):
+        scheduler._dispatch(10.0)
+    assert scheduler._executor.submitted == []
+    assert task.due == 10.0 + BUSY_RETRY
+
+    scheduler._dispatch(10.0 + BUSY_RETRY)
+    assert scheduler._executor.submitted == [(task,)]
+    assert olt_locks.busy(101)
+    olt_locks.release(101)
+
+
+def test_job_waits_for_busy_olt():
+    jobs = JobManager(max_workers=1, retention=60)
+    ran = threading.Event()
+    try:
+        with olt_locks.hold(102):
+            job = jobs.submit("discover", 102, lambda job: ran.set() or {})
+            assert not ran.wait(0.2)
+            assert job.phase == "queued"
+        assert ran.wait(5)
+    finally:
+        jobs.shutdown()
@@ -0,0 +1,74 @@
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.api.compression import CompressionMiddleware, choose_encoding
+from app.api.serialization import schema_columns
+from app.models.olt import OLT as OLTModel
+from app.schemas.olt import OLT
+
+BODY = "0123456789" * 200
+
+
+async def large(request):
+    return PlainTextResponse(BODY)
+
+
+async def small(request):
+    return PlainTextResponse("ok")
+
+
+async def stream(request):
+    async def lines():
+        for _ in range(3):
+            yield BODY[:100] + "\n"
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@pytest.fixture
+def client():
+    app = Starlette(routes=[Route("/large", large), Route("/small", small), Route("/stream", stream)])
+    app.add_middleware(CompressionMiddleware, minimum_size=1000)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, deflate, br", "br"),
+    ("gzip", "gzip"),
+    ("br;q=0.5, gzip;q=0.9", "gzip"),
+    ("*", "br"),
+    ("br;q=0, gzip;q=0", None),
+    ("identity", None),
+    ("", None),
+])
+def test_choose_encoding(header, expected):
+    assert choose_encoding(header) == expected
+
+
+def test_compresses_above_minimum_size(client):
+    response = client.get("/large", headers={"Accept-Encoding": "br"})
+    assert response.headers["content-encoding"] == "br"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(BODY)
+    assert response.text == BODY
+
+    response = client.get("/small", headers={"Accept-Encoding": "br"})
+    assert "content-encoding" not in response.headers
+
+
+def test_compresses_streams(client):
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text.splitlines() == [BODY[:100]] * 3
+
+
+def test_schema_columns_need_plain_columns():
+    assert [column.key for column in schema_columns(OLTModel, OLT)] == list(OLT.model_fields)
+
+    class Extra(OLT):
+        rank: int = 0
+
+    with pytest.raises(TypeError, match="rank"):
+        schema_columns(OLTModel, Extra)
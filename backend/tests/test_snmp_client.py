@@ -0,0 +1,141 @@
+import asyncio
+
+import pytest
+from pysnmp.hlapi import UdpTransportTarget
+
+from app.services.async_snmp_client import AsyncSNMPClient
+from app.services.snmp_client import SNMPClient, session_registry
+from snmp_simulator import SimulatedMIB, SNMPAgentSimulator
+
+SYS_DESCR = "1.3.6.1.2.1.1.1.0"
+SYS_NAME = "1.3.6.1.2.1.1.5.0"
+MISSING = "1.3.6.1.2.1.1.99.0"
+ROWS = 128
+
+
+@pytest.fixture
+def agent():
+    mib = SimulatedMIB.synthetic(slots=1, ports=2, onus=ROWS // 2, seed=1)
+    mib.set_onu(1, 2, 5, status=4, sn="ZTEGTEST0001", distance=1234, rx_power=-2150, tx_power=215)
+    simulator = SNMPAgentSimulator(mib)
+    simulator.start()
+    yield simulator
+    simulator.stop()
+
+
+def client(simulator: SNMPAgentSimulator, version: str) -> SNMPClient:
+    return SNMPClient(simulator.host, port=simulator.port, version=version)
+
+
+def test_bulk_walk_matches_getnext_walk(agent):
+    snmp = client(agent, "2c")
+    walked = snmp.walk(SNMPClient.OID_ONU_STATUS)
+    pdus = snmp.pdus_sent
+    assert len(walked) == ROWS
+
+    assert snmp.bulk_walk(SNMPClient.OID_ONU_STATUS) == walked
+    assert snmp.walk_complete
+    assert snmp.pdus_sent - pdus < pdus // 10
+
+
+def test_v1_bulk_walk_falls_back_to_getnext(agent):
+    snmp = client(agent, "1")
+    assert snmp.bulk_walk(SNMPClient.OID_ONU_STATUS) == client(agent, "2c").walk(SNMPClient.OID_ONU_STATUS)
+    # One GETNEXT per row plus the one that leaves the subtree
+    assert snmp.pdus_sent == ROWS + 1
+
+
+@pytest.mark.parametrize("version, pdus", [
+    ("2c", 16),  # interleaved GETBULK of the five columns
+    ("1", 5 * (ROWS + 1)),  # one GETNEXT walk per column
+])
+def test_onu_table_joins_columns(agent, version, pdus):
+    snmp = client(agent, version)
+    rows = snmp.get_onu_table()
+    assert len(rows) == ROWS
+    assert snmp.walk_complete
+    assert snmp.pdus_sent <= pdus
+    row = next(row for row in rows if row.sn == "ZTEGTEST0001")
+    assert (row.slot, row.port, row.onu_id, row.status) == (1, 2, 5, "online")
+    assert (row.rx_power, row.tx_power, row.distance) == (-21.5, 2.15, "1234")
+
+    assert snmp.get_onu_list(port=2) == [row[:5] for row in rows if row.port == 2]
+
+
+@pytest.mark.parametrize("version, error, pdus", [
+    ("2c", "noSuchObject", 1),  # reported in place of the value
+    ("1", "noSuchName", 2),  # fails the PDU, which is resent without that OID
+])
+def test_get_many_splits_per_oid_errors(agent, version, error, pdus):
+    snmp = client(agent, version)
+    results = snmp.get_many([SYS_DESCR, MISSING, SYS_NAME])
+    assert results[SYS_NAME].value == "zte-c320-sim"
+    assert results[SYS_DESCR].error is None
+    assert results[MISSING] == (None, error)
+    assert snmp.pdus_sent == pdus
+
+
+def test_onu_details_in_one_get(agent):
+    snmp = client(agent, "2c")
+    onu = next(onu for onu in snmp.get_onu_list(port=2) if onu.onu_id == 5)
+    pdus = snmp.pdus_sent
+    details = snmp.get_onu_details_suffix(onu.oid_suffix)
+    assert (details["sn"], details["rx_power"], details["distance"]) == ("ZTEGTEST0001", -21.5, "1234")
+    assert details["status"] == "online"
+    assert snmp.pdus_sent - pdus == 1
+
+
+def test_clients_share_a_session(agent):
+    sessions = len(session_registry)
+    first = client(agent, "2c")
+    second = client(agent, "2c")
+    assert first.get(SYS_NAME) == second.get(SYS_NAME) == "zte-c320-sim"
+    assert first._session() is second._session()
+    assert client(agent, "1")._session() is not first._session()
+    assert len(session_registry) == sessions + 2
+
+
+@pytest.mark.parametrize("version", ["1", "2c"])
+def test_async_client_matches_sync_client(agent, version):
+    async_client = AsyncSNMPClient(agent.host, port=agent.port, version=version)
+    results = asyncio.run(async_client.get_many([SYS_DESCR, MISSING, SYS_NAME]))
+    assert results[SYS_NAME].value == "zte-c320-sim"
+    assert results[MISSING].value is None
+
+    rows = asyncio.run(async_client.get_onu_table())
+    assert async_client.walk_complete
+    assert rows == client(agent, version).get_onu_table()
+
+
+def test_replay_of_recorded_walk(tmp_path):
+    path = tmp_path / "olt.walk"
+    path.write_text(
+        ".1.3.6.1.2.1.1.3.0 = Timeticks: (12345) 0:02:03.45\n"
+        ".1.3.6.1.2.1.1.5.0 = STRING: \"olt-a\"\n"
+        ".1.3.6.1.4.1.3902.1082.500.10.2.3.8.1.4.1.268501248.1 = INTEGER: 4\n"
+        ".1.3.6.1.4.1.3902.1082.500.10.2.3.8.1.4.1.268501248.2 = INTEGER: working(3)\n"
+        ".1.3.6.1.4.1.3902.1082.500.10.2.3.8.1.4.1.268501248.3 = INTEGER: unknown\n"
+        ".1.3.6.1.4.1.3902.1082.500.10.2.3.8.1.4.1.268501248.4 = Timeticks: 99\n"
+    )
+    mib = SimulatedMIB.from_walk_file(str(path))
+    prefix = (1, 3, 6, 1, 4, 1, 3902, 1082, 500, 10, 2, 3, 8, 1, 4, 1, 268501248)
+    assert [mib.get(prefix + (onu_id,))[1] for onu_id in (1, 2, 4)] == [4, 3, 99]
+    assert mib.get(prefix + (3,)) is None
+    assert len(mib) == 5
+
+
+@pytest.mark.parametrize("version", ["1", "2c"])
+def test_walk_cut_short_by_timeout(agent, version):
+    snmp = client(agent, version)
+    snmp._session().target = UdpTransportTarget((agent.host, agent.port), timeout=0.1, retries=0)
+    respond = agent._respond
+
+    def stop_answering(data):
+        if agent.stats["requests"] > 3:
+            return None, 0
+        return respond(data)
+    agent._respond = stop_answering
+
+    rows = snmp.get_onu_table()
+    assert len(rows) < ROWS
+    assert not snmp.walk_complete
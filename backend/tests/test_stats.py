@@ -0,0 +1,98 @@
+import asyncio
+import time
+
+import pytest
+from alembic import command
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+
+from app.api.endpoints import dashboard
+from app.db.database import alembic_config, get_async_db
+from app.models.olt import OLT
+from app.services import stats
+from app.services.stats import StatsSnapshot, dashboard_stats
+
+
+@pytest.fixture
+def api(tmp_path):
+    path = tmp_path / "stats.db"
+    command.upgrade(alembic_config(f"sqlite:///{path}"), "head")
+    engine = create_engine(f"sqlite:///{path}")
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    # Statistics queries that reached the database
+    computed = []
+
+    @event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+    def count(conn, cursor, statement, *args):
+        if "sum(olts.total_onus)" in statement:
+            computed.append(statement)
+
+    app = FastAPI()
+    app.include_router(dashboard.router, prefix="/dashboard")
+
+    async def get_test_db():
+        async with AsyncSession(async_engine) as session:
+            yield session
+
+    app.dependency_overrides[get_async_db] = get_test_db
+    dashboard_stats.invalidate()
+    with TestClient(app) as client:
+        yield client, engine, computed
+    engine.dispose()
+    asyncio.run(async_engine.dispose())
+
+
+def test_reads_within_ttl_are_served_from_the_snapshot(api):
+    client, _, computed = api
+    first = client.get("/dashboard/stats").json()
+    assert client.get("/dashboard/stats").json() == first
+    assert len(computed) == 1
+
+
+def test_commit_invalidates_the_snapshot(api):
+    client, engine, computed = api
+    assert client.get("/dashboard/stats").json()["onus"]["total"] == 0
+    with Session(engine) as session:
+        session.add(OLT(name="olt-1", ip_address="10.0.0.1", status="online", total_onus=5, online_onus=4))
+        session.commit()
+
+    body = client.get("/dashboard/stats").json()
+    assert body["olts"] == {"total": 1, "online": 1, "offline": 0}
+    assert (body["onus"]["total"], body["onus"]["online"]) == (5, 4)
+    assert len(computed) == 2
+
+
+def test_snapshot_expires_after_ttl(monkeypatch):
+    calls = []
+
+    async def compute(db):
+        calls.append(db)
+        return {"calls": len(calls)}
+
+    monkeypatch.setattr(stats, "compute_dashboard_stats", compute)
+    snapshot = StatsSnapshot(ttl=0.5)
+    assert asyncio.run(snapshot.get(None)) == asyncio.run(snapshot.get(None)) == {"calls": 1}
+    # A different version token (another process wrote) is a miss too
+    assert asyncio.run(snapshot.get(None, "olts.2")) == {"calls": 2}
+
+    time.sleep(0.6)
+    assert asyncio.run(snapshot.get(None, "olts.2")) == {"calls": 3}
+
+
+def test_invalidation_during_compute_is_not_cached(monkeypatch):
+    snapshot = StatsSnapshot(ttl=60)
+    calls = []
+
+    async def compute(db):
+        calls.append(db)
+        if len(calls) == 1:
+            snapshot.invalidate()  # a commit lands while the queries run
+        return {"calls": len(calls)}
+
+    monkeypatch.setattr(stats, "compute_dashboard_stats", compute)
+    assert asyncio.run(snapshot.get(None)) == {"calls": 1}
+    assert asyncio.run(snapshot.get(None)) == {"calls": 2}
+    assert asyncio.run(snapshot.get(None)) == {"calls": 2}
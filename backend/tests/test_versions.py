@@ -0,0 +1,59 @@
+import pytest
+from alembic import command
+from fastapi import Response
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.orm import Session
+from starlette.requests import Request
+
+from app.api.conditional import not_modified
+from app.db.database import alembic_config
+from app.models.odp import ODP
+from app.models.olt import OLT
+from app.models.version import TableVersion
+import app.services.versions  # noqa: F401
+
+
+@pytest.fixture
+def db(tmp_path):
+    url = f"sqlite:///{tmp_path / 'versions.db'}"
+    command.upgrade(alembic_config(url), "head")
+    engine = create_engine(url)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def _versions(db):
+    return dict(db.execute(select(TableVersion.table_name, TableVersion.version)).all())
+
+
+def test_commits_bump_written_tables(db):
+    db.add(OLT(name="olt-1", ip_address="10.0.0.1"))
+    db.commit()
+    assert _versions(db) == {"olts": 1, "onus": 0, "odps": 0, "cable_routes": 0}
+
+    db.execute(update(OLT).values(status="online"))
+    db.add(ODP(name="odp-1"))
+    db.commit()
+    assert _versions(db) == {"olts": 2, "onus": 0, "odps": 1, "cable_routes": 0}
+
+    db.add(ODP(name="odp-2"))
+    db.flush()
+    db.rollback()
+    db.commit()
+    assert _versions(db)["odps"] == 1
+
+
+def _request(**headers):
+    return Request({"type": "http", "headers": [(k.replace("_", "-").encode(), v.encode()) for k, v in headers.items()]})
+
+
+def test_not_modified():
+    version = ("olts.3", None)
+    response = Response()
+    assert not_modified(_request(), response, version) is None
+    etag = response.headers["etag"]
+
+    assert not_modified(_request(if_none_match=etag), Response(), version).status_code == 304
+    assert not_modified(_request(if_none_match=f'"other", {etag[2:]}'), Response(), version).status_code == 304
+    assert not_modified(_request(if_none_match=etag), Response(), ("olts.4", None)) is None
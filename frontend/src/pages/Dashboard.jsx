@@ -1,5 +1,5 @@
-import { useState, useEffect } from 'react';
-import { Row, Col, Card, Statistic, Table, Tag, Alert } from 'antd';
+import { useState, useEffect, useRef } from 'react';
+import { Row, Col, Card, Statistic, Table, Tag, Alert, Button } from 'antd';
 import {
   CloudServerOutlined,
   ApiOutlined,
@@ -8,20 +8,77 @@ import {
   CloseCircleOutlined,
   WarningOutlined,
 } from '@ant-design/icons';
-import { dashboardAPI } from '../services/api';
+import { alertAPI, dashboardAPI, subscribeEvents } from '../services/api';
+
+// Pushed changes arriving within this many ms share one reload
+const RELOAD_DELAY = 2000;
 
 export default function Dashboard() {
   const [stats, setStats] = useState(null);
   const [recentOnus, setRecentOnus] = useState([]);
   const [alerts, setAlerts] = useState([]);
   const [loading, setLoading] = useState(true);
+  const pendingReloads = useRef(new Set());
+  const reloadTimer = useRef(null);
 
   useEffect(() => {
     fetchDashboardData();
-    const interval = setInterval(fetchDashboardData, 30000); // Refresh every 30s
-    return () => clearInterval(interval);
+    // Follow discovery and polling changes as they are pushed; the interval is a fallback
+    const unsubscribe = subscribeEvents(applyChanges, { onOpen: fetchDashboardData });
+    const interval = setInterval(fetchDashboardData, 300000);
+    return () => {
+      unsubscribe();
+      clearInterval(interval);
+      clearTimeout(reloadTimer.current);
+    };
   }, []);
 
+  const loaders = {
+    stats: async () => setStats((await dashboardAPI.getStats()).data),
+    recentOnus: async () => setRecentOnus((await dashboardAPI.getRecentOnus()).data),
+    alerts: async () => setAlerts((await dashboardAPI.getAlerts()).data),
+  };
+
+  const applyChanges = (changes) => {
+    const statuses = {};
+    changes.forEach((change) => {
+      if (change.type === 'alert') {
+        pendingReloads.current.add('alerts');
+        return;
+      }
+      pendingReloads.current.add('stats');
+      if (change.type !== 'onu') {
+        return;
+      }
+      if (change.previous === null) {
+        // A new ONU heads the recent list
+        pendingReloads.current.add('recentOnus');
+      } else {
+        statuses[change.sn] = change.status;
+      }
+    });
+    // Status changes of the listed ONUs are applied in place
+    if (Object.keys(statuses).length) {
+      setRecentOnus((onus) =>
+        onus.map((onu) => (onu.sn in statuses ? { ...onu, status: statuses[onu.sn] } : onu))
+      );
+    }
+    if (pendingReloads.current.size && !reloadTimer.current) {
+      reloadTimer.current = setTimeout(reloadPending, RELOAD_DELAY);
+    }
+  };
+
+  const reloadPending = async () => {
+    const names = [...pendingReloads.current];
+    pendingReloads.current.clear();
+    reloadTimer.current = null;
+    try {
+      await Promise.all(names.map((name) => loaders[name]()));
+    } catch (error) {
+      console.error('Failed to refresh dashboard data:', error);
+    }
+  };
+
   const fetchDashboardData = async () => {
     try {
       const [statsRes, onusRes, alertsRes] = await Promise.all([
@@ -39,6 +96,15 @@ export default function Dashboard() {
     }
   };
 
+  const acknowledgeAlert = async (id) => {
+    try {
+      await alertAPI.acknowledge(id);
+      fetchDashboardData();
+    } catch (error) {
+      console.error('Failed to acknowledge alert:', error);
+    }
+  };
+
   const onuColumns = [
     {
       title: 'Serial Number',
@@ -142,14 +208,19 @@ export default function Dashboard() {
         <Row gutter={[16, 16]} style={{ marginBottom: 24 }}>
           <Col span={24}>
             <Card title={<><WarningOutlined /> Alerts</>}>
-              {alerts.map((alert, index) => (
+              {alerts.map((alert) => (
                 <Alert
-                  key={index}
-                  message={alert.title}
+                  key={alert.id}
+                  message={alert.state === 'acknowledged' ? `${alert.title} (acknowledged)` : alert.title}
                   description={alert.message}
                   type={alert.type}
                   showIcon
-                  style={{ marginBottom: 8 }}
+                  action={alert.state === 'open' && (
+                    <Button size="small" onClick={() => acknowledgeAlert(alert.id)}>
+                      Acknowledge
+                    </Button>
+                  )}
+                  style={{ marginBottom: 8, opacity: alert.state === 'acknowledged' ? 0.6 : 1 }}
                 />
               ))}
             </Card>
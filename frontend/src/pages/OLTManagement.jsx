@@ -19,7 +19,7 @@ import {
   CheckCircleOutlined,
   CloseCircleOutlined,
 } from '@ant-design/icons';
-import { oltAPI } from '../services/api';
+import { oltAPI, waitForJob } from '../services/api';
 
 export default function OLTManagement() {
   const [olts, setOlts] = useState([]);
@@ -83,7 +83,8 @@ export default function OLTManagement() {
   const handleSync = async (id) => {
     try {
       const response = await oltAPI.sync(id);
-      message.success(`Synced successfully! Discovered ${response.data.onus_discovered} ONUs`);
+      const job = await waitForJob(response.data);
+      message.success(`Synced successfully! Discovered ${job.result.onus_discovered} ONUs`);
       fetchOlts();
     } catch (error) {
       message.error('Failed to sync OLT');
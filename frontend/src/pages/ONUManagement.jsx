@@ -17,7 +17,7 @@ import {
   CloseCircleOutlined,
   SignalFilled,
 } from '@ant-design/icons';
-import { onuAPI, oltAPI } from '../services/api';
+import { onuAPI, oltAPI, waitForJob } from '../services/api';
 
 export default function ONUManagement() {
   const [onus, setOnus] = useState([]);
@@ -81,7 +81,9 @@ export default function ONUManagement() {
     
     try {
       const response = await onuAPI.discover(selectedOlt);
-      message.success(`Discovered ${response.data.onus_discovered} ONUs`);
+      message.info('Discovery started');
+      const job = await waitForJob(response.data);
+      message.success(`Discovered ${job.result.found} ONUs`);
       fetchOnus();
     } catch (error) {
       message.error('Failed to discover ONUs');
@@ -76,4 +76,45 @@ export const dashboardAPI = {
   getAlerts: () => api.get('/dashboard/alerts'),
 };
 
+// Alert API
+export const alertAPI = {
+  getAll: (params) => api.get('/alerts/', { params }),
+  getById: (id) => api.get(`/alerts/${id}`),
+  acknowledge: (id) => api.post(`/alerts/${id}/acknowledge`),
+};
+
+// Background job API
+export const jobAPI = {
+  getById: (id) => api.get(`/jobs/${id}`),
+};
+
+// Poll a discovery/sync job until it finishes; resolves with the job
+export const waitForJob = async (job, interval = 1000) => {
+  let current = job;
+  while (current.phase !== 'done' && current.phase !== 'failed') {
+    await new Promise((resolve) => setTimeout(resolve, interval));
+    current = (await jobAPI.getById(current.id)).data;
+  }
+  if (current.phase === 'failed') {
+    throw new Error(current.error || 'Job failed');
+  }
+  return current;
+};
+
+// Live ONU/OLT/alert changes (Server-Sent Events). onChanges gets each
+// array of deltas; onOpen runs on every (re)connect, when state may have
+// been missed. Returns a function that closes the stream.
+export const subscribeEvents = (onChanges, { onOpen, ...filters } = {}) => {
+  const query = new URLSearchParams();
+  Object.entries(filters).forEach(([key, values]) => {
+    [].concat(values).forEach((value) => query.append(key, value));
+  });
+  const source = new EventSource(`${API_BASE_URL}/events/stream?${query}`);
+  source.addEventListener('changes', (event) => onChanges(JSON.parse(event.data)));
+  if (onOpen) {
+    source.addEventListener('open', onOpen);
+  }
+  return () => source.close();
+};
+
 export default api;